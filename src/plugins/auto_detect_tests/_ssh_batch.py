@@ -0,0 +1,240 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# Helper for the SSH info plugins (not a plugin: the registry skips "_" files).
+# run_batched() pushes one script that runs every iteration on the device and
+# streams back one line per iteration:
+#     ===BATCH=== <iteration> <exit status> <ms> <hash> <output> <stderr>
+# <output>/<stderr> are "-" (not shipped), "." (empty) or "." + base64. The
+# output is shipped for iteration 1 and then only when its hash differs from
+# iteration 1's, so the plugin keeps one copy of each distinct output instead
+# of one per iteration, and pays one round trip instead of one per iteration.
+# Windows hosts (cmd shell) get a PowerShell script, others a POSIX sh script;
+# if the script yields nothing (no PowerShell, restricted shell) the command
+# is run once per iteration as before, with the same result format.
+import base64
+import hashlib
+import json
+import shlex
+import time
+
+MARKER = "===BATCH==="
+HEADER = "# ssh_batch "  # first script line: the job as JSON (read by dut_simulator)
+
+SH_SCRIPT = r"""
+CMD=%(command)s
+N=%(iterations)d
+DELAY=%(delay)s
+SHIP=%(ship)d
+ERR=$(mktemp 2>/dev/null || echo /tmp/ssh_batch.$$)
+now_ms() { t=$(date +%%s%%N 2>/dev/null); case "$t" in ''|*[!0-9]*) echo $(($(date +%%s) * 1000));; *) echo $((t / 1000000));; esac; }
+digest() { (sha256sum 2>/dev/null || cksum) | cut -d' ' -f1; }
+pack() { printf '.'; base64 | tr -d '\n'; }
+FIRST=
+i=1
+while [ "$i" -le "$N" ]; do
+  START=$(now_ms)
+  OUT=$(eval "$CMD" </dev/null 2>"$ERR")
+  STATUS=$?
+  MS=$(($(now_ms) - START))
+  HASH=$(printf '%%s' "$OUT" | digest)
+  SHIPPED=-
+  if [ -z "$FIRST" ]; then
+    FIRST=$HASH
+    SHIPPED=$(printf '%%s' "$OUT" | pack)
+  elif [ "$SHIP" = 1 ] && [ "$HASH" != "$FIRST" ]; then
+    SHIPPED=$(printf '%%s' "$OUT" | pack)
+  fi
+  ERRB=-
+  [ -s "$ERR" ] && ERRB=$(pack < "$ERR")
+  echo "%(marker)s $i $STATUS $MS $HASH $SHIPPED $ERRB"
+  [ "$ERRB" != - ] && break
+  [ "$i" -lt "$N" ] && sleep "$DELAY"
+  i=$((i + 1))
+done
+rm -f "$ERR"
+"""
+
+POWERSHELL_SCRIPT = r"""
+$Cmd = '%(command)s'
+$N = %(iterations)d
+$Delay = %(delay)s
+$Ship = %(ship)d
+$Utf8 = New-Object Text.UTF8Encoding $false
+$Sha = [Security.Cryptography.SHA256]::Create()
+function Pack($s) { if ($s.Length -eq 0) { '.' } else { '.' + [Convert]::ToBase64String($Utf8.GetBytes($s)) } }
+$First = $null
+for ($i = 1; $i -le $N; $i++) {
+    $Watch = [Diagnostics.Stopwatch]::StartNew()
+    $Info = New-Object Diagnostics.ProcessStartInfo 'cmd.exe', ('/d /s /c "' + $Cmd + '"')
+    $Info.UseShellExecute = $false
+    $Info.RedirectStandardInput = $true
+    $Info.RedirectStandardOutput = $true
+    $Info.RedirectStandardError = $true
+    $Proc = [Diagnostics.Process]::Start($Info)
+    $Proc.StandardInput.Close()
+    $ErrTask = $Proc.StandardError.ReadToEndAsync()
+    $Out = $Proc.StandardOutput.ReadToEnd().Trim()
+    $Proc.WaitForExit()
+    $ErrText = $ErrTask.Result.Trim()
+    $Ms = $Watch.ElapsedMilliseconds
+    $Hash = [BitConverter]::ToString($Sha.ComputeHash($Utf8.GetBytes($Out))).Replace('-', '').ToLower()
+    $Shipped = '-'
+    if ($First -eq $null) { $First = $Hash; $Shipped = Pack $Out }
+    elseif ($Ship -eq 1 -and $Hash -ne $First) { $Shipped = Pack $Out }
+    $ErrB = '-'
+    if ($ErrText.Length -gt 0) { $ErrB = Pack $ErrText }
+    [Console]::Out.WriteLine("%(marker)s $i $($Proc.ExitCode) $Ms $Hash $Shipped $ErrB")
+    [Console]::Out.Flush()
+    if ($ErrB -ne '-') { break }
+    if ($i -lt $N) { Start-Sleep -Milliseconds ([int]($Delay * 1000)) }
+}
+"""
+
+
+def pack(text):
+    return "." + base64.b64encode(text.encode("utf-8")).decode("ascii") if text else "."
+
+
+def unpack(field):
+    if field == "-":
+        return None
+    return base64.b64decode(field[1:]).decode("utf-8", errors="ignore") if len(field) > 1 else ""
+
+
+def output_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def marker_line(iteration, status, ms, digest, shipped, error):
+    """One streamed iteration line; shipped/error are the text or None (not shipped)."""
+    return " ".join([
+        MARKER, str(iteration), str(status), str(int(ms)), digest,
+        "-" if shipped is None else pack(shipped), "-" if error is None else pack(error),
+    ])
+
+
+def parse_marker_line(line):
+    """(iteration, status, ms, hash, output, stderr) of a marker line, None for any other line."""
+    fields = line.split()
+    if len(fields) != 7 or fields[0] != MARKER:
+        return None
+    _, iteration, status, ms, digest, shipped, error = fields
+    return int(iteration), int(status), int(ms), digest, unpack(shipped), unpack(error)
+
+
+def build_script(shell, command, iterations, delay, ship_mismatches):
+    job = {"command": command, "iterations": iterations, "delay": delay, "ship": int(ship_mismatches)}
+    values = dict(job, marker=MARKER, delay=f"{float(delay):g}")
+    if shell == "powershell":
+        script = POWERSHELL_SCRIPT % dict(values, command=command.replace("'", "''"))
+    else:
+        script = SH_SCRIPT % dict(values, command=shlex.quote(command))
+    return HEADER + json.dumps(job) + "\n" + script.lstrip("\n")
+
+
+def read_header(script):
+    """The job dict of a script from build_script (None for anything else)."""
+    first = script.split("\n", 1)[0]
+    return json.loads(first[len(HEADER):]) if first.startswith(HEADER) else None
+
+
+def powershell_command(script):
+    encoded = base64.b64encode(script.encode("utf-16-le")).decode("ascii")
+    return f"powershell -NoProfile -NonInteractive -ExecutionPolicy Bypass -EncodedCommand {encoded}"
+
+
+def detect_shell(client):
+    """"powershell" if the account's shell is cmd.exe (it expands %OS%), else "sh"."""
+    _, stdout, _ = client.exec_command("echo %OS%")
+    return "powershell" if "Windows_NT" in stdout.read().decode(errors="ignore") else "sh"
+
+
+def _record(batch, iteration, status, ms, digest, shipped, error, label):
+    first = batch["iterations"][0]["hash"] if batch["iterations"] else digest
+    batch["iterations"].append({"iteration": iteration, "exit_status": status, "ms": ms, "hash": digest})
+    if shipped is not None:
+        batch["outputs"].setdefault(digest, shipped.strip())
+    print("\n---------------------------------------------------------")
+    if shipped is not None:
+        print(f"{label} :: Iteration {iteration}:\n{shipped.strip()}\n")
+    elif digest == first:
+        print(f"{label} :: Iteration {iteration}: same output as iteration 1 ({ms} ms)")
+    else:
+        print(f"{label} :: Iteration {iteration}: output changed ({ms} ms, hash {digest[:12]})")
+    if error:
+        print(f"Iteration {iteration} error: {error.strip()}")
+        batch["error"] = error.strip()
+
+
+def _run_script(client, shell, command, iterations, delay, ship_mismatches, label, batch):
+    script = build_script(shell, command, iterations, delay, ship_mismatches)
+    if shell == "powershell":
+        stdin, stdout, stderr = client.exec_command(powershell_command(script))
+    else:
+        stdin, stdout, stderr = client.exec_command("sh -s")
+        stdin.write(script)
+        stdin.flush()
+        stdin.channel.shutdown_write()
+    for line in stdout:
+        parsed = parse_marker_line(line)
+        if parsed is not None:
+            _record(batch, *parsed, label)
+    stderr.read()
+
+
+def _run_each(client, command, iterations, delay, ship_mismatches, label, batch):
+    """One exec_command per iteration, for hosts where the script did not run."""
+    first = None
+    for i in range(iterations):
+        started = time.perf_counter()
+        _, stdout, stderr = client.exec_command(command)
+        output = stdout.read().decode(errors="ignore").strip()
+        error = stderr.read().decode(errors="ignore").strip()
+        status = stdout.channel.recv_exit_status()
+        digest = output_hash(output)
+        first = first or digest
+        shipped = output if i == 0 or (ship_mismatches and digest != first) else None
+        _record(batch, i + 1, status, round((time.perf_counter() - started) * 1000), digest,
+                shipped, error or None, label)
+        if error:
+            break
+        if i < iterations - 1:
+            time.sleep(delay)
+
+
+def run_batched(client, command, iterations, delay=0, label="Command", ship_mismatches=True):
+    """
+    Run `command` `iterations` times on a connected paramiko client, `delay`
+    seconds apart, stopping at the first iteration that writes to stderr.
+    Returns {"mode", "iterations": [{"iteration", "exit_status", "ms", "hash"}],
+    "outputs": {hash: text} (iteration 1 and, with ship_mismatches, every
+    other distinct output), "error": stderr text or None}. A batch that ends
+    early without stderr (script killed, connection dropped) also gets an error.
+    """
+    batch = {"mode": detect_shell(client), "iterations": [], "outputs": {}, "error": None}
+    _run_script(client, batch["mode"], command, iterations, delay, ship_mismatches, label, batch)
+    if not batch["iterations"]:
+        print(f"Batched run produced no results on this host; running {label} once per iteration")
+        batch["mode"] = "exec"
+        _run_each(client, command, iterations, delay, ship_mismatches, label, batch)
+    if batch["error"] is None and len(batch["iterations"]) < iterations:
+        batch["error"] = f"{label} stopped after {len(batch['iterations'])} of {iterations} iterations"
+    return batch
+
+
+def first_output(batch):
+    return batch["outputs"].get(batch["iterations"][0]["hash"], "") if batch["iterations"] else ""
+
+
+def last_output(batch):
+    """The last iteration's output if it was shipped (or equals iteration 1's), else None."""
+    return batch["outputs"].get(batch["iterations"][-1]["hash"]) if batch["iterations"] else None
+
+
+def consistent(batch):
+    return len({it["hash"] for it in batch["iterations"]}) <= 1
+
+
+def command_ms(batch):
+    return [it["ms"] for it in batch["iterations"]]
@@ -5,6 +5,26 @@ import paramiko
 import time
 import os
 
+from _ssh_batch import run_batched, command_ms, last_output
+
+# Read by src/standalone/plugin_registry.py (literal values only)
+PLUGIN_META = {
+    "name": "Disk Information",
+    "target": "remote",
+    "description": "Reads logical disk sizes and free space (wmic) over SSH.",
+    "parameters": {
+        "iterations": {"type": "int", "default": 1, "min": 1},
+        "ip": {"type": "str", "required": True},
+        "username": {"type": "str", "required": True},
+        "password": {"type": "str", "secret": True},
+        "key_file": {"type": "str", "description": "Private key file, used instead of the password"},
+        "port": {"type": "int", "default": 22, "description": "SSH port"},
+        "delay": {"type": "int", "default": 1, "min": 0, "description": "Seconds between iterations"},
+    },
+    "expected_duration": 2,
+    "timeout": 60,
+}
+
 def run_test(iterations=1, params=None):
     if params is None:
         params = {}
@@ -13,6 +33,7 @@ def run_test(iterations=1, params=None):
     username = params.get("username")
     password = params.get("password")
     key_file = params.get("key_file")
+    port = int(params.get("port") or 22)
     delay = params.get("delay", 1)
 
     client = paramiko.SSHClient()
@@ -26,9 +47,9 @@ def run_test(iterations=1, params=None):
             print(f"Attempting SSH to {ip} as {username}...")
             if key_file and os.path.exists(key_file):
                 pkey = paramiko.RSAKey.from_private_key_file(key_file)
-                client.connect(ip, username=username, pkey=pkey, timeout=5)
+                client.connect(ip, port=port, username=username, pkey=pkey, timeout=5)
             else:
-                client.connect(ip, username=username, password=password, timeout=5)
+                client.connect(ip, port=port, username=username, password=password, timeout=5)
             connected = True
             break
         except Exception:
@@ -40,29 +61,18 @@ def run_test(iterations=1, params=None):
 
     print(f"Connected to {ip} as {username}")
 
-    outputs = []
     try:
-        for i in range(iterations):
-            stdin, stdout, stderr = client.exec_command("wmic logicaldisk get size,freespace,caption")
-            output = stdout.read().decode(errors="ignore").strip()
-            error = stderr.read().decode(errors="ignore").strip()
-
-            if error:
-                print(f"Iteration {i+1} error: {error}")
-                return {"outcome": "Fail", "metrics": {"error": error}}
-
-            print("\n---------------------------------------------------------")
-            print(f"Disk Information :: Iteration {i+1}:\n{output}\n")
-            outputs.append(output)
-
-            if i < iterations - 1:
-                time.sleep(delay)
-
+        # One script runs every iteration on the device and streams back per-iteration
+        # hashes; full output only for iteration 1 and changed outputs (see _ssh_batch.py)
+        batch = run_batched(client, "wmic logicaldisk get size,freespace,caption", iterations, delay, label="Disk Information")
         client.close()
 
+        if batch["error"]:
+            return {"outcome": "Fail", "metrics": {"error": batch["error"]}}
+
         # ✅ Instead of strict consistency, check if we got any valid disk info
-        if any("C:" in out or "Caption" in out for out in outputs):
-            return {"outcome": "Pass", "metrics": {"details": outputs[-1][:200] + "..."}}
+        if any("C:" in out or "Caption" in out for out in batch["outputs"].values()):
+            return {"outcome": "Pass", "metrics": {"details": last_output(batch)[:200] + "...", "command_ms": command_ms(batch)}}
         else:
             return {"outcome": "Fail", "metrics": {"error": "No valid disk info"}}
 
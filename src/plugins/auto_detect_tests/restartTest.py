@@ -5,6 +5,24 @@ import paramiko
 import time
 import os
 
+# Read by src/standalone/plugin_registry.py (literal values only)
+PLUGIN_META = {
+    "name": "Restart",
+    "target": "remote",
+    "description": "Restarts the device over SSH and waits for it to reboot.",
+    "parameters": {
+        "iterations": {"type": "int", "default": 1, "min": 1},
+        "ip": {"type": "str", "required": True},
+        "username": {"type": "str", "required": True},
+        "password": {"type": "str", "secret": True},
+        "key_file": {"type": "str", "description": "Private key file, used instead of the password"},
+        "port": {"type": "int", "default": 22, "description": "SSH port"},
+        "delay": {"type": "int", "default": 0, "min": 0, "description": "Extra seconds to wait after the 60 s reboot wait"},
+    },
+    "expected_duration": 62,
+    "timeout": 180,
+}
+
 def run_test(iterations=1, params=None):
     if params is None:
         params = {}
@@ -13,6 +31,7 @@ def run_test(iterations=1, params=None):
     username = params.get("username")
     password = params.get("password")
     key_file = params.get("key_file")  # support private key auth
+    port = int(params.get("port") or 22)
     delay = params.get("delay", 0)     # extra wait time after reboot
 
     # ✅ Validate required parameters
@@ -37,9 +56,9 @@ def run_test(iterations=1, params=None):
                     print(f"{ip},{username},{password},{delay}")
                     if key_file and os.path.exists(key_file):
                         pkey = paramiko.RSAKey.from_private_key_file(key_file)
-                        client.connect(ip, username=username, pkey=pkey, timeout=5)
+                        client.connect(ip, port=port, username=username, pkey=pkey, timeout=5)
                     else:
-                        client.connect(ip, username=username, password=password, timeout=5)
+                        client.connect(ip, port=port, username=username, password=password, timeout=5)
                     connected = True
                     break
                 except Exception as e:
@@ -0,0 +1,132 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import paramiko
+import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Read by src/standalone/plugin_registry.py (literal values only)
+PLUGIN_META = {
+    "name": "System Snapshot",
+    "target": "remote",
+    "description": "CPU, memory, disk, system and process information in one SSH session, "
+                   "all commands running at once; each section is recorded as its own result.",
+    "parameters": {
+        "iterations": {"type": "int", "default": 1, "min": 1, "description": "Snapshots to take"},
+        "ip": {"type": "str", "required": True},
+        "username": {"type": "str", "required": True},
+        "password": {"type": "str", "secret": True},
+        "key_file": {"type": "str", "description": "Private key file, used instead of the password"},
+        "port": {"type": "int", "default": 22, "description": "SSH port"},
+        "delay": {"type": "int", "default": 1, "min": 0, "description": "Seconds between snapshots"},
+        "sections": {"type": "str", "default": "cpu,memory,disk,system,processes",
+                     "description": "Comma separated sections to collect"},
+    },
+    "expected_duration": 5,
+    "timeout": 120,
+}
+
+# Section -> command, the same commands as the single-section plugins
+SECTIONS = {
+    "cpu": "cat /proc/cpuinfo || systeminfo | findstr /C:\"Processor\"",
+    "memory": 'systeminfo | findstr /C:"Total Physical Memory"',
+    "disk": "wmic logicaldisk get size,freespace,caption",
+    "system": "systeminfo",
+    "processes": "tasklist",
+}
+
+
+def _section_result(name, output, error):
+    if error:
+        return "Fail", error
+    if not output:
+        return "Fail", "No output"
+    if name == "disk" and "C:" not in output and "Caption" not in output:
+        return "Fail", "No valid disk info"
+    return "Pass", None
+
+
+def _collect(name, stdin, stdout, stderr, started):
+    # Each command has its own channel on the shared transport; reading them
+    # from separate threads lets the slow ones (systeminfo) overlap
+    output = stdout.read().decode(errors="ignore").strip()
+    error = stderr.read().decode(errors="ignore").strip()
+    return name, output, error, time.time() - started
+
+
+def run_test(iterations=1, params=None):
+    if params is None:
+        params = {}
+
+    ip = params.get("ip")
+    username = params.get("username")
+    password = params.get("password")
+    key_file = params.get("key_file")  # support private key auth
+    port = int(params.get("port") or 22)
+    delay = params.get("delay", 1)
+    sections = [s.strip() for s in str(params.get("sections") or ",".join(SECTIONS)).split(",") if s.strip()]
+
+    unknown = [s for s in sections if s not in SECTIONS]
+    if unknown or not sections:
+        return {"outcome": "Fail", "metrics": {"error": f"Unknown sections: {', '.join(unknown)} (choose from {', '.join(SECTIONS)})"}}
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+    # Retry connect for up to 20s
+    start_time = time.time()
+    connected = False
+    while time.time() - start_time < 20:
+        try:
+            print(f"Attempting SSH to {ip} as {username}...")
+            if key_file and os.path.exists(key_file):
+                pkey = paramiko.RSAKey.from_private_key_file(key_file)
+                client.connect(ip, port=port, username=username, pkey=pkey, timeout=5)
+            else:
+                client.connect(ip, port=port, username=username, password=password, timeout=5)
+            connected = True
+            break
+        except Exception:
+            time.sleep(2)
+
+    if not connected:
+        print(f"Connection failed after 20s to {ip}")
+        return {"outcome": "Fail", "metrics": {"error": "SSH connection failed"}}
+
+    print(f"Connected to {ip} as {username}")
+
+    snapshot_seconds = []
+    try:
+        with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+            for i in range(iterations):
+                started = time.time()
+                # Open every channel first so all commands run on the host at once
+                channels = [(name, *client.exec_command(SECTIONS[name])) for name in sections]
+                futures = [pool.submit(_collect, *channel, started) for channel in channels]
+
+                for future in futures:
+                    name, output, error, seconds = future.result()
+                    outcome, reason = _section_result(name, output, error)
+                    print("\n---------------------------------------------------------")
+                    print(f"Snapshot {i+1} :: {name} ({seconds:.2f}s, {outcome}):\n{error or output}\n")
+                    metrics = {f"{name}_seconds": round(seconds, 3)}
+                    if reason:
+                        metrics["error"] = reason
+                    # Snapshot number and section describe the record, they are not measurements
+                    details = {"snapshot": i + 1, "section": name,
+                               "output": output[:200] + ("..." if len(output) > 200 else "")}
+                    yield {"outcome": outcome, "metrics": metrics, "details": details}
+
+                snapshot_seconds.append(round(time.time() - started, 3))
+                print(f"Snapshot {i+1} took {snapshot_seconds[-1]:.2f}s for {len(sections)} sections")
+                if i < iterations - 1:
+                    time.sleep(delay)
+
+    except Exception as e:
+        print(f"Command execution failed: {e}")
+        return {"outcome": "Fail", "metrics": {"error": str(e), "snapshot_seconds": snapshot_seconds}}
+    finally:
+        client.close()
+
+    return {"metrics": {"sections": sections, "snapshot_seconds": snapshot_seconds}}
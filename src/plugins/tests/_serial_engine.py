@@ -0,0 +1,240 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# Helper for the serial power-cycle plugins (not a plugin: the registry skips "_" files).
+# SerialEngine drives many serial ports at once from one loop: every device
+# walks its own list of steps (a small state machine), so N devices take about
+# as long as the slowest one instead of N times one device. A step is
+#     {"command": "S4_SLEEP\n", "settle": 2}                      wait 2s, then the next step
+#     {"command": "WAKE_UP\n", "expect": "login:", "timeout": 25}  wait for a line matching expect
+# and "fail_on" (a regex, e.g. "Kernel panic") fails the device as soon as a line matches it.
+# Every line a device sends is kept with the seconds since the run started.
+# Ports are polled with a selector on their file descriptors (POSIX); where
+# pyserial has no fileno (Windows) they are polled every POLL_INTERVAL seconds.
+import re
+import selectors
+import time
+
+POLL_INTERVAL = 0.02
+MAX_RESPONSES = 200  # lines kept per device and run
+
+
+def _import_serial():
+    try:
+        import serial
+    except ImportError:
+        raise RuntimeError("pyserial is required for serial DUTs (pip install pyserial)")
+    return serial
+
+
+class SerialDevice:
+    """One port and where it is in the current run."""
+
+    def __init__(self, port, connection):
+        self.port = port
+        self.connection = connection
+        self.buffer = b""
+        self.reset([], 0)
+
+    def reset(self, steps, now):
+        self.steps = steps
+        self.step = -1
+        self.state = "running"  # running -> done | failed
+        self.started = now
+        self.deadline = now
+        self.expect = None
+        self.fail_on = None
+        self.error = None
+        self.finished = None
+        self.responses = []
+
+    def send_next(self, now):
+        """Start the next step, or finish the run after the last one."""
+        self.step += 1
+        if self.step >= len(self.steps):
+            self.state, self.finished = "done", now
+            return
+        step = self.steps[self.step]
+        expect = step.get("expect")
+        self.expect = re.compile(expect) if expect else None
+        self.fail_on = re.compile(step["fail_on"]) if step.get("fail_on") else None
+        self.deadline = now + (step.get("timeout", 25) if self.expect else step.get("settle", 0))
+        self.buffer = b""  # a prompt matched by the previous step must not match this one
+        try:
+            self.connection.write(step["command"].encode("utf-8"))
+            self.connection.flush()
+        except Exception as e:
+            self.fail(now, f"write failed: {e}")
+
+    def fail(self, now, error):
+        self.state, self.error, self.finished = "failed", error, now
+
+    def feed(self, data, now):
+        """Record complete lines; "fail" if one matches fail_on, "expect" if one (or a pending prompt) matches expect."""
+        self.buffer += data
+        matched = None
+        while True:
+            cut = min((i for i in (self.buffer.find(b"\n"), self.buffer.find(b"\r")) if i >= 0), default=-1)
+            if cut < 0:
+                break
+            line, self.buffer = self.buffer[:cut].decode("utf-8", errors="ignore").strip(), self.buffer[cut + 1:]
+            if not line:
+                continue
+            if len(self.responses) < MAX_RESPONSES:
+                self.responses.append([round(now - self.started, 3), line])
+            if self.fail_on and self.fail_on.search(line):
+                self.error = f"[+{self.responses[-1][0] if self.responses else 0}s] {line}"
+                return "fail"
+            if self.expect and self.expect.search(line):
+                matched = "expect"
+        pending = self.buffer.decode("utf-8", errors="ignore")
+        if self.expect and pending and self.expect.search(pending):
+            matched = "expect"
+        return matched
+
+    def result(self):
+        return {
+            "outcome": "Pass" if self.state == "done" else "Fail",
+            "seconds": round((self.finished or time.time()) - self.started, 3),
+            "responses": self.responses,
+            "error": self.error,
+        }
+
+
+class SerialEngine:
+    """Open ports once, then run(steps) on all of them concurrently as often as needed."""
+
+    def __init__(self, ports, baudrate=115200):
+        self.ports = list(ports)
+        self.baudrate = baudrate
+        self.devices = []
+        self.selector = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        serial = _import_serial()
+        try:
+            for port in self.ports:
+                connection = serial.Serial(port, self.baudrate, timeout=0)
+                self.devices.append(SerialDevice(port, connection))
+                print(f"Connected to {port} at {self.baudrate} baud.")
+        except Exception:
+            self.close()
+            raise
+        try:
+            selector = selectors.DefaultSelector()
+            for device in self.devices:
+                selector.register(device.connection.fileno(), selectors.EVENT_READ, device)
+            self.selector = selector
+        except (AttributeError, OSError, ValueError):
+            self.selector = None  # no pollable descriptors (Windows): poll in_waiting instead
+        return self
+
+    def close(self):
+        if self.selector is not None:
+            self.selector.close()
+            self.selector = None
+        for device in self.devices:
+            try:
+                device.connection.close()
+            except Exception:
+                pass
+        self.devices = []
+
+    def _readable(self, timeout):
+        if self.selector is not None:
+            return [key.data for key, _ in self.selector.select(timeout)]
+        time.sleep(min(timeout, POLL_INTERVAL))
+        return [d for d in self.devices if d.state == "running" and d.connection.in_waiting]
+
+    def run(self, steps):
+        """Run the steps on every device at once; {port: {"outcome", "seconds", "responses", "error"}}."""
+        now = time.time()
+        for device in self.devices:
+            device.reset(steps, now)
+            device.send_next(now)
+        running = [d for d in self.devices if d.state == "running"]
+        while running:
+            timeout = max(0.0, min(d.deadline for d in running) - time.time())
+            for device in self._readable(timeout):
+                try:
+                    data = device.connection.read(device.connection.in_waiting or 1)
+                except Exception as e:
+                    device.fail(time.time(), f"read failed: {e}")
+                    if self.selector is not None:
+                        try:
+                            self.selector.unregister(device.connection.fileno())  # a dead port stays readable
+                        except (KeyError, OSError, ValueError):
+                            pass
+                    continue
+                if device.state != "running":
+                    continue
+                matched = device.feed(data, time.time())
+                if matched == "fail":
+                    device.fail(time.time(), device.error)
+                elif matched == "expect":
+                    device.send_next(time.time())
+            now = time.time()
+            for device in running:
+                if device.state != "running" or now < device.deadline:
+                    continue
+                if device.expect:
+                    device.fail(now, f"no response matching {device.expect.pattern!r} "
+                                     f"within {steps[device.step].get('timeout', 25)}s")
+                else:
+                    device.send_next(now)
+            running = [d for d in running if d.state == "running"]
+        return {device.port: device.result() for device in self.devices}
+
+
+def run_record(results):
+    """
+    One iteration record for the runner: Pass only if every device passed.
+    boot_time (the slowest device) is the only metric; the device counts and
+    per-port results are details, so IterationMetrics does not ingest them.
+    """
+    failed = [port for port, r in results.items() if r["outcome"] != "Pass"]
+    return {
+        "outcome": "Fail" if failed or not results else "Pass",
+        "metrics": {"boot_time": max((r["seconds"] for r in results.values()), default=0)},
+        "details": {"devices": len(results), "devices_failed": len(failed), "ports": results},
+    }
+
+
+def parse_ports(value):
+    """ports parameter: "COM3,COM4" or a list."""
+    if isinstance(value, (list, tuple)):
+        return [str(p).strip() for p in value if str(p).strip()]
+    return [p.strip() for p in str(value or "").split(",") if p.strip()]
+
+
+def run_serial(label, steps, iterations, params):
+    """
+    Generator for a plugin's run_test: runs `steps` on every port in
+    params["ports"] once per iteration and yields one run_record per iteration.
+    With params["expect"] the last step waits for that line (up to
+    params["boot_timeout"] seconds) instead of settling; params["fail_on"]
+    applies to every step.
+    """
+    steps = [dict(step) for step in steps]
+    if params.get("expect"):
+        steps[-1].update(expect=params["expect"], timeout=params.get("boot_timeout", 25))
+    if params.get("fail_on"):
+        for step in steps:
+            step["fail_on"] = params["fail_on"]
+    with SerialEngine(parse_ports(params["ports"]), params.get("baudrate", 115200)) as engine:
+        for i in range(iterations):
+            print(f"\n=== {label} Iteration {i + 1} ===")
+            record = run_record(engine.run(steps))
+            for port, result in record["details"]["ports"].items():
+                for seconds, line in result["responses"]:
+                    print(f"[{port} +{seconds:.3f}s] {line}")
+                print(f"{port}: {result['outcome']} in {result['seconds']:.2f}s"
+                      + (f" ({result['error']})" if result["error"] else ""))
+            yield record
+
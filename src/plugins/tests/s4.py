@@ -5,78 +5,48 @@ import random
 import time
 import sys
 
+from _serial_engine import run_serial
+
 # Ensure UTF-8 printing
 sys.stdout.reconfigure(encoding='utf-8')
 
-# Uncomment and run this below run_test method once there is serial communication established w/ actual hardware.
-
-# def run_test(iterations, ports, baudrates, sleep_command="S4_SLEEP\n", wake_command="WAKE_UP\n", timeout=1):
-#     """
-#     Run S4 sleep/wake test on multiple devices via serial communication.
-
-#     Parameters:
-#         iterations (int): Number of sleep/wake cycles.
-#         ports (list): List of serial ports for the devices.
-#         baudrates (list): List of baud rates corresponding to the ports.
-#         sleep_command (str): Command to put device into S4 sleep.
-#         wake_command (str): Command to wake device from S4 sleep.
-#         timeout (int/float): Serial timeout.
-
-#     Returns:
-#         str: "Pass" if all iterations succeed on all devices, else "Fail".
-#     """
-#     if len(ports) != len(baudrates):
-#         print("Error: Number of ports and baudrates must match.")
-#         return "Fail"
-
-#     serial_devices = []
-#     for i, port in enumerate(ports):
-#         try:
-#             ser = serial.Serial(port, baudrates[i], timeout=timeout)
-#             serial_devices.append(ser)
-#             print(f"Connected to device {i+1} on {port} at {baudrates[i]} baud.")
-#         except serial.SerialException as e:
-#             print(f"Failed to connect to device {i+1}: {e}")
-#             return "Fail"
-
-#     all_passed = True
-
-#     for iteration in range(iterations):
-#         print(f"\n=== S4 Iteration {iteration + 1} ===")
-#         for i, ser in enumerate(serial_devices):
-#             try:
-#                 # Put device into S4 sleep
-#                 print(f"Device {i+1}: Sending sleep command...")
-#                 ser.write(sleep_command.encode())
-#                 time.sleep(2)  # Adjust delay if needed
-
-#                 # Wake device up
-#                 print(f"Device {i+1}: Sending wake command...")
-#                 ser.write(wake_command.encode())
-#                 time.sleep(2)
-
-#                 # Read response
-#                 if ser.in_waiting:
-#                     response = ser.read(ser.in_waiting).decode("utf-8", errors="ignore")
-#                     print(f"Device {i+1} response:\n{response}")
-#                 else:
-#                     print(f"Device {i+1}: No response received.")
-
-#             except Exception as e:
-#                 print(f"Device {i+1}: Error during iteration {iteration + 1}: {e}")
-#                 all_passed = False
-
-#     for ser in serial_devices:
-#         ser.close()
-
-#     result = "Pass" if all_passed else "Fail"
-#     print(f"\nOverall Result: {result}")
-#     return result
-
-# Below is the dummy run_test method
-
-def run_test(iterations):
+# Read by src/standalone/plugin_registry.py (literal values only)
+PLUGIN_META = {
+    "name": "S4 Sleep/Wake",
+    "target": "dut",
+    "description": "Puts the DUT into S4 (hibernate) and wakes it over its serial port.",
+    "parameters": {
+        "iterations": {"type": "int", "default": 1, "min": 1},
+        "fail_fast": {"type": "bool", "default": False, "description": "Stop at the first failed iteration"},
+        "ports": {"type": "str", "description": "Comma separated serial ports, all driven at once (default: dummy run)"},
+        "baudrate": {"type": "int", "default": 115200},
+        "expect": {"type": "str", "description": "Regex of the line that ends a boot, e.g. login:"},
+        "boot_timeout": {"type": "int", "default": 25, "min": 1, "description": "Seconds to wait for expect"},
+        "fail_on": {"type": "str", "description": "Regex of a line that fails the boot at once, e.g. Kernel panic"},
+    },
+    "expected_duration": 0.5,
+    "timeout": 10,
+    "timeout_parameter": "boot_timeout",
+}
+
+# Serial run, used when parameters["ports"] lists the DUT serial ports: the steps
+# below run on every port at once (_serial_engine.py). With "expect" set, the
+# last step waits for a matching line (e.g. a login prompt) instead of settling;
+# a line matching "fail_on" fails that device's boot at once.
+STEPS = [
+    {"command": "S4_SLEEP\n", "settle": 2},
+    {"command": "WAKE_UP\n", "settle": 2},
+]
+
+
+# Below is the dummy run_test method, used without ports
+# Yields one record per iteration, so the runner logs progress as it happens
+def run_test(iterations, params=None):
+    if params and params.get("ports"):
+        yield from run_serial("S4", STEPS, iterations, params)
+        return
     for i in range(iterations):
+        started = time.time()
         print(f"S4 Iteration {i+1}: Booting system... {random.randint(1000, 9999)}")
         gibberish_chars = []
         for _ in range(20):
@@ -84,6 +54,8 @@ def run_test(iterations):
             gibberish_chars.append(chr(random_char_code))
         print("".join(gibberish_chars))
         time.sleep(0.5)
+        yield {"outcome": "Pass", "metrics": {"boot_time": round(time.time() - started, 3)}}
+    # The dummy outcome is decided once per job, as before streaming
     result = random.choice(["Pass", "Fail"])
     print(f"Result: {result}")
-    return result
+    return {"outcome": result}
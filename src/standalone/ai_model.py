@@ -4,17 +4,21 @@
 import sqlite3
 import json
 import numpy as np
+from executor import DELAY_OPTIONS, ITERATIONS_OPTIONS  # action space shared with parameter sweeps
 
 class QLearningAgent:
-    def __init__(self, iterations_options=[5, 8, 10, 15], delay_options=[3, 4, 5, 6],
-                alpha=0.1, gamma=0.9, epsilon=0.1):
-        self.iterations_options = iterations_options
-        self.delay_options = delay_options
+    def __init__(self, iterations_options=None, delay_options=None,
+                alpha=0.1, gamma=0.9, epsilon=0.1, db_path="framework.db", include_archives=True):
+        self.iterations_options = list(iterations_options or ITERATIONS_OPTIONS)
+        self.delay_options = list(delay_options or DELAY_OPTIONS)
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
         self.q_table = {}
-        self.conn = sqlite3.connect("framework.db")
+        self.db_path = db_path
+        # Learn from the archived months too (archive.py), not only the hot Logs rows
+        self.include_archives = include_archives
+        self.conn = sqlite3.connect(db_path)
         self.load_logs()
 
     def get_state(self, hardware_type, test_name, username=None):
@@ -29,7 +33,12 @@ class QLearningAgent:
 
     def load_logs(self):
         try:
-            cursor = self.conn.execute("SELECT hardware_type, test_name, parameters, outcome, username FROM Logs")
+            table = "Logs"
+            if self.include_archives:
+                from archive import attach_archives
+                attach_archives(self.conn, self.db_path)
+                table = "LogsAll"
+            cursor = self.conn.execute(f"SELECT hardware_type, test_name, parameters, outcome, username FROM {table}")
             for row in cursor:
                 hardware_type, test_name, params, outcome, username = row
                 params = json.loads(params)
@@ -2,18 +2,29 @@
 # This file contains proprietary code and/or utilities for development purposes.
 
 # src/standalone/app.py
+import time
+RUN_STARTED = time.perf_counter()  # before the imports, so the first run's time includes them
+
 import streamlit as st
 import json
 import os
-import time
 import sqlite3
-import plotly.express as px
-import pandas as pd
 from hardware import mock_hardware_detection
 from ai_model import suggest_parameters
-from executor import submit_job
-from database import init_db
-import plotly.graph_objects as go
+from executor import get_next_job_id, submit_job, submit_pool_job, submit_sweep
+from database import (
+    PERCENTILES, init_db, iteration_metric_percentiles, job_history, outcome_counts_by_dut,
+    remote_history, remote_usernames,
+)
+from archive import logs_source, start_background_archiver
+from dashboard_figures import (
+    HARDWARE_COLORS, REMOTE_COLORS, history_points, outcome_bar, outcome_frame, outcome_pie, percentile_bar,
+    percentile_frame, remote_frame, remote_outcome_bar, remote_outcome_pie, remote_points, scatter_figure,
+    trend_figure,
+)
+from ai_model import ITERATIONS_OPTIONS, DELAY_OPTIONS
+from test_plan import list_plans, load_plan, run_plan
+from plugin_registry import estimate_duration, find_plugin, plugin_names
 from hardware import mock_hardware_detection, auto_detect_network_devices
 import sys
 
@@ -24,6 +35,73 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 
+# ---------------------- CACHED RESOURCES ----------------------
+# Streamlit re-executes this whole script on every interaction. Anything that
+# does not change between reruns is built once per process here.
+@st.cache_resource
+def database(db_path="framework.db"):
+    """Schema check/migrations and the background archiver, once per process."""
+    init_db(db_path).close()
+    # Moves Logs rows older than a few months into archive/
+    start_background_archiver(db_path)
+    return db_path
+
+
+def session_connection():
+    """One connection per browser session, reused by all of its reruns (they never overlap)."""
+    if "db_conn" not in st.session_state:
+        st.session_state.db_conn = sqlite3.connect(database(), check_same_thread=False)
+    return st.session_state.db_conn
+
+
+@st.cache_resource
+def hardware_inventory():
+    """Known DUTs (read-only: callers must not modify the returned dicts)."""
+    return mock_hardware_detection()
+
+
+# ---------------------- TIMING ----------------------
+# Per-run phase timings, shown in the sidebar. Set STF_TIMING=1 to also print
+# one line per run. The first run of the process is the cold start.
+TIMING_HISTORY = 20
+run_phases = {}
+
+
+@st.cache_resource
+def process_timing():
+    return {"runs": 0, "cold_start_ms": None}
+
+
+def mark_phase(name):
+    """Record the time since the end of the previous phase (or the start of the run)."""
+    now = time.perf_counter()
+    run_phases[name] = (now - run_phases.get("_last", RUN_STARTED)) * 1000
+    run_phases["_last"] = now
+
+
+def timing_report():
+    total_ms = (time.perf_counter() - RUN_STARTED) * 1000
+    process = process_timing()
+    process["runs"] += 1
+    if process["cold_start_ms"] is None:
+        process["cold_start_ms"] = total_ms
+    history = st.session_state.setdefault("run_timings", [])
+    history.append(total_ms)
+    del history[:-TIMING_HISTORY]
+
+    phases = {name: ms for name, ms in run_phases.items() if not name.startswith("_")}
+    with st.sidebar.expander("⏱️ Timing"):
+        st.markdown(
+            f"This run: **{total_ms:.1f} ms**  \n"
+            + "".join(f"{name}: {ms:.1f} ms  \n" for name, ms in phases.items())
+            + f"Median of last {len(history)} runs: {sorted(history)[len(history) // 2]:.1f} ms  \n"
+            f"Cold start (first run in this process): {process['cold_start_ms']:.1f} ms"
+        )
+    if os.environ.get("STF_TIMING") == "1":
+        detail = ", ".join(f"{name} {ms:.1f}" for name, ms in phases.items())
+        print(f"[timing] run {process['runs']}: {total_ms:.1f} ms ({detail})")
+
+
 # ---------------------- GLOBAL STYLES ----------------------
 st.markdown(
     """
@@ -107,8 +185,8 @@ if "auto_detect_username" not in st.session_state:
 if "auto_detect_password" not in st.session_state:
     st.session_state.auto_detect_password = None
 
-# Initialize DB
-conn = init_db()
+conn = session_connection()
+mark_phase("startup")
 
 # ---------------------- PAGE TITLE ----------------------
 st.title("SmartTestFramework")
@@ -119,7 +197,12 @@ main_tab, dashboard_tab = st.tabs(["🖥️ Main", "📊 Dashboard"])
 # ---------------------- MAIN TAB ----------------------
 with main_tab:
     def update_job_status():
-        cursor = conn.execute("SELECT job_id, dut, outcome, metrics FROM Logs")
+        # Only the jobs tracked in this session; metrics keep their {"$blob": ...} references
+        job_ids = list(st.session_state.job_status)
+        cursor = conn.execute(
+            f"SELECT job_id, dut, outcome, metrics FROM Logs WHERE job_id IN ({','.join('?' * len(job_ids))})",
+            job_ids,
+        )
         completed_jobs = {row[0]: {"dut": row[1], "outcome": row[2], "metrics": json.loads(row[3])} for row in cursor}
         cursor = conn.execute("SELECT dut, status, job_queue FROM DUTStatus")
         for dut, status, job_queue in cursor:
@@ -140,12 +223,16 @@ with main_tab:
                         st.session_state.job_status[job_id]["status"] = "queued"
 
     # Hardware + DUT selection
-    hardware = mock_hardware_detection()
+    hardware = hardware_inventory()
     cursor = conn.execute("SELECT dut, status FROM DUTStatus")
     dut_status = {row[0]: row[1] for row in cursor}
     hardware_options = [f"DUT{h['DUT']} ({dut_status.get(h['DUT'], 'Unknown')})" for h in hardware]
     dut_ids = [h['DUT'] for h in hardware]
 
+    # Append one "any free DUT" pool option per hardware type
+    pool_options = {f"🔀 Any {t} DUT (pool)": t for t in sorted({h["hardware_type"] for h in hardware})}
+    hardware_options.extend(pool_options.keys())
+
     # Append "Auto detect" option
     hardware_options.append("🔍 Auto detect device")
 
@@ -199,6 +286,28 @@ with main_tab:
             st.session_state.auto_detected_device = selected_hardware_data["ip"]
             # Note: username/password kept by their widgets' keys
 
+    elif selected_hardware_option in pool_options:
+        # Pool flow -> executor dispatches to the least-loaded DUT of this type
+        pool_type = pool_options[selected_hardware_option]
+        pool_duts = [h["DUT"] for h in hardware if h["hardware_type"] == pool_type]
+        selected_dut = f"pool:{pool_type}"
+        selected_hardware_data = {
+            "hardware_type": pool_type,
+            "serial": "-",
+            "com_port": "-",
+            "mac_address": "-",
+        }
+        st.markdown(
+            f"""
+            <div class="info-card">
+                <b>{pool_type} pool</b><br>
+                <small>DUTs:</small> {", ".join(f"DUT{d} ({dut_status.get(d, 'Unknown')})" for d in pool_duts)}<br>
+                <small>Dispatch:</small> least-loaded Free DUT
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
     else:
         # Normal DUT flow
         selected_dut = dut_ids[hardware_options.index(selected_hardware_option)]
@@ -222,7 +331,8 @@ with main_tab:
     else:
         tests_dir = resource_path(os.path.join("src", "plugins", "tests"))
 
-    tests = [f[:-3] for f in os.listdir(tests_dir) if f.endswith(".py")]
+    # Plugin folders are scanned once and rescanned only when they change (plugin_registry.py)
+    tests = plugin_names("remote" if selected_dut == "auto" else "dut", root=resource_path("."))
 
     if not tests:
         st.error(f"🚫 No test scripts found in {tests_dir}/")
@@ -249,6 +359,16 @@ with main_tab:
 
         st.number_input("Iterations", min_value=1, key="iterations")
         st.number_input("Delay (seconds)", min_value=1, key="delay")
+        plugin = find_plugin(selected_test, root=resource_path("."))
+        if plugin and (plugin["description"] or plugin["expected_duration"] is not None):
+            expected = estimate_duration(plugin, st.session_state.iterations)
+            st.caption(plugin["description"] + (f" Expected duration: ~{expected:.0f}s." if expected is not None else ""))
+        if plugin and plugin["streaming"]:
+            # Streaming (v2) plugins report every iteration, so the runner can stop early
+            st.checkbox("Stop at first failed iteration", key="fail_fast")
+        if selected_dut != "auto":
+            # Split iterations across identical DUTs (same hardware type) and run them in parallel
+            st.number_input("Shards (identical DUTs)", min_value=1, value=1, key="shards")
     else:
         st.number_input("Iterations", min_value=1, value=10, disabled=True, key="iterations")
         st.number_input("Delay (seconds)", min_value=1, value=5, disabled=True, key="delay")
@@ -256,10 +376,8 @@ with main_tab:
     # Run Test Button
     if st.button("🚀 Run Test", use_container_width=True):
         try:
-            # Reserve a job id & show immediate submit notice
-            conn.execute("BEGIN TRANSACTION")
-            cursor = conn.execute("SELECT next_job_id FROM JobIDCounter WHERE counter_id = 1")
-            job_id = cursor.fetchone()[0]
+            # Reserve the job id that submit_job will use & show immediate submit notice
+            job_id = get_next_job_id(conn)
             conn.commit()
 
             st.session_state.job_status[job_id] = {
@@ -276,6 +394,8 @@ with main_tab:
                 "iterations": st.session_state.iterations,
                 "delay": st.session_state.delay,
             }
+            if st.session_state.get("fail_fast"):
+                params_dict["fail_fast"] = True
             if selected_dut == "auto":
                 # prefer values from widgets / session_state
                 params_dict["ip"] = st.session_state.get("auto_detected_device") or selected_hardware_data.get("ip")
@@ -283,11 +403,23 @@ with main_tab:
                 params_dict["password"] = st.session_state.get("auto_detect_password") or selected_hardware_data.get("password")
 
             conn.execute("BEGIN TRANSACTION")
-            job_result = submit_job(
-                conn, selected_dut, selected_hardware_data["hardware_type"], selected_hardware_data["serial"],
-                selected_hardware_data["com_port"], selected_hardware_data["mac_address"],
-                selected_test, st.session_state.iterations, params_dict
-            )
+            if str(selected_dut).startswith("pool:"):
+                job_result = submit_pool_job(
+                    conn, selected_hardware_data["hardware_type"],
+                    selected_test, st.session_state.iterations, params_dict,
+                    shards=st.session_state.get("shards", 1), job_id=job_id
+                )
+                # Remember which DUT the pool dispatched to, while keeping the job visible under the pool
+                st.session_state.job_status[job_id]["pool"] = selected_dut
+                st.session_state.job_status[job_id]["dut"] = job_result.get("dut")
+            else:
+                job_result = submit_job(
+                    conn, selected_dut, selected_hardware_data["hardware_type"], selected_hardware_data["serial"],
+                    selected_hardware_data["com_port"], selected_hardware_data["mac_address"],
+                    selected_test, st.session_state.iterations, params_dict,
+                    shards=st.session_state.get("shards", 1) if selected_dut != "auto" else 1,
+                    job_id=job_id
+                )
             conn.commit()
 
             # Save the result (returned by submit_job)
@@ -304,11 +436,65 @@ with main_tab:
             conn.rollback()
             st.error(f"Error submitting job: {str(e)}")
 
+    # Parameter Sweep (local DUTs / pools only)
+    if selected_dut and selected_dut != "auto" and tests and selected_test:
+        with st.expander("🧪 Parameter Sweep"):
+            sweep_iterations = st.multiselect("Iterations", ITERATIONS_OPTIONS, default=ITERATIONS_OPTIONS, key="sweep_iterations")
+            sweep_delays = st.multiselect("Delays (seconds)", DELAY_OPTIONS, default=DELAY_OPTIONS, key="sweep_delays")
+            st.caption(
+                f"{len(sweep_iterations) * len(sweep_delays)} jobs across every Free "
+                f"{selected_hardware_data['hardware_type']} DUT"
+            )
+            if st.button("Run Sweep", key="run_sweep", disabled=not (sweep_iterations and sweep_delays)):
+                with st.spinner("Running sweep..."):
+                    sweep_result = submit_sweep(
+                        conn, selected_hardware_data["hardware_type"], selected_test,
+                        iterations_options=sweep_iterations, delay_options=sweep_delays
+                    )
+                if sweep_result.get("queued"):
+                    st.info(f"Sweep {sweep_result['sweep_id']}: {len(sweep_result['job_ids'])} jobs queued")
+                elif sweep_result.get("sweep_id") and sweep_result["outcome"] != "Fail":
+                    st.success(
+                        f"Sweep {sweep_result['sweep_id']}: {sweep_result['metrics']['passed']}/"
+                        f"{sweep_result['metrics']['jobs']} jobs passed"
+                    )
+                    st.dataframe(sweep_result["metrics"]["results"], use_container_width=True)
+                else:
+                    st.error(f"Sweep failed: {sweep_result['metrics'].get('error')}")
+
+    # Test Plans (dependency-aware sequences, e.g. cold_boot -> warm_boot -> s4)
+    with st.expander("📑 Test Plans"):
+        plans_dir = resource_path(os.path.join("src", "plans"))
+        plan_files = list_plans(plans_dir)
+        if not plan_files:
+            st.info(f"No test plans found in {plans_dir}/")
+        else:
+            selected_plan = st.selectbox("Select Plan", plan_files, key="selected_plan")
+            plan_username = st.text_input("SSH Username (remote steps)", key="plan_ssh_username")
+            plan_password = st.text_input("SSH Password (remote steps)", type="password", key="plan_ssh_password")
+            plan_ip = st.text_input("SSH Host (remote steps)", key="plan_ssh_ip")
+            if st.button("Run Plan", key="run_plan"):
+                try:
+                    plan = load_plan(os.path.join(plans_dir, selected_plan))
+                    ssh = {k: v for k, v in {"ip": plan_ip, "username": plan_username, "password": plan_password}.items() if v}
+                    with st.spinner(f"Running plan {plan['name']}..."):
+                        plan_result = run_plan(conn, plan, ssh=ssh)
+                    (st.success if plan_result["outcome"] == "Pass" else st.warning)(
+                        f"Plan {plan_result['plan']} ({plan_result['plan_run_id']}): {plan_result['outcome']}"
+                    )
+                    st.dataframe(
+                        [{"step": k, "status": v["status"], "job_id": v["job_id"], "dut": v["dut"]}
+                         for k, v in plan_result["steps"].items()],
+                        use_container_width=True
+                    )
+                except Exception as e:
+                    st.error(f"Error running plan: {str(e)}")
+
     # Job Status
     st.subheader("📋 Job Status")
     update_job_status()
     for job_id, info in st.session_state.job_status.items():
-        if info["dut"] == selected_dut:
+        if info["dut"] == selected_dut or info.get("pool") == selected_dut:
             badge_class = (
                 "status-queued" if info["status"] == "queued"
                 else "status-running" if info["status"] == "running"
@@ -334,7 +520,7 @@ with main_tab:
             st.markdown(
                 f"""
                 <div class="job-card">
-                    <b>Job {job_id}</b> → DUT {selected_dut}<br>
+                    <b>Job {job_id}</b> → DUT {info["dut"]}<br>
                     <span class="status-badge {badge_class}">{status_text}</span><br>
                     {result_text}
                 </div>
@@ -343,6 +529,8 @@ with main_tab:
             )
 
 
+mark_phase("main tab")
+
 # ---------------------- DASHBOARD TAB ----------------------
 with dashboard_tab:
     # Create a header row with two columns
@@ -354,12 +542,18 @@ with dashboard_tab:
     with colR:
         remote_mode = st.checkbox("🌐 Remote Device Mode", key="remote_mode")
 
+    # Time range: archives (archive.py) are only attached when the range reaches them
+    time_ranges = {"Last 24 hours": 1, "Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "All time": None}
+    time_range = st.selectbox("Time Range", list(time_ranges), index=len(time_ranges) - 1, key="dashboard_time_range")
+    days = time_ranges[time_range]
+    since = None if days is None else time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(time.time() - days * 86400))
+    source = logs_source(conn, database(), since)
+
     # --- rest of your dashboard logic ---
-    hardware = mock_hardware_detection()
+    hardware = hardware_inventory()
     hardware_types = sorted(list(set(h["hardware_type"] for h in hardware)))
 
-    tests_dir_local = resource_path(os.path.join("src", "plugins", "tests"))
-    test_names_local = sorted([f[:-3] for f in os.listdir(tests_dir_local) if f.endswith(".py")])
+    test_names_local = plugin_names("dut", root=resource_path("."))
 
     # --- State Management ---
     if "dashboard_selection" not in st.session_state:
@@ -374,11 +568,9 @@ with dashboard_tab:
         st.markdown("### Remote Device Job History")
 
         # get unique usernames from Logs
-        cursor = conn.execute("SELECT DISTINCT username FROM Logs WHERE username IS NOT NULL")
-        usernames = [str(row[0]).strip() for row in cursor if row[0]]
+        usernames = [str(u).strip() for u in remote_usernames(conn) if u]
 
-        auto_tests_dir = resource_path(os.path.join("src", "plugins", "auto_detect_tests"))
-        auto_test_names = sorted([f[:-3] for f in os.listdir(auto_tests_dir) if f.endswith(".py")])
+        auto_test_names = plugin_names("remote", root=resource_path("."))
 
         # Provide "Select All" first option
         user_choice = st.multiselect("Select Usernames", ["Select All"] + usernames, default=["Select All"])
@@ -400,193 +592,33 @@ with dashboard_tab:
                 st.warning("No usernames available in logs to query.")
                 st.stop()
 
-            # Build placeholders for parameterized query (usernames first, then tests)
-            placeholders_u = ",".join(["?"] * len(sel_users))
-            placeholders_t = ",".join(["?"] * len(sel_tests))
-
-            query = f"""
-                SELECT username, test_name, outcome, parameters, timestamp
-                FROM Logs
-                WHERE username IN ({placeholders_u}) AND test_name IN ({placeholders_t})
-            """
-
-            # Correct ordering of params: usernames first, then tests
-            params = sel_users + sel_tests
-            rows = conn.execute(query, params).fetchall()
+            rows = remote_history(conn, sel_users, sel_tests, since=since, source=source)
 
             if not rows:
                 st.warning("No data found for selected filters.")
                 st.stop()
 
-            df = pd.DataFrame(rows, columns=["username", "test_name", "outcome", "parameters", "timestamp"])
-
-            # Normalize usernames -> ensure everything is string (this is critical)
-            df["username"] = df["username"].astype(str).str.strip()
-            df["username"] = df["username"].replace(["None", "nan", "NaN", ""], "Unknown")
-
-            # === Debug / quick sanity info (helps verify multiple usernames are present) ===
-            unique_users = df["username"].unique().tolist()
+            # Charts are built in dashboard_figures (pandas/plotly are imported there on first use)
+            df = remote_frame(rows)
 
             # ======================= PIE =======================
-            agg_outcome = df.groupby("outcome").size().reset_index(name="count")
-            agg_outcome["label"] = agg_outcome.apply(lambda r: f"{r['outcome']} ({r['count']})", axis=1)
-
-            fig_pie = px.pie(
-                agg_outcome,
-                names="label",
-                values="count",
-                color="outcome",
-                color_discrete_map={
-                    "Pass": "#2563eb",  # Blue
-                    "Fail": "#eab308"   # Yellow
-                },
-                title="Pass/Fail Ratio (Remote)"
-            )
-            fig_pie.update_traces(
-                textinfo="percent+value",
-                textfont_size=14,
-                pull=[0.05 if r["outcome"] == "Fail" else 0 for _, r in agg_outcome.iterrows()]
-            )
-            fig_pie.update_layout(
-                plot_bgcolor="rgba(0,0,0,0)",
-                paper_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="#333"),
-                title_font_size=16
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
+            st.plotly_chart(remote_outcome_pie(df), use_container_width=True)
 
             # ======================= BAR =======================
-            # Aggregate by username + outcome
-            bar_df = df.groupby(["username", "outcome"]).size().reset_index(name="count")
-
-            # Force username to be a string categorical so Plotly does not treat numeric-like values as numeric axis
-            bar_df["username"] = bar_df["username"].astype(str)
-
-            # Use sorted unique usernames for consistent x-axis ordering
-            username_order = sorted(bar_df["username"].unique().tolist(), key=lambda x: (str(x)))
-
-            fig_bar = px.bar(
-                bar_df.astype({"username": "string"}),   # force username as string
-                x="username",
-                y="count",
-                color="outcome",
-                barmode="stack",   # or "group" if you want side-by-side bars
-                text="count",
-                category_orders={"username": username_order},
-                color_discrete_map={"Pass": "#2563eb", "Fail": "#eab308"},
-                title="Pass/Fail Count by Username"
-            )
-
-            # Force x-axis to categorical (no auto-formatting like k/M suffixes)
-            fig_bar.update_xaxes(type="category")
+            st.plotly_chart(remote_outcome_bar(df), use_container_width=True)
 
-
-            fig_bar.update_traces(textposition="outside")
-            fig_bar.update_layout(
-                xaxis_title="Usernames",
-                yaxis_title="Count",
-                plot_bgcolor="rgba(0,0,0,0)",
-                paper_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="#333"),
-                title_font_size=16
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
+            scatter_rows, trend_rows = remote_points(df)
 
             # ======================= SCATTER (Remote) =======================
-            scatter_rows = []
-            for _, row in df.iterrows():
-                try:
-                    p = json.loads(row["parameters"] or "{}")
-                    it = p.get("iterations")
-                    dl = p.get("delay")
-                    if it is not None and dl is not None:
-                        scatter_rows.append({"Iterations": it, "Delay": dl, "Outcome": row["outcome"]})
-                except Exception:
-                    continue
-
             if scatter_rows:
-                scatter_df = pd.DataFrame(scatter_rows)
-
-                # Aggregate counts
-                grouped = scatter_df.groupby(["Iterations", "Delay", "Outcome"]).size().reset_index(name="Count")
-                totals = grouped.groupby(["Iterations", "Delay"])["Count"].sum().reset_index(name="Total")
-                grouped = grouped.merge(totals, on=["Iterations", "Delay"])
-
-                grouped["hover"] = grouped.apply(
-                    lambda r: f"Iterations={r['Iterations']}<br>Delay={r['Delay']}<br>{r['Outcome']}: {r['Count']}<br>Total={r['Total']}", axis=1
-                )
-
-                # Build figure
-                fig_scatter = go.Figure()
-                for outcome, color in [("Pass", "#2563eb"), ("Fail", "#eab308")]:
-                    sub = grouped[grouped["Outcome"] == outcome]
-                    fig_scatter.add_trace(go.Scatter(
-                        x=sub["Delay"],
-                        y=sub["Iterations"],
-                        mode="markers+text",
-                        marker=dict(size=12, color=color, opacity=0.7, line=dict(width=1, color="DarkSlateGrey")),
-                        text=sub.apply(lambda r: f"x{r['Total']}" if r["Total"] > 1 else "", axis=1),
-                        textposition="top center",
-                        name=outcome,
-                        hovertext=sub["hover"],
-                        hoverinfo="text"
-                    ))
-
-                fig_scatter.update_layout(
-                    title="Iterations-Delay Correlation w/ Result (Remote)",
-                    xaxis_title="Delay (seconds)",
-                    yaxis_title="Iterations",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    font=dict(color="#333"),
-                    title_font_size=16
-                )
-
+                fig_scatter = scatter_figure(scatter_rows, "Iterations-Delay Correlation w/ Result (Remote)", REMOTE_COLORS)
                 st.plotly_chart(fig_scatter, use_container_width=True)
             else:
                 st.info("No iterations/delay parameters available for selected filters.")
 
             # ======================= LINE TREND =======================
-            trend_rows = []
-            for _, row in df.iterrows():
-                ts = row["timestamp"]
-                if ts:
-                    try:
-                        trend_rows.append({"Timestamp": pd.to_datetime(ts), "Outcome": row["outcome"]})
-                    except Exception:
-                        continue
             if trend_rows:
-                trend_df = pd.DataFrame(trend_rows)
-                trend_counts = trend_df.groupby([pd.Grouper(key="Timestamp", freq="h"), "Outcome"]).size().reset_index(name="Count")
-                fig_trend = px.line(
-                    trend_counts,
-                    x="Timestamp",
-                    y="Count",
-                    color="Outcome",
-                    color_discrete_map={"Pass": "#2563eb", "Fail": "#eab308"},
-                    title="Pass/Fail Trend (Remote)"
-                )
-                fig_trend.update_layout(
-                    xaxis=dict(
-                        title="Timeline",
-                        rangeselector=dict(
-                            buttons=list([
-                                dict(count=24, label="24h", step="hour", stepmode="backward"),
-                                dict(count=7, label="1w", step="day", stepmode="backward"),
-                                dict(count=1, label="1m", step="month", stepmode="backward"),
-                                dict(step="all")
-                            ])
-                        ),
-                        rangeslider=dict(visible=True),
-                        type="date"
-                    ),
-                    yaxis_title="Number of Tests",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    font=dict(color="#333"),
-                    title_font_size=16
-                )
-                fig_trend.update_traces(mode="lines+markers")
+                fig_trend = trend_figure(trend_rows, "Pass/Fail Trend (Remote)", REMOTE_COLORS)
                 st.plotly_chart(fig_trend, use_container_width=True)
             else:
                 st.info("No timeline data available for selected filters.")
@@ -662,37 +694,25 @@ with dashboard_tab:
 
         # --- Graph Rendering After Selection ---
         if st.session_state.selected_hardware_type or st.session_state.selected_test_name:
+            # Aggregations run on LogFacts integer keys (see database.outcome_counts_by_dut)
             if st.session_state.selected_hardware_type:
+                selection = {"hardware_type": st.session_state.selected_hardware_type}
                 if st.session_state.selected_hardware_type == "All":
-                    cursor = conn.execute(
-                        "SELECT dut, outcome, COUNT(*) FROM Logs WHERE hardware_type != 'auto-detected' GROUP BY dut, outcome"
-                    )
                     title_suffix = "All Hardware Types"
                     duts = [h["DUT"] for h in hardware if h["hardware_type"] != "auto-detected"]
                 else:
-                    cursor = conn.execute(
-                        "SELECT dut, outcome, COUNT(*) FROM Logs WHERE hardware_type = ? GROUP BY dut, outcome",
-                        (st.session_state.selected_hardware_type,)
-                    )
                     title_suffix = st.session_state.selected_hardware_type
                     duts = [h["DUT"] for h in hardware if h["hardware_type"] == st.session_state.selected_hardware_type]
-                data = cursor.fetchall()
 
             else:  # test selected
+                selection = {"test_name": st.session_state.selected_test_name}
                 if st.session_state.selected_test_name == "All":
-                    cursor = conn.execute(
-                        "SELECT dut, outcome, COUNT(*) FROM Logs WHERE hardware_type != 'auto-detected' GROUP BY dut, outcome"
-                    )
                     title_suffix = "All Tests"
                     duts = [h["DUT"] for h in hardware if h["hardware_type"] != "auto-detected"]
                 else:
-                    cursor = conn.execute(
-                        "SELECT dut, outcome, COUNT(*) FROM Logs WHERE test_name = ? GROUP BY dut, outcome",
-                        (st.session_state.selected_test_name,)
-                    )
                     title_suffix = st.session_state.selected_test_name
                     duts = [h["DUT"] for h in hardware]
-                data = cursor.fetchall()
+            data = outcome_counts_by_dut(conn, since=since, source=source, **selection)
 
 
             # ---- If No Data: Show Card, Stop Rendering ----
@@ -701,158 +721,45 @@ with dashboard_tab:
                 st.stop()
 
             # ======================= PIE + BAR =======================
-            df = pd.DataFrame(data, columns=["dut", "outcome", "count"])
-            df["DUT"] = df["dut"].apply(lambda x: f"DUT {x}")
-
-            outcome_counts = df.groupby("outcome")["count"].sum().to_dict()
-            outcome_labels = {o: f"{o} ({outcome_counts.get(o, 0)})" for o in outcome_counts.keys()}
+            # Charts are built in dashboard_figures (pandas/plotly are imported there on first use)
+            df, outcome_labels = outcome_frame(data)
 
             # ---- PIE CHART ----
             with st.spinner("Rendering Pass/Fail Ratio..."):
                 time.sleep(0.3)
-                fig_pie = px.pie(
-                    df,
-                    names=df["outcome"].map(outcome_labels),
-                    values="count",
-                    color=df["outcome"].map(outcome_labels),
-                    color_discrete_map={
-                        outcome_labels.get("Pass", "Pass"): "#10B981",
-                        outcome_labels.get("Fail", "Fail"): "#EF4444"
-                    },
-                    title=f"Pass/Fail Ratio for {title_suffix}"
-                )
-                fig_pie.update_traces(
-                    textinfo="percent+value",
-                    textfont_size=14,
-                    pull=[0.05 if "Fail" in lbl else 0 for lbl in df["outcome"].map(outcome_labels)]
-                )
-                st.plotly_chart(fig_pie, use_container_width=True)
+                st.plotly_chart(outcome_pie(df, outcome_labels, title_suffix), use_container_width=True)
 
             # ---- BAR CHART ----
             with st.spinner("Rendering Pass/Fail Count by DUT..."):
                 time.sleep(0.3)
-                fig_bar = px.bar(
-                    df,
-                    x="DUT",
-                    y="count",
-                    color=df["outcome"].map(outcome_labels),
-                    color_discrete_map={
-                        outcome_labels.get("Pass", "Pass"): "#10B981",
-                        outcome_labels.get("Fail", "Fail"): "#EF4444"
-                    },
-                    barmode="stack",
-                    text="count",
-                    title=f"Pass/Fail Count by DUT for {title_suffix}"
-                )
-                fig_bar.update_traces(textposition="outside")
-                fig_bar.update_layout(
-                    xaxis_title="DUT",
-                    yaxis_title="Count",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    font=dict(color="#333"),
-                    title_font_size=16
-                )
-                st.plotly_chart(fig_bar, use_container_width=True)
+                st.plotly_chart(outcome_bar(df, outcome_labels, title_suffix), use_container_width=True)
+
+            # ======================= PER-ITERATION METRICS =======================
+            # Percentiles are aggregated in SQL (database.iteration_metric_percentiles)
+            metric_rows = iteration_metric_percentiles(conn, since=since, source=source, **selection)
+            if metric_rows:
+                st.markdown("### Per-Iteration Metrics")
+                metrics_df = percentile_frame(metric_rows, PERCENTILES)
+                metric_choice = st.selectbox("Metric", sorted(metrics_df["Metric"].unique()), key="iteration_metric")
+                fig_percentiles = percentile_bar(metrics_df, metric_choice, PERCENTILES, title_suffix)
+                st.plotly_chart(fig_percentiles, use_container_width=True)
+                st.dataframe(metrics_df, use_container_width=True, hide_index=True)
 
             # ======================= SCATTER + TREND =======================
-            if st.session_state.selected_hardware_type:
-                if st.session_state.selected_hardware_type == "All":
-                    cursor = conn.execute(
-                        "SELECT job_id, dut, parameters, outcome, timestamp "
-                        "FROM Logs WHERE hardware_type != 'auto-detected'"
-                    )
-                else:
-                    cursor = conn.execute(
-                        "SELECT job_id, dut, parameters, outcome, timestamp "
-                        "FROM Logs WHERE hardware_type = ?",
-                        (st.session_state.selected_hardware_type,)
-                    )
-            else:
-                if st.session_state.selected_test_name == "All":
-                    cursor = conn.execute(
-                        "SELECT job_id, dut, parameters, outcome, timestamp "
-                        "FROM Logs WHERE hardware_type != 'auto-detected'"
-                    )
-                else:
-                    cursor = conn.execute(
-                        "SELECT job_id, dut, parameters, outcome, timestamp "
-                        "FROM Logs WHERE test_name = ?",
-                        (st.session_state.selected_test_name,)
-                    )
-
-
-            scatter_rows = cursor.fetchall()
+            scatter_rows = job_history(conn, since=since, source=source, **selection)
             if not scatter_rows:
                 st.error(f"No jobs available for {title_suffix}")
                 st.stop()
 
-            scatter_data, trend_data = [], []
-            for job_id, dut, params, outcome, ts in scatter_rows:
-                try:
-                    params_dict = json.loads(params)
-                    iterations = params_dict.get("iterations")
-                    delay = params_dict.get("delay")
-                    if iterations is not None and delay is not None:
-                        scatter_data.append({
-                            "Job ID": job_id,
-                            "DUT": f"DUT {dut}",
-                            "Iterations": iterations,
-                            "Delay": delay,
-                            "Outcome": outcome
-                        })
-                    if ts:
-                        trend_data.append({"Timestamp": pd.to_datetime(ts), "Outcome": outcome})
-                except Exception:
-                    continue
+            scatter_data, trend_data = history_points(scatter_rows)
 
             # ---- SCATTER PLOT ----
             if scatter_data:
                 with st.spinner("Rendering Iterations vs Delay..."):
                     time.sleep(0.3)
-                    scatter_df = pd.DataFrame(scatter_data)
-
-                    # Aggregate counts by (Iterations, Delay, Outcome)
-                    grouped = scatter_df.groupby(["Iterations", "Delay", "Outcome"]).size().reset_index(name="Count")
-
-                    # Also get total counts per point (Iterations, Delay)
-                    totals = grouped.groupby(["Iterations", "Delay"])["Count"].sum().reset_index(name="Total")
-
-                    # Merge totals to grouped
-                    grouped = grouped.merge(totals, on=["Iterations", "Delay"])
-
-                    # Add hover text
-                    grouped["hover"] = grouped.apply(
-                        lambda r: f"Iterations={r['Iterations']}<br>Delay={r['Delay']}<br>{r['Outcome']}: {r['Count']}<br>Total={r['Total']}", axis=1
+                    fig_scatter = scatter_figure(
+                        scatter_data, f"Iterations-Delay Correlation w/ Result for {title_suffix}", HARDWARE_COLORS
                     )
-
-                    # Base scatter
-                    fig_scatter = go.Figure()
-
-                    for outcome, color in [("Pass", "#10B981"), ("Fail", "#EF4444")]:
-                        sub = grouped[grouped["Outcome"] == outcome]
-                        fig_scatter.add_trace(go.Scatter(
-                            x=sub["Delay"],
-                            y=sub["Iterations"],
-                            mode="markers+text",
-                            marker=dict(size=12, color=color, opacity=0.7, line=dict(width=1, color="DarkSlateGrey")),
-                            text=sub.apply(lambda r: f"x{r['Total']}" if r["Total"] > 1 else "", axis=1),
-                            textposition="top center",
-                            name=outcome,
-                            hovertext=sub["hover"],
-                            hoverinfo="text"
-                        ))
-
-                    fig_scatter.update_layout(
-                        title=f"Iterations-Delay Correlation w/ Result for {title_suffix}",
-                        xaxis_title="Delay (seconds)",
-                        yaxis_title="Iterations",
-                        plot_bgcolor="rgba(0,0,0,0)",
-                        paper_bgcolor="rgba(0,0,0,0)",
-                        font=dict(color="#333"),
-                        title_font_size=16
-                    )
-
                     st.plotly_chart(fig_scatter, use_container_width=True)
             else:
                 st.info(f"No iteration/delay data available for {title_suffix}")
@@ -861,44 +768,11 @@ with dashboard_tab:
             if trend_data:
                 with st.spinner("Rendering Pass/Fail Trend..."):
                     time.sleep(0.3)
-                    trend_df = pd.DataFrame(trend_data)
-                    trend_counts = trend_df.groupby([pd.Grouper(key="Timestamp", freq="h"), "Outcome"]).size().reset_index(name="Count")
-
-                    fig_trend = px.line(
-                        trend_counts,
-                        x="Timestamp",
-                        y="Count",
-                        color="Outcome",
-                        color_discrete_map={
-                            "Pass": "#10B981",
-                            "Fail": "#EF4444"
-                        },
-                        title=f"Pass/Fail Trend over Time for {title_suffix}"
-                    )
-                    fig_trend.update_traces(mode="lines+markers")
-                    fig_trend.update_layout(
-                        xaxis=dict(
-                            title="Timeline",
-                            rangeselector=dict(
-                                buttons=list([
-                                    dict(count=24, label="24h", step="hour", stepmode="backward"),
-                                    dict(count=7, label="1w", step="day", stepmode="backward"),
-                                    dict(count=1, label="1m", step="month", stepmode="backward"),
-                                    dict(step="all")
-                                ])
-                            ),
-                            rangeslider=dict(visible=True),
-                            type="date"
-                        ),
-                        yaxis_title="Number of Tests",
-                        plot_bgcolor="rgba(0,0,0,0)",
-                        paper_bgcolor="rgba(0,0,0,0)",
-                        font=dict(color="#333"),
-                        title_font_size=16
-                    )
+                    fig_trend = trend_figure(trend_data, f"Pass/Fail Trend over Time for {title_suffix}", HARDWARE_COLORS)
                     st.plotly_chart(fig_trend, use_container_width=True)
 
             else:
                 st.error(f"No timeline data available for {title_suffix}")
 
-
+mark_phase("dashboard tab")
+timing_report()
@@ -0,0 +1,204 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/archive.py
+# Monthly archival of old Logs rows. LogFacts rows older than ARCHIVE_KEEP_MONTHS
+# whole months are moved, in batches, into one SQLite file per month:
+#     archive/<db name>_YYYY_MM.db   (next to framework.db)
+# Archives hold only LogFacts rows; the dimension tables and MetricBlobs stay in
+# the main database. Queries that need old rows ATTACH the archives and read the
+# TEMP views LogFactsAll / LogsAll instead of LogFacts / Logs.
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from database import create_log_facts_table, logs_select
+
+ARCHIVE_KEEP_MONTHS = 3
+ARCHIVE_BATCH_SIZE = 5000
+ARCHIVE_INTERVAL = 6 * 3600  # seconds between background archive runs
+
+OVERFLOW_SCHEMA = "archive_overflow"  # slot used to copy archives that do not fit
+
+log = logging.getLogger(__name__)
+_archivers = set()  # db paths with a background archiver in this process
+_archivers_lock = threading.Lock()
+
+
+def archive_dir(db_path):
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), "archive")
+
+
+def archive_path(db_path, month):
+    """Archive file for month "YYYY-MM"."""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return os.path.join(archive_dir(db_path), f"{stem}_{month.replace('-', '_')}.db")
+
+
+def list_archives(db_path):
+    """[(month, path)] of existing archive files, oldest first."""
+    directory = archive_dir(db_path)
+    if not os.path.isdir(directory):
+        return []
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    pattern = re.compile(rf"^{re.escape(stem)}_(\d{{4}})_(\d{{2}})\.db$")
+    archives = []
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            archives.append((f"{match.group(1)}-{match.group(2)}", os.path.join(directory, name)))
+    return sorted(archives)
+
+
+def month_start(months_ago=0):
+    """First second of the month `months_ago` months before the current one (UTC), as stored in Logs."""
+    now = time.gmtime()
+    index = now.tm_year * 12 + (now.tm_mon - 1) - months_ago
+    return f"{index // 12:04d}-{index % 12 + 1:02d}-01 00:00:00"
+
+
+def _next_month(month):
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}-01 00:00:00"
+
+
+def _schema(month):
+    return "archive_" + month.replace("-", "_")
+
+
+def _attached(conn):
+    return {row[1] for row in conn.execute("PRAGMA database_list")}
+
+
+def archive_old_logs(conn, db_path, keep_months=ARCHIVE_KEEP_MONTHS, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move LogFacts rows from before the last `keep_months` whole months into the
+    monthly archive files. Each batch is copied and deleted in one short
+    transaction, so other writers are only blocked for one batch at a time.
+    Rows already copied are replaced, so an interrupted run can simply be repeated.
+    Returns {month: rows_moved}.
+    """
+    cutoff = month_start(keep_months)
+    conn.commit()
+    months = [row[0] for row in conn.execute(
+        "SELECT DISTINCT strftime('%Y-%m', timestamp) FROM LogFacts WHERE timestamp < ?", (cutoff,)
+    ) if row[0]]
+    moved = {}
+    for month in months:
+        os.makedirs(archive_dir(db_path), exist_ok=True)
+        schema = _schema(month)
+        if schema not in _attached(conn):
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (archive_path(db_path, month),))
+        create_log_facts_table(conn, schema)
+        conn.commit()
+
+        start, end = f"{month}-01 00:00:00", _next_month(month)
+        moved[month] = 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            last_id = conn.execute(
+                "SELECT MAX(log_id) FROM (SELECT log_id FROM main.LogFacts "
+                "WHERE timestamp >= ? AND timestamp < ? ORDER BY log_id LIMIT ?)",
+                (start, end, batch_size),
+            ).fetchone()[0]
+            if last_id is None:
+                conn.commit()
+                break
+            window = (start, end, last_id)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {schema}.LogFacts SELECT * FROM main.LogFacts "
+                "WHERE timestamp >= ? AND timestamp < ? AND log_id <= ?", window,
+            )
+            deleted = conn.execute(
+                "DELETE FROM main.LogFacts WHERE timestamp >= ? AND timestamp < ? AND log_id <= ?", window,
+            ).rowcount
+            conn.commit()
+            moved[month] += deleted
+        conn.execute(f"DETACH DATABASE {schema}")
+    return moved
+
+
+def attach_archives(conn, db_path, since=None):
+    """
+    ATTACH the archives holding rows at or after `since` ("YYYY-MM-DD ..." or
+    None for all history) and (re)create the TEMP views LogFactsAll and LogsAll
+    over main + those archives. SQLite limits attached databases (10 by
+    default): the newest archives are attached, and the rows of the older ones
+    are copied into temp.LogFactsOverflow one archive at a time (attach, copy,
+    detach), so the views always cover every month.
+    Returns the months covered (empty: the hot tables alone cover `since`).
+    """
+    conn.commit()
+    months = [(m, p) for m, p in list_archives(db_path) if since is None or m >= since[:7]]
+    attached = _attached(conn)
+    slots = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - len(attached - {"main", "temp"})
+    if sum(1 for m, _ in months if _schema(m) not in attached) > slots:
+        slots -= 1  # keep one slot for copying the overflow
+    if slots < 0:
+        raise sqlite3.OperationalError("No free ATTACH slot for the Logs archives")
+    months_attached, overflow = [], []
+    for month, path in reversed(months):
+        schema = _schema(month)
+        if schema not in attached:
+            if slots <= 0:
+                overflow.append((month, path))
+                continue
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+            slots -= 1
+        months_attached.append(month)
+    months_attached.sort()
+
+    conn.execute("DROP VIEW IF EXISTS temp.LogsAll")
+    conn.execute("DROP VIEW IF EXISTS temp.LogFactsAll")
+    conn.execute("DROP TABLE IF EXISTS temp.LogFactsOverflow")
+    sources = ["SELECT * FROM main.LogFacts"] + [f"SELECT * FROM {_schema(m)}.LogFacts" for m in months_attached]
+    if overflow:
+        log.info("Copying %d archived months into temp.LogFactsOverflow (ATTACH limit)", len(overflow))
+        conn.execute("CREATE TEMP TABLE LogFactsOverflow AS SELECT * FROM main.LogFacts WHERE 0")
+        for _, path in overflow:
+            conn.execute(f"ATTACH DATABASE ? AS {OVERFLOW_SCHEMA}", (path,))
+            try:
+                conn.execute(f"INSERT INTO temp.LogFactsOverflow SELECT * FROM {OVERFLOW_SCHEMA}.LogFacts")
+                conn.commit()
+            finally:
+                conn.execute(f"DETACH DATABASE {OVERFLOW_SCHEMA}")
+        sources.append("SELECT * FROM temp.LogFactsOverflow")
+    conn.execute(f"CREATE TEMP VIEW LogFactsAll AS {' UNION ALL '.join(sources)}")
+    conn.execute(f"CREATE TEMP VIEW LogsAll AS {logs_select('LogFactsAll')}")
+    return sorted(months_attached + [month for month, _ in overflow])
+
+
+def logs_source(conn, db_path, since=None):
+    """
+    Fact table to query for rows since `since`: "LogFacts" when the hot
+    database covers the range, else "LogFactsAll" with the archives attached.
+    """
+    return "LogFactsAll" if attach_archives(conn, db_path, since) else "LogFacts"
+
+
+def start_background_archiver(db_path="framework.db", interval=ARCHIVE_INTERVAL, keep_months=ARCHIVE_KEEP_MONTHS):
+    """Run archive_old_logs every `interval` seconds in a daemon thread (once per db per process)."""
+    key = os.path.abspath(db_path)
+    with _archivers_lock:
+        if key in _archivers:
+            return False
+        _archivers.add(key)
+
+    def run():
+        while True:
+            try:
+                conn = sqlite3.connect(db_path, timeout=30)
+                try:
+                    moved = archive_old_logs(conn, db_path, keep_months=keep_months)
+                finally:
+                    conn.close()
+                if moved:
+                    log.info("Archived Logs rows: %s", moved)
+            except sqlite3.Error as e:
+                log.error("Log archiving failed: %s", e)
+            time.sleep(interval)
+
+    threading.Thread(target=run, name="log-archiver", daemon=True).start()
+    return True
@@ -0,0 +1,467 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/benchmark.py
+# Synthetic job history + benchmarks of the hot paths, with a JSON report that
+# can be compared against an earlier one. Run from the repository root:
+#     python src/standalone/benchmark.py generate --db bench.db --rows 1000000
+#     python src/standalone/benchmark.py run --db bench.db --out bench.json
+#     python src/standalone/benchmark.py run --db bench.db --baseline bench.json
+# `run` with --baseline exits with status 1 when a benchmark got more than
+# --tolerance slower (median, and by at least NOISE_FLOOR_MS), so it can gate a change.
+# Benchmarks (each skipped, with the reason in the report, if its dependency is missing):
+#   init_db          open + schema check of the generated db, and a fresh db (all migrations)
+#   jobs             enqueue_job and submit_job throughput, and process_jobs draining no-op plugin jobs
+#   ai_model         QLearningAgent construction (load_logs) and suggest_parameters (numpy)
+#   queries          every dashboard query, for each selection the Dashboard tab offers
+#   figures          every dashboard chart built from those query results (pandas, plotly)
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import (
+    PERCENTILES, init_db, iteration_metric_percentiles, job_history, outcome_counts_by_dut,
+    remote_history, remote_usernames,
+)
+from executor import (
+    DELAY_OPTIONS, ITERATION_INSERT_SQL, ITERATIONS_OPTIONS, LOG_INSERT_SQL, enqueue_job, iteration_rows,
+    process_jobs, submit_job,
+)
+from hardware import mock_hardware_detection
+from plugin_registry import plugin_names
+
+GENERATE_CHUNK_SIZE = 50000
+NOISE_FLOOR_MS = 1.0  # slowdowns smaller than this are timer noise, never regressions
+REMOTE_USERS = [f"lab{i:02d}" for i in range(12)]
+GROUPS = ["init_db", "jobs", "ai_model", "queries", "figures"]
+
+# A test plugin that does nothing, so the jobs benchmark measures the runner, not the test
+NOOP_PLUGIN = '''PLUGIN_META = {"name": "Benchmark no-op", "target": "dut", "expected_duration": 0, "timeout": 30}
+
+
+def run_test(iterations):
+    for i in range(iterations):
+        yield {"outcome": "Pass", "metrics": {"boot_time": 0.0}}
+'''
+
+
+# ---------------------- synthetic history ----------------------
+def _pass_probability(iterations, delay):
+    # Longer delays and fewer iterations pass more often, so the AI model has something to learn
+    return min(0.98, 0.55 + 0.06 * delay - 0.01 * iterations)
+
+
+def synthetic_jobs(rows, days=60, remote_share=0.2, seed=0):
+    """
+    Yield (job, result, timestamp) shaped like real runs: managed DUT jobs spread over
+    mock_hardware_detection, remote jobs over a few lab users and hosts, the
+    iterations/delay choices of the AI model, timestamps over the last `days`
+    days (inside the archive window, so they stay in the hot database).
+    DUT jobs carry per-iteration records, as streaming plugins produce.
+    """
+    rng = random.Random(seed)
+    hardware = [h for h in mock_hardware_detection() if h["hardware_type"] != "auto-detected"]
+    dut_tests = plugin_names("dut") or ["cold_boot", "warm_boot", "s4"]
+    remote_tests = plugin_names("remote") or ["cpuinformation", "systeminformation"]
+    now = time.time()
+    for job_id in range(1, rows + 1):
+        iterations, delay = rng.choice(ITERATIONS_OPTIONS), rng.choice(DELAY_OPTIONS)
+        finished = now - rng.random() * days * 86400
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(finished))
+        passed = rng.random() < _pass_probability(iterations, delay)
+        if rng.random() < remote_share:
+            user = rng.choice(REMOTE_USERS)
+            job = {
+                "job_id": job_id, "dut": -1, "hardware_type": "auto-detected", "serial": "-",
+                "com_port": "-", "mac_address": "-", "test_name": rng.choice(remote_tests),
+                "parameters": {"iterations": iterations, "delay": delay,
+                               "ip": f"10.0.{REMOTE_USERS.index(user)}.{rng.randint(2, 254)}", "username": user},
+            }
+            result = {"outcome": "Pass" if passed else "Fail", "metrics": {"iterations": iterations}}
+        else:
+            h = rng.choice(hardware)
+            job = {
+                "job_id": job_id, "dut": h["DUT"], "hardware_type": h["hardware_type"], "serial": h["serial"],
+                "com_port": h["com_port"], "mac_address": h["mac_address"], "test_name": rng.choice(dut_tests),
+                "parameters": {"iterations": iterations, "delay": delay, "ip": None, "username": None},
+            }
+            outcomes = ["Pass" if rng.random() < _pass_probability(iterations, delay) ** (1 / iterations) else "Fail"
+                        for _ in range(iterations)]
+            result = {
+                "outcome": "Pass" if "Fail" not in outcomes else "Fail",
+                "metrics": {"iterations": iterations, "passes": outcomes.count("Pass")},
+                "iterations": [
+                    {"iteration": i + 1, "outcome": outcome, "timestamp": timestamp,
+                     "metrics": {"boot_time": round(rng.gauss(0.5 + 0.02 * h["DUT"], 0.05), 3)}}
+                    for i, outcome in enumerate(outcomes)
+                ],
+            }
+        yield job, result, timestamp
+
+
+def generate_history(db_path, rows, days=60, remote_share=0.2, queued=5, seed=0):
+    """
+    Fill db_path (created if missing, must not hold Logs rows yet) with `rows`
+    synthetic jobs and up to `queued` waiting jobs per DUT. Returns seconds taken.
+    A database created here is removed again if generating fails, so a later
+    `run` never benchmarks a partial history.
+    """
+    started = time.perf_counter()
+    created = not os.path.exists(db_path)
+    conn = init_db(db_path)
+    if conn.execute("SELECT COUNT(*) FROM LogFacts").fetchone()[0]:
+        conn.close()
+        raise ValueError(f"{db_path} already has job history; generate into a new database")
+    try:
+        _fill_history(conn, rows, days, remote_share, queued, seed)
+    except BaseException:
+        conn.close()
+        if created:
+            for path in (db_path, db_path + "-wal", db_path + "-shm", db_path + "-journal"):
+                if os.path.exists(path):
+                    os.remove(path)
+        raise
+    conn.close()
+    return time.perf_counter() - started
+
+
+def _fill_history(conn, rows, days, remote_share, queued, seed):
+    conn.execute("PRAGMA synchronous = OFF")
+
+    logs, iterations = [], []
+
+    def flush():
+        with conn:
+            conn.executemany(LOG_INSERT_SQL, logs)
+            conn.executemany(ITERATION_INSERT_SQL, iterations)
+        logs.clear()
+        iterations.clear()
+
+    for job, result, timestamp in synthetic_jobs(rows, days, remote_share, seed):
+        parameters = job["parameters"]
+        logs.append((
+            job["job_id"], job["dut"], job["hardware_type"], job["serial"], job["com_port"],
+            job["mac_address"], job["test_name"], json.dumps(parameters), result["outcome"],
+            json.dumps(result["metrics"]), parameters.get("ip"), parameters.get("username"), timestamp,
+        ))
+        iterations += iteration_rows(job["job_id"], result)
+        if len(logs) >= GENERATE_CHUNK_SIZE:
+            flush()
+            print(f"  {job['job_id']:>10} / {rows} jobs")
+    if logs:
+        flush()
+
+    # Jobs waiting in the DUT queues (the scheduler and metrics read these)
+    rng = random.Random(seed)
+    next_job_id = rows + 1
+    with conn:
+        for h in mock_hardware_detection():
+            depth = rng.randint(0, queued)
+            queue = [{
+                "job_id": next_job_id + i, "dut": h["DUT"], "hardware_type": h["hardware_type"],
+                "serial": h["serial"], "com_port": h["com_port"], "mac_address": h["mac_address"],
+                "test_name": "cold_boot", "iterations": 5, "parameters": {"iterations": 5, "delay": 3},
+            } for i in range(depth)]
+            next_job_id += depth
+            conn.execute("UPDATE DUTStatus SET job_queue = ? WHERE dut = ?", (json.dumps(queue), h["DUT"]))
+        conn.execute("UPDATE JobIDCounter SET next_job_id = ? WHERE counter_id = 1", (next_job_id,))
+    conn.execute("PRAGMA optimize")
+
+
+# ---------------------- measurement ----------------------
+def measure(fn, repeat=5, warmup=1):
+    """Run fn warmup + repeat times; timings of the measured runs in ms."""
+    for _ in range(warmup):
+        fn()
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - started) * 1000)
+    return {
+        "runs": len(runs),
+        "median_ms": round(statistics.median(runs), 3),
+        "min_ms": round(min(runs), 3),
+        "max_ms": round(max(runs), 3),
+    }
+
+
+def _copy_db(db_path, work_dir, name):
+    path = os.path.join(work_dir, name)
+    src = sqlite3.connect(db_path)
+    dst = sqlite3.connect(path)
+    src.backup(dst)
+    src.close()
+    dst.close()
+    return path
+
+
+def bench_init_db(db_path, work_dir, repeat):
+    fresh = os.path.join(work_dir, "fresh.db")
+
+    def migrate_fresh():
+        if os.path.exists(fresh):
+            os.remove(fresh)
+        init_db(fresh).close()
+
+    return {
+        "init_db.existing": measure(lambda: init_db(db_path).close(), repeat),
+        "init_db.fresh": measure(migrate_fresh, repeat),
+    }
+
+
+def bench_jobs(db_path, work_dir, jobs):
+    """
+    enqueue_job, submit_job and process_jobs on a copy of the db, with a no-op
+    plugin in a scratch root. submit_job is timed against a Busy DUT, so it
+    measures the submit path up to queueing, not the run.
+    """
+    path = _copy_db(db_path, work_dir, "jobs.db")
+    root = os.path.join(work_dir, "root")
+    os.makedirs(os.path.join(root, "src", "plugins", "tests"), exist_ok=True)
+    with open(os.path.join(root, "src", "plugins", "tests", "bench_noop.py"), "w", encoding="utf-8") as f:
+        f.write(NOOP_PLUGIN)
+
+    h = mock_hardware_detection()[0]
+    conn = init_db(path)
+    conn.execute("UPDATE DUTStatus SET job_queue = '[]' WHERE dut = ?", (h["DUT"],))
+    conn.commit()
+    cwd = os.getcwd()
+    os.chdir(root)  # plugins and job logs are found relative to the working directory
+    try:
+        started = time.perf_counter()
+        for _ in range(jobs):
+            enqueue_job(conn, h["DUT"], h["hardware_type"], h["serial"], h["com_port"], h["mac_address"],
+                        "bench_noop", 1, {"iterations": 1})
+        enqueued = time.perf_counter() - started
+
+        conn.execute("UPDATE DUTStatus SET status = 'Busy' WHERE dut = ?", (h["DUT"],))
+        conn.commit()
+        started = time.perf_counter()
+        for _ in range(jobs):
+            submit_job(conn, h["DUT"], h["hardware_type"], h["serial"], h["com_port"], h["mac_address"],
+                       "bench_noop", 1, {"iterations": 1})
+        submitted = time.perf_counter() - started
+
+        started = time.perf_counter()
+        process_jobs(conn, h["DUT"], h["hardware_type"], h["serial"], h["com_port"], h["mac_address"])
+        processed = time.perf_counter() - started
+    finally:
+        os.chdir(cwd)
+        conn.close()
+    return {
+        "jobs.enqueue_job": {"runs": jobs, "jobs_per_s": round(jobs / enqueued, 1),
+                             "median_ms": round(enqueued / jobs * 1000, 3)},
+        "jobs.submit_job": {"runs": jobs, "jobs_per_s": round(jobs / submitted, 1),
+                            "median_ms": round(submitted / jobs * 1000, 3)},
+        "jobs.process_jobs": {"runs": 2 * jobs, "jobs_per_s": round(2 * jobs / processed, 2),
+                              "median_ms": round(processed / (2 * jobs) * 1000, 3)},
+    }
+
+
+def bench_ai_model(db_path, repeat):
+    from ai_model import QLearningAgent
+
+    agent = QLearningAgent(db_path=db_path)
+    results = {"ai_model.load": measure(lambda: QLearningAgent(db_path=db_path).conn.close(), repeat)}
+    for hardware_type, test_name, username in [("Dgx", "cold_boot", None), ("auto-detected", "cpuinformation", "lab00")]:
+        results[f"ai_model.suggest[{hardware_type}]"] = measure(
+            lambda: agent.suggest_parameters(hardware_type, test_name, username), repeat
+        )
+    agent.conn.close()
+    return results
+
+
+def dashboard_selections():
+    """(label, keyword arguments) for every selection the Dashboard tab offers."""
+    hardware_types = sorted({h["hardware_type"] for h in mock_hardware_detection()} - {"auto-detected"})
+    selections = [("hardware=All", {"hardware_type": "All"})]
+    selections += [(f"hardware={t}", {"hardware_type": t}) for t in hardware_types]
+    selections += [("test=All", {"test_name": "All"})]
+    selections += [(f"test={t}", {"test_name": t}) for t in plugin_names("dut")]
+    return selections
+
+
+def bench_queries(conn, repeat, since=None):
+    results = {}
+    for label, selection in dashboard_selections():
+        results[f"queries.outcome_counts_by_dut[{label}]"] = measure(
+            lambda: outcome_counts_by_dut(conn, since=since, **selection), repeat)
+        results[f"queries.job_history[{label}]"] = measure(
+            lambda: job_history(conn, since=since, **selection), repeat)
+        results[f"queries.iteration_metric_percentiles[{label}]"] = measure(
+            lambda: iteration_metric_percentiles(conn, since=since, **selection), repeat)
+    results["queries.remote_usernames"] = measure(lambda: remote_usernames(conn), repeat)
+    usernames = remote_usernames(conn)
+    results["queries.remote_history[all]"] = measure(
+        lambda: remote_history(conn, usernames, plugin_names("remote"), since=since), repeat)
+    return results
+
+
+def bench_figures(conn, repeat, since=None):
+    import dashboard_figures as figures
+
+    figures.dashboard_libs()  # fails here (not in a timing) without pandas/plotly
+    results = {}
+    selection = {"hardware_type": "All"}
+    data = outcome_counts_by_dut(conn, since=since, **selection)
+    metric_rows = iteration_metric_percentiles(conn, since=since, **selection)
+    history = job_history(conn, since=since, **selection)
+    remote_rows = remote_history(conn, remote_usernames(conn), plugin_names("remote"), since=since)
+
+    df, labels = figures.outcome_frame(data)
+    results["figures.outcome_pie"] = measure(lambda: figures.outcome_pie(df, labels, "All"), repeat)
+    results["figures.outcome_bar"] = measure(lambda: figures.outcome_bar(df, labels, "All"), repeat)
+    if metric_rows:
+        metrics_df = figures.percentile_frame(metric_rows, PERCENTILES)
+        metric = sorted(metrics_df["Metric"].unique())[0]
+        results["figures.percentile_bar"] = measure(
+            lambda: figures.percentile_bar(metrics_df, metric, PERCENTILES, "All"), repeat)
+    results["figures.history_points"] = measure(lambda: figures.history_points(history), repeat)
+    scatter_data, trend_data = figures.history_points(history)
+    if scatter_data:
+        results["figures.scatter"] = measure(
+            lambda: figures.scatter_figure(scatter_data, "All", figures.HARDWARE_COLORS), repeat)
+    if trend_data:
+        results["figures.trend"] = measure(
+            lambda: figures.trend_figure(trend_data, "All", figures.HARDWARE_COLORS), repeat)
+    if remote_rows:
+        remote_df = figures.remote_frame(remote_rows)
+        results["figures.remote_pie"] = measure(lambda: figures.remote_outcome_pie(remote_df), repeat)
+        results["figures.remote_bar"] = measure(lambda: figures.remote_outcome_bar(remote_df), repeat)
+        results["figures.remote_points"] = measure(lambda: figures.remote_points(remote_df), repeat)
+    return results
+
+
+def run_benchmarks(db_path, groups=GROUPS, repeat=5, jobs=20):
+    """Run the benchmark groups against db_path (left unmodified). Returns the report dict."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT COUNT(*) FROM LogFacts").fetchone()[0]
+    iteration_rows = conn.execute("SELECT COUNT(*) FROM IterationResults").fetchone()[0]
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+            "rows": rows,
+            "iteration_rows": iteration_rows,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": {},
+        "skipped": {},
+    }
+    work_dir = tempfile.mkdtemp(prefix="stf_bench_")
+    try:
+        for group in groups:
+            print(f"Running {group} ...")
+            try:
+                if group == "init_db":
+                    report["results"].update(bench_init_db(db_path, work_dir, repeat))
+                elif group == "jobs":
+                    report["results"].update(bench_jobs(db_path, work_dir, jobs))
+                elif group == "ai_model":
+                    report["results"].update(bench_ai_model(db_path, repeat))
+                elif group == "queries":
+                    report["results"].update(bench_queries(conn, repeat))
+                elif group == "figures":
+                    report["results"].update(bench_figures(conn, repeat))
+            except (ImportError, RuntimeError) as e:
+                report["skipped"][group] = str(e)
+                print(f"  skipped: {e}")
+    finally:
+        conn.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+
+def compare_reports(baseline, report):
+    """[(name, baseline ms, current ms, ratio)] for the benchmarks in both reports (median times)."""
+    rows = []
+    for name, current in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before and before.get("median_ms"):
+            rows.append((name, before["median_ms"], current["median_ms"], current["median_ms"] / before["median_ms"]))
+    return rows
+
+
+def print_report(report):
+    for name, result in report["results"].items():
+        extra = f"  {result['jobs_per_s']:>9} jobs/s" if "jobs_per_s" in result else ""
+        print(f"  {name:<60} {result['median_ms']:>10.3f} ms{extra}")
+    for group, reason in report["skipped"].items():
+        print(f"  {group:<60} skipped ({reason})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic job history and hot-path benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Create a database with synthetic job history")
+    gen.add_argument("--db", default="bench.db")
+    gen.add_argument("--rows", type=int, default=10000)
+    gen.add_argument("--days", type=int, default=60)
+    gen.add_argument("--remote-share", type=float, default=0.2, help="Fraction of remote (SSH) jobs")
+    gen.add_argument("--queued", type=int, default=5, help="Max jobs waiting per DUT")
+    gen.add_argument("--seed", type=int, default=0)
+
+    run = sub.add_parser("run", help="Benchmark a generated database")
+    run.add_argument("--db", default="bench.db")
+    run.add_argument("--groups", default=",".join(GROUPS), help=f"Comma separated, from {', '.join(GROUPS)}")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--jobs", type=int, default=20, help="Jobs for the enqueue/process benchmark")
+    run.add_argument("--out", help="Write the JSON report here")
+    run.add_argument("--baseline", help="Compare against an earlier JSON report")
+    run.add_argument("--tolerance", type=float, default=0.2, help="Slowdown counted as a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        print(f"Generating {args.rows} jobs into {args.db}")
+        elapsed = generate_history(args.db, args.rows, args.days, args.remote_share, args.queued, args.seed)
+        print(f"Done in {elapsed:.1f}s ({args.rows / elapsed:.0f} rows/s)")
+        return 0
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist; create it with the generate command")
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"Unknown groups: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(args.db, groups, args.repeat, args.jobs)
+    print(f"{report['meta']['rows']} jobs, {report['meta']['iteration_rows']} iterations (median of {args.repeat})")
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = []
+        print(f"Compared with {args.baseline} ({baseline['meta']['rows']} jobs):")
+        for name, before, after, ratio in compare_reports(baseline, report):
+            regressed = ratio > 1 + args.tolerance and after - before >= NOISE_FLOOR_MS
+            flag = "  REGRESSION" if regressed else ""
+            print(f"  {name:<60} {before:>10.3f} -> {after:>10.3f} ms  x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append(name)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
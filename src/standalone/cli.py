@@ -0,0 +1,344 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/cli.py
+# Headless entry point for CI: submit jobs in bulk, drain queues, export results.
+# Run from the repository root:
+#     python -m src.standalone.cli submit jobs.json
+#     python src/standalone/cli.py results --format csv --output results.csv
+# Only stdlib + executor/database/test_runner are imported at startup; no UI libraries.
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+# Sibling modules import each other as top-level modules (like `streamlit run app.py`)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import init_db, resolve_metrics
+from executor import (
+    enqueue_job, job_spec_parameters, process_jobs, reserve_job_ids, resolve_job_target, submit_job,
+)
+from hardware import mock_hardware_detection
+from result_writer import ResultWriter
+
+LOG_COLUMNS = [
+    "log_id", "job_id", "dut", "hardware_type", "serial", "com_port", "mac_address",
+    "ip", "username", "test_name", "parameters", "outcome", "metrics", "timestamp",
+]
+
+
+def load_job_file(path):
+    """
+    Read job specs from a JSON list, a {"jobs": [...]} object, or JSON Lines.
+    Each spec: {"test": ..., "dut": 1 | "hardware_type": "Dgx" | "ip"/"username"/"password",
+                "iterations": 10, "delay": 5, "shards": 1}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get("jobs", [data])
+    return data
+
+
+def run_remote(db_path, spec, job_id=None):
+    """Run one SSH job immediately on its own connection (no DUT queue involved)."""
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    try:
+        parameters = job_spec_parameters(spec)
+        return submit_job(
+            conn, "auto", "auto-detected", "-", "-", "-",
+            spec["test"], parameters["iterations"], parameters, job_id=job_id,
+        )
+    finally:
+        conn.close()
+
+
+def drain_queues(db_path, duts=None, durability="normal"):
+    """
+    Drain every managed DUT queue in parallel, one thread + connection per DUT.
+    Results of all DUTs are group-committed to Logs by one ResultWriter.
+    """
+    hardware = [h for h in mock_hardware_detection() if duts is None or h["DUT"] in duts]
+
+    def drain(h):
+        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        try:
+            process_jobs(conn, h["DUT"], h["hardware_type"], h["serial"], h["com_port"], h["mac_address"],
+                         writer=writer)
+        finally:
+            conn.close()
+
+    with ResultWriter(db_path, durability=durability) as writer:
+        threads = [threading.Thread(target=drain, args=(h,)) for h in hardware]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+
+def fetch_results(conn, job_ids=None, since_job=None, test_name=None, expand_blobs=True):
+    """Logs rows as dicts; expand_blobs replaces {"$blob": hash} metrics with the stored output."""
+    query = f"SELECT {', '.join(LOG_COLUMNS)} FROM Logs"
+    clauses, params = [], []
+    if job_ids:
+        clauses.append(f"job_id IN ({','.join('?' * len(job_ids))})")
+        params.extend(job_ids)
+    if since_job is not None:
+        clauses.append("job_id >= ?")
+        params.append(since_job)
+    if test_name:
+        clauses.append("test_name = ?")
+        params.append(test_name)
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY job_id"
+    rows = [dict(zip(LOG_COLUMNS, row)) for row in conn.execute(query, params)]
+    if expand_blobs:
+        for row in rows:
+            if row["metrics"] and '"$blob"' in row["metrics"]:
+                row["metrics"] = json.dumps(resolve_metrics(conn, json.loads(row["metrics"])))
+    return rows
+
+
+def write_results(rows, fmt, output=None):
+    out = open(output, "w", encoding="utf-8", newline="") if output else sys.stdout
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(out, fieldnames=LOG_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        elif fmt == "jsonl":
+            for row in rows:
+                out.write(json.dumps(row) + "\n")
+        else:
+            json.dump(rows, out, indent=2)
+            out.write("\n")
+    finally:
+        if output:
+            out.close()
+
+
+def skip_reason(spec, wait):
+    """Why a job spec is not submitted without --wait (None: it is)."""
+    if wait:
+        return None
+    if spec.get("ip"):
+        return "Remote (ip) jobs run immediately; use --wait"
+    if int(spec.get("shards", 1)) > 1:
+        return "Sharded jobs run immediately on several Free DUTs; use --wait"
+    return None
+
+
+def cmd_submit(args):
+    conn = init_db(args.db)
+    specs = load_job_file(args.file)
+    # Skipped and unresolvable specs take no job id. One round-trip for the ids of the rest.
+    rejected = []
+    for spec in specs:
+        reason = skip_reason(spec, args.wait)
+        if reason is not None:
+            rejected.append(("Skipped", reason))
+            continue
+        try:
+            resolve_job_target(conn, spec)
+        except ValueError as e:
+            rejected.append(("Fail", str(e)))
+            continue
+        rejected.append(None)
+    job_ids = iter(reserve_job_ids(conn, rejected.count(None)))
+    conn.commit()
+
+    submitted, remote_specs = [], []
+    for spec, rejection in zip(specs, rejected):
+        if rejection is not None:
+            outcome, error = rejection
+            submitted.append({"job_id": None, "outcome": outcome, "queued": False, "metrics": {"error": error}})
+            continue
+        job_id = next(job_ids)
+        # Resolved again so each pool spec sees the load of the jobs queued before it
+        target = resolve_job_target(conn, spec)
+        if target is None:
+            remote_specs.append((job_id, spec))
+            continue
+        parameters = job_spec_parameters(spec)
+        if int(spec.get("shards", 1)) > 1:
+            result = submit_job(
+                conn, target["DUT"], target["hardware_type"], target["serial"], target["com_port"],
+                target["mac_address"], spec["test"], parameters["iterations"], parameters,
+                shards=int(spec["shards"]), job_id=job_id,
+            )
+        else:
+            result = enqueue_job(
+                conn, target["DUT"], target["hardware_type"], target["serial"], target["com_port"],
+                target["mac_address"], spec["test"], parameters["iterations"], parameters, job_id=job_id,
+            )
+        result["dut"] = target["DUT"]
+        submitted.append(result)
+
+    failed = any(r["outcome"] == "Fail" for r in submitted)
+    if not args.wait:
+        print(json.dumps(submitted, indent=2))
+        return 1 if failed else 0
+
+    # --wait: run remote jobs alongside the per-DUT queue drains
+    remote_results = [None] * len(remote_specs)
+
+    def remote(i, job_id, spec):
+        remote_results[i] = run_remote(args.db, spec, job_id)
+
+    threads = [threading.Thread(target=remote, args=(i, job_id, s)) for i, (job_id, s) in enumerate(remote_specs)]
+    for t in threads:
+        t.start()
+    # Only the DUTs this batch queued on; other queued work is left for `drain`
+    duts = {r["dut"] for r in submitted if r.get("dut") is not None}
+    if duts:
+        drain_queues(args.db, duts=duts, durability=args.durability)
+    for t in threads:
+        t.join()
+
+    job_ids = [r["job_id"] for r in submitted + remote_results if r and r.get("job_id") is not None]
+    rows = fetch_results(init_db(args.db), job_ids=job_ids)
+    write_results(rows, args.format, args.output)
+    return 0 if rows and not failed and all(r["outcome"] == "Pass" for r in rows) else 1
+
+
+def cmd_drain(args):
+    init_db(args.db).close()
+    drain_queues(args.db, duts=set(args.dut) if args.dut else None, durability=args.durability)
+    return 0
+
+
+def cmd_status(args):
+    conn = init_db(args.db)
+    done = {r["job_id"]: r for r in fetch_results(conn, job_ids=args.job_ids)}
+    queued = {}
+    for dut, status, job_queue in conn.execute("SELECT dut, status, job_queue FROM DUTStatus"):
+        for position, job in enumerate(json.loads(job_queue or "[]")):
+            queued[job["job_id"]] = {"dut": dut, "position": position + 1}
+
+    statuses = []
+    for job_id in args.job_ids:
+        if job_id in done:
+            statuses.append({"job_id": job_id, "status": "completed", "outcome": done[job_id]["outcome"]})
+        elif job_id in queued:
+            statuses.append({"job_id": job_id, "status": "queued", **queued[job_id]})
+        else:
+            statuses.append({"job_id": job_id, "status": "unknown"})
+    print(json.dumps(statuses, indent=2))
+    return 0
+
+
+def cmd_results(args):
+    conn = init_db(args.db)
+    rows = fetch_results(conn, since_job=args.since_job, test_name=args.test, expand_blobs=not args.blob_refs)
+    write_results(rows, args.format, args.output)
+    return 0
+
+
+def cmd_suggest(args):
+    # numpy is only needed here, so the agent is imported lazily
+    from ai_model import QLearningAgent
+    agent = QLearningAgent(db_path=args.db, include_archives=not args.no_archives)
+    print(json.dumps(agent.suggest_parameters(args.hardware_type, args.test, args.username)))
+    return 0
+
+
+def cmd_plan(args):
+    from test_plan import load_plan, run_plan
+    conn = init_db(args.db)
+    ssh = {k: getattr(args, k) for k in ("ip", "username", "password", "key_file") if getattr(args, k)}
+    result = run_plan(conn, load_plan(args.file), ssh=ssh)
+    print(json.dumps(result, indent=2))
+    return 0 if result["outcome"] == "Pass" else 1
+
+
+def cmd_archive(args):
+    from archive import archive_old_logs
+    conn = init_db(args.db)
+    moved = archive_old_logs(conn, args.db, keep_months=args.keep_months)
+    print(json.dumps(moved, indent=2))
+    return 0
+
+
+def cmd_export_parquet(args):
+    # pyarrow is optional and only needed here
+    from parquet_export import export_parquet
+    result = export_parquet(args.db, args.out_dir, chunk_size=args.chunk_size,
+                            include_archives=not args.no_archives)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="smarttest", description="SmartTestFramework headless CLI")
+    parser.add_argument("--db", default="framework.db", help="SQLite database path (default: framework.db)")
+    parser.add_argument("--durability", choices=["full", "normal", "off"], default="normal",
+                        help="How drained results are committed to Logs (see result_writer.py)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("submit", help="Submit a batch of jobs from a JSON/JSONL file")
+    p.add_argument("file")
+    p.add_argument("--wait", action="store_true", help="Run the jobs now and print their results")
+    p.add_argument("--format", choices=["json", "jsonl", "csv"], default="json")
+    p.add_argument("--output", help="Write results to this file instead of stdout")
+    p.set_defaults(func=cmd_submit)
+
+    p = sub.add_parser("drain", help="Run every queued job, in parallel across DUTs")
+    p.add_argument("--dut", type=int, action="append", help="Only drain this DUT (repeatable)")
+    p.set_defaults(func=cmd_drain)
+
+    p = sub.add_parser("status", help="Show queued/completed state of job ids")
+    p.add_argument("job_ids", type=int, nargs="+")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("results", help="Export job results from Logs")
+    p.add_argument("--since-job", type=int)
+    p.add_argument("--test")
+    p.add_argument("--format", choices=["json", "jsonl", "csv"], default="json")
+    p.add_argument("--output")
+    p.add_argument("--blob-refs", action="store_true",
+                   help='Keep large metric values as {"$blob": sha256} references instead of expanding them')
+    p.set_defaults(func=cmd_results)
+
+    p = sub.add_parser("suggest", help="AI parameter suggestion for a hardware type + test")
+    p.add_argument("hardware_type")
+    p.add_argument("test")
+    p.add_argument("--username")
+    p.add_argument("--no-archives", action="store_true", help="Learn from the hot Logs rows only, not archived months")
+    p.set_defaults(func=cmd_suggest)
+
+    p = sub.add_parser("plan", help="Run a test plan (JSON/YAML)")
+    p.add_argument("file")
+    p.add_argument("--ip", help="SSH host for the plan's remote (auto_detect_tests) steps")
+    p.add_argument("--username")
+    p.add_argument("--password")
+    p.add_argument("--key-file", dest="key_file")
+    p.set_defaults(func=cmd_plan)
+
+    p = sub.add_parser("archive", help="Move old Logs rows into monthly archive files now")
+    p.add_argument("--keep-months", type=int, default=3, help="Whole months kept in the main database")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("export-parquet", help="Export new Logs rows to date-partitioned Parquet (needs pyarrow)")
+    p.add_argument("out_dir")
+    p.add_argument("--chunk-size", type=int, default=20000)
+    p.add_argument("--no-archives", action="store_true", help="Skip rows in the monthly archive files")
+    p.set_defaults(func=cmd_export_parquet)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
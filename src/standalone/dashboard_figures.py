@@ -0,0 +1,288 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/dashboard_figures.py
+# Chart builders for the Dashboard tab. They take the rows returned by the
+# database dashboard queries and return plotly figures, without touching
+# Streamlit, so app.py and benchmark.py build exactly the same charts.
+import json
+
+HARDWARE_COLORS = {"Pass": "#10B981", "Fail": "#EF4444"}
+REMOTE_COLORS = {"Pass": "#2563eb", "Fail": "#eab308"}  # Blue / Yellow
+
+
+def dashboard_libs():
+    """pandas and plotly, imported the first time a chart is drawn (not on Main tab reruns)."""
+    try:
+        import pandas as pd
+        import plotly.express as px
+        import plotly.graph_objects as go
+    except ImportError:
+        raise RuntimeError("pandas and plotly are required for the dashboard (pip install pandas plotly)")
+    return pd, px, go
+
+
+def _transparent_layout(fig, **layout):
+    fig.update_layout(
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#333"),
+        title_font_size=16,
+        **layout,
+    )
+    return fig
+
+
+# ---------------------- hardware (managed DUT) dashboard ----------------------
+def outcome_frame(data):
+    """DataFrame of database.outcome_counts_by_dut rows, and the "Pass (n)" legend labels."""
+    pd, _, _ = dashboard_libs()
+    df = pd.DataFrame(data, columns=["dut", "outcome", "count"])
+    df["DUT"] = df["dut"].apply(lambda x: f"DUT {x}")
+    outcome_counts = df.groupby("outcome")["count"].sum().to_dict()
+    outcome_labels = {o: f"{o} ({outcome_counts.get(o, 0)})" for o in outcome_counts.keys()}
+    return df, outcome_labels
+
+
+def outcome_pie(df, outcome_labels, title_suffix):
+    _, px, _ = dashboard_libs()
+    fig_pie = px.pie(
+        df,
+        names=df["outcome"].map(outcome_labels),
+        values="count",
+        color=df["outcome"].map(outcome_labels),
+        color_discrete_map={
+            outcome_labels.get("Pass", "Pass"): HARDWARE_COLORS["Pass"],
+            outcome_labels.get("Fail", "Fail"): HARDWARE_COLORS["Fail"],
+        },
+        title=f"Pass/Fail Ratio for {title_suffix}"
+    )
+    fig_pie.update_traces(
+        textinfo="percent+value",
+        textfont_size=14,
+        pull=[0.05 if "Fail" in lbl else 0 for lbl in df["outcome"].map(outcome_labels)]
+    )
+    return fig_pie
+
+
+def outcome_bar(df, outcome_labels, title_suffix):
+    _, px, _ = dashboard_libs()
+    fig_bar = px.bar(
+        df,
+        x="DUT",
+        y="count",
+        color=df["outcome"].map(outcome_labels),
+        color_discrete_map={
+            outcome_labels.get("Pass", "Pass"): HARDWARE_COLORS["Pass"],
+            outcome_labels.get("Fail", "Fail"): HARDWARE_COLORS["Fail"],
+        },
+        barmode="stack",
+        text="count",
+        title=f"Pass/Fail Count by DUT for {title_suffix}"
+    )
+    fig_bar.update_traces(textposition="outside")
+    return _transparent_layout(fig_bar, xaxis_title="DUT", yaxis_title="Count")
+
+
+def percentile_frame(metric_rows, percentiles):
+    """DataFrame of database.iteration_metric_percentiles rows."""
+    pd, _, _ = dashboard_libs()
+    metrics_df = pd.DataFrame(
+        metric_rows,
+        columns=["DUT", "Test", "Metric", "Samples"] + [f"p{p}" for p in percentiles] + ["Mean", "Max"],
+    )
+    metrics_df["DUT"] = metrics_df["DUT"].apply(lambda x: f"DUT {x}")
+    return metrics_df
+
+
+def percentile_bar(metrics_df, metric, percentiles, title_suffix):
+    _, px, _ = dashboard_libs()
+    chosen = metrics_df[metrics_df["Metric"] == metric]
+    fig_percentiles = px.bar(
+        chosen.melt(id_vars=["DUT", "Test"], value_vars=[f"p{p}" for p in percentiles],
+                    var_name="Percentile", value_name="Value"),
+        x="DUT",
+        y="Value",
+        color="Percentile",
+        barmode="group",
+        facet_col="Test" if chosen["Test"].nunique() > 1 else None,
+        title=f"{metric} percentiles per DUT - {title_suffix}",
+    )
+    fig_percentiles.update_layout(
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        title_font_size=16,
+    )
+    return fig_percentiles
+
+
+def history_points(rows):
+    """(scatter points, trend points) from database.job_history rows."""
+    pd, _, _ = dashboard_libs()
+    scatter_data, trend_data = [], []
+    for job_id, dut, params, outcome, ts in rows:
+        try:
+            params_dict = json.loads(params)
+            iterations = params_dict.get("iterations")
+            delay = params_dict.get("delay")
+            if iterations is not None and delay is not None:
+                scatter_data.append({
+                    "Job ID": job_id,
+                    "DUT": f"DUT {dut}",
+                    "Iterations": iterations,
+                    "Delay": delay,
+                    "Outcome": outcome
+                })
+            if ts:
+                trend_data.append({"Timestamp": pd.to_datetime(ts), "Outcome": outcome})
+        except Exception:
+            continue
+    return scatter_data, trend_data
+
+
+# ---------------------- remote device dashboard ----------------------
+def remote_frame(rows):
+    """DataFrame of database.remote_history rows, with usernames normalized to strings."""
+    pd, _, _ = dashboard_libs()
+    df = pd.DataFrame(rows, columns=["username", "test_name", "outcome", "parameters", "timestamp"])
+    # Normalize usernames -> ensure everything is string (this is critical)
+    df["username"] = df["username"].astype(str).str.strip()
+    df["username"] = df["username"].replace(["None", "nan", "NaN", ""], "Unknown")
+    return df
+
+
+def remote_outcome_pie(df):
+    _, px, _ = dashboard_libs()
+    agg_outcome = df.groupby("outcome").size().reset_index(name="count")
+    agg_outcome["label"] = agg_outcome.apply(lambda r: f"{r['outcome']} ({r['count']})", axis=1)
+    fig_pie = px.pie(
+        agg_outcome,
+        names="label",
+        values="count",
+        color="outcome",
+        color_discrete_map=REMOTE_COLORS,
+        title="Pass/Fail Ratio (Remote)"
+    )
+    fig_pie.update_traces(
+        textinfo="percent+value",
+        textfont_size=14,
+        pull=[0.05 if r["outcome"] == "Fail" else 0 for _, r in agg_outcome.iterrows()]
+    )
+    return _transparent_layout(fig_pie)
+
+
+def remote_outcome_bar(df):
+    _, px, _ = dashboard_libs()
+    # Aggregate by username + outcome
+    bar_df = df.groupby(["username", "outcome"]).size().reset_index(name="count")
+
+    # Force username to be a string categorical so Plotly does not treat numeric-like values as numeric axis
+    bar_df["username"] = bar_df["username"].astype(str)
+
+    # Use sorted unique usernames for consistent x-axis ordering
+    username_order = sorted(bar_df["username"].unique().tolist(), key=lambda x: (str(x)))
+
+    fig_bar = px.bar(
+        bar_df.astype({"username": "string"}),   # force username as string
+        x="username",
+        y="count",
+        color="outcome",
+        barmode="stack",   # or "group" if you want side-by-side bars
+        text="count",
+        category_orders={"username": username_order},
+        color_discrete_map=REMOTE_COLORS,
+        title="Pass/Fail Count by Username"
+    )
+
+    # Force x-axis to categorical (no auto-formatting like k/M suffixes)
+    fig_bar.update_xaxes(type="category")
+    fig_bar.update_traces(textposition="outside")
+    return _transparent_layout(fig_bar, xaxis_title="Usernames", yaxis_title="Count")
+
+
+def remote_points(df):
+    """(scatter points, trend points) from a remote_frame."""
+    pd, _, _ = dashboard_libs()
+    scatter_rows, trend_rows = [], []
+    for _, row in df.iterrows():
+        try:
+            p = json.loads(row["parameters"] or "{}")
+            it = p.get("iterations")
+            dl = p.get("delay")
+            if it is not None and dl is not None:
+                scatter_rows.append({"Iterations": it, "Delay": dl, "Outcome": row["outcome"]})
+        except Exception:
+            pass
+        ts = row["timestamp"]
+        if ts:
+            try:
+                trend_rows.append({"Timestamp": pd.to_datetime(ts), "Outcome": row["outcome"]})
+            except Exception:
+                continue
+    return scatter_rows, trend_rows
+
+
+# ---------------------- shared ----------------------
+def scatter_figure(scatter_data, title, colors):
+    """Iterations vs delay, one marker per (iterations, delay, outcome) with its count."""
+    pd, _, go = dashboard_libs()
+    scatter_df = pd.DataFrame(scatter_data)
+
+    # Aggregate counts by (Iterations, Delay, Outcome), plus the total per point
+    grouped = scatter_df.groupby(["Iterations", "Delay", "Outcome"]).size().reset_index(name="Count")
+    totals = grouped.groupby(["Iterations", "Delay"])["Count"].sum().reset_index(name="Total")
+    grouped = grouped.merge(totals, on=["Iterations", "Delay"])
+
+    grouped["hover"] = grouped.apply(
+        lambda r: f"Iterations={r['Iterations']}<br>Delay={r['Delay']}<br>{r['Outcome']}: {r['Count']}<br>Total={r['Total']}", axis=1
+    )
+
+    fig_scatter = go.Figure()
+    for outcome in ("Pass", "Fail"):
+        sub = grouped[grouped["Outcome"] == outcome]
+        fig_scatter.add_trace(go.Scatter(
+            x=sub["Delay"],
+            y=sub["Iterations"],
+            mode="markers+text",
+            marker=dict(size=12, color=colors[outcome], opacity=0.7, line=dict(width=1, color="DarkSlateGrey")),
+            text=sub.apply(lambda r: f"x{r['Total']}" if r["Total"] > 1 else "", axis=1),
+            textposition="top center",
+            name=outcome,
+            hovertext=sub["hover"],
+            hoverinfo="text"
+        ))
+    return _transparent_layout(fig_scatter, title=title, xaxis_title="Delay (seconds)", yaxis_title="Iterations")
+
+
+def trend_figure(trend_data, title, colors):
+    """Hourly Pass/Fail counts over time, with a range selector."""
+    pd, px, _ = dashboard_libs()
+    trend_df = pd.DataFrame(trend_data)
+    trend_counts = trend_df.groupby([pd.Grouper(key="Timestamp", freq="h"), "Outcome"]).size().reset_index(name="Count")
+
+    fig_trend = px.line(
+        trend_counts,
+        x="Timestamp",
+        y="Count",
+        color="Outcome",
+        color_discrete_map=colors,
+        title=title
+    )
+    fig_trend.update_traces(mode="lines+markers")
+    return _transparent_layout(
+        fig_trend,
+        xaxis=dict(
+            title="Timeline",
+            rangeselector=dict(
+                buttons=list([
+                    dict(count=24, label="24h", step="hour", stepmode="backward"),
+                    dict(count=7, label="1w", step="day", stepmode="backward"),
+                    dict(count=1, label="1m", step="month", stepmode="backward"),
+                    dict(step="all")
+                ])
+            ),
+            rangeslider=dict(visible=True),
+            type="date"
+        ),
+        yaxis_title="Number of Tests",
+    )
@@ -4,12 +4,131 @@
 # src/database.py
 import sqlite3
 import json
-from hardware import mock_hardware_detection
+import hashlib
+import zlib
+from hardware import inventory_signature, mock_hardware_detection
+
+_synced_inventory = {}  # db_path -> inventory_signature() its DUTStatus rows were last synced with
 
 def init_db(db_path="framework.db"):
+    """
+    Open the database, bring its schema up to date and add DUTStatus rows for
+    newly detected DUTs. Once every migration is applied (the normal case),
+    the schema check costs a single schema_version lookup, and the DUT sync
+    only runs when the schema or the inventory changed since this process last synced.
+    """
     conn = sqlite3.connect(db_path, check_same_thread=False)
+    migrated = schema_version(conn) < SCHEMA_VERSION
+    if migrated:
+        run_migrations(conn)
+    signature = inventory_signature()
+    if migrated or db_path not in _synced_inventory or _synced_inventory[db_path] != signature:
+        sync_dut_status(conn)
+        conn.commit()
+        _synced_inventory[db_path] = signature
+    return conn
+
+
+def sync_dut_status(conn):
+    """Add a Free DUTStatus row for every detected DUT that has none (caller commits)."""
+    existing_duts = {row[0] for row in conn.execute("SELECT dut FROM DUTStatus")}
+    for h in mock_hardware_detection():
+        if h["DUT"] not in existing_duts:
+            conn.execute("INSERT INTO DUTStatus (dut, status, job_queue) VALUES (?, ?, ?)",
+                        (h["DUT"], "Free", json.dumps([])))
+
+
+# ---------------------- migrations ----------------------
+# Every schema change is a numbered step in MIGRATIONS, applied once and
+# recorded in schema_version. Steps are idempotent, so a database created
+# before schema_version existed simply runs them all. Steps that rewrite a
+# large table go through backfill_in_chunks: one short transaction per chunk,
+# with progress saved, so the app and workers keep running and an
+# interrupted migration resumes where it stopped.
+
+MIGRATION_CHUNK_SIZE = 5000
+
+
+def schema_version(conn):
+    try:
+        return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return 0
+
+
+def run_migrations(conn):
+    """Apply every migration newer than the recorded schema version, in order."""
+    conn.commit()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at DATETIME
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migration_progress (
+            version INTEGER PRIMARY KEY,
+            last_key INTEGER
+        )
+    """)
+    conn.commit()
+    for version, description, migrate in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        migrate(conn)
+        conn.execute(
+            "INSERT OR IGNORE INTO schema_version (version, description, applied_at) VALUES (?, ?, datetime('now'))",
+            (version, description),
+        )
+        conn.execute("DELETE FROM schema_migration_progress WHERE version = ?", (version,))
+        conn.commit()
+
+
+def backfill_in_chunks(conn, version, table, apply, chunk_size=MIGRATION_CHUNK_SIZE, key="log_id"):
+    """
+    Call apply(conn, after, upto) for consecutive `key` ranges of `table`
+    holding up to `chunk_size` rows each, one BEGIN IMMEDIATE ... COMMIT per
+    chunk. The last finished key is saved with the chunk, so a restarted
+    migration continues after it. Returns the number of chunks applied.
+    """
+    row = conn.execute("SELECT last_key FROM schema_migration_progress WHERE version = ?", (version,)).fetchone()
+    after = row[0] if row else -1
+    chunks = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not _table_exists(conn, table):
+                # Another process finished this migration meanwhile
+                conn.commit()
+                return chunks
+            upto = conn.execute(
+                f"SELECT MAX({key}) FROM (SELECT {key} FROM {table} WHERE {key} > ? ORDER BY {key} LIMIT ?)",
+                (after, chunk_size),
+            ).fetchone()[0]
+            if upto is None:
+                conn.commit()
+                return chunks
+            apply(conn, after, upto)
+            conn.execute(
+                "INSERT OR REPLACE INTO schema_migration_progress (version, last_key) VALUES (?, ?)",
+                (version, upto),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        after = upto
+        chunks += 1
+
+
+def _table_exists(conn, name, kind="table"):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (kind, name)
+    ).fetchone() is not None
 
-    # Create DUTStatus table
+
+def _migrate_base_tables(conn):
     conn.execute("""
         CREATE TABLE IF NOT EXISTS DUTStatus (
             dut INTEGER PRIMARY KEY,
@@ -17,49 +136,21 @@ def init_db(db_path="framework.db"):
             job_queue TEXT
         )
     """)
+    sync_dut_status(conn)
 
-    # Initialize DUTStatus for all DUTs (if missing)
-    hardware = mock_hardware_detection()
-    cursor = conn.execute("SELECT dut FROM DUTStatus")
-    existing_duts = {row[0] for row in cursor}
-    for h in hardware:
-        if h["DUT"] not in existing_duts:
-            conn.execute("INSERT INTO DUTStatus (dut, status, job_queue) VALUES (?, ?, ?)",
-                        (h["DUT"], "Free", json.dumps([])))
-
-    # Create Logs table (base schema)
     conn.execute("""
-        CREATE TABLE IF NOT EXISTS Logs (
-            log_id INTEGER PRIMARY KEY,
-            job_id INTEGER,
-            dut INTEGER,
-            hardware_type TEXT,
-            serial TEXT,
-            com_port TEXT,
-            mac_address TEXT,
-            ip TEXT,
-            username TEXT,
-            test_name TEXT,
-            parameters TEXT,
-            outcome TEXT,
-            metrics TEXT,
-            timestamp DATETIME
+        CREATE TABLE IF NOT EXISTS JobIDCounter (
+            counter_id INTEGER PRIMARY KEY,
+            next_job_id INTEGER
         )
     """)
+    conn.execute("INSERT OR IGNORE INTO JobIDCounter (counter_id, next_job_id) VALUES (1, 1)")
 
-    # Check if logs table contains ip/username columns; migration not strictly necessary because
-    # we created them above; but if older DB exists, ensure the columns exist:
-    # Get current columns
-    cur = conn.execute("PRAGMA table_info(Logs)")
-    existing_cols = {row[1] for row in cur}
-    # If ip or username missing, recreate table with new schema (safe copy)
-    required_cols = {"log_id","job_id","dut","hardware_type","serial","com_port","mac_address","ip","username","test_name","parameters","outcome","metrics","timestamp"}
-    if not required_cols.issubset(existing_cols):
-        # perform safe migration: copy into new table
-        conn.execute("ALTER TABLE Logs RENAME TO Logs_old_temp")
-        # Create Logs table
+    # Original wide Logs table; step 3 turns it into a view. Creating it only when
+    # nothing named Logs exists keeps this step safe to re-run.
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'Logs'").fetchone():
         conn.execute("""
-            CREATE TABLE IF NOT EXISTS Logs (
+            CREATE TABLE Logs (
                 log_id INTEGER PRIMARY KEY,
                 job_id INTEGER,
                 dut INTEGER,
@@ -67,36 +158,519 @@ def init_db(db_path="framework.db"):
                 serial TEXT,
                 com_port TEXT,
                 mac_address TEXT,
+                ip TEXT,
+                username TEXT,
                 test_name TEXT,
                 parameters TEXT,
                 outcome TEXT,
                 metrics TEXT,
-                ip TEXT,
-                username TEXT,
                 timestamp DATETIME
             )
         """)
+    conn.commit()
 
-        # Copy available columns from old table if exist
-        old_cols = list(existing_cols)
-        common = [c for c in ["log_id","job_id","dut","hardware_type","serial","com_port","mac_address","test_name","parameters","outcome","metrics","timestamp"] if c in old_cols]
-        if common:
-            placeholders = ", ".join(common)
-            conn.execute(f"INSERT INTO Logs ({placeholders}) SELECT {placeholders} FROM Logs_old_temp")
-        conn.execute("DROP TABLE Logs_old_temp")
-        conn.commit()
 
-    # Create JobIDCounter table
+def _migrate_logs_columns(conn):
+    # Older databases lack some Logs columns (ip/username were added for remote
+    # runs). ADD COLUMN only rewrites the schema, not the rows.
+    if not _table_exists(conn, "Logs"):
+        return
+    existing_cols = {row[1] for row in conn.execute("PRAGMA table_info(Logs)")}
+    for col, col_type in [("job_id", "INTEGER"), ("dut", "INTEGER"), ("hardware_type", "TEXT"),
+                          ("serial", "TEXT"), ("com_port", "TEXT"), ("mac_address", "TEXT"),
+                          ("ip", "TEXT"), ("username", "TEXT"), ("test_name", "TEXT"),
+                          ("parameters", "TEXT"), ("outcome", "TEXT"), ("metrics", "TEXT"),
+                          ("timestamp", "DATETIME")]:
+        if col not in existing_cols:
+            conn.execute(f"ALTER TABLE Logs ADD COLUMN {col} {col_type}")
+    conn.commit()
+
+
+def _migrate_star_schema(conn):
+    # Narrow fact table + dimension tables behind a Logs view
+    conn.execute("BEGIN IMMEDIATE")
+    if _table_exists(conn, "Logs"):
+        conn.execute("ALTER TABLE Logs RENAME TO Logs_wide")
+    create_star_schema(conn)
+    conn.commit()
+    if not _table_exists(conn, "Logs_wide"):
+        return
+
+    def copy(conn, after, upto):
+        for table, (_, cols) in LOG_DIMENSIONS.items():
+            conn.execute(f"""
+                INSERT INTO {table} ({', '.join(cols)})
+                SELECT DISTINCT {', '.join(cols)} FROM Logs_wide
+                WHERE log_id > ? AND log_id <= ?
+                  AND NOT EXISTS (SELECT 1 FROM {table} WHERE {_dim_match(table, 'Logs_wide')})
+            """, (after, upto))
+        conn.execute(f"""
+            INSERT OR IGNORE INTO LogFacts (log_id, job_id, dut, {', '.join(id_col for id_col, _ in LOG_DIMENSIONS.values())},
+                                            metrics, timestamp)
+            SELECT Logs_wide.log_id, Logs_wide.job_id, Logs_wide.dut,
+                   {', '.join(f'{table}.{id_col}' for table, (id_col, _) in LOG_DIMENSIONS.items())},
+                   Logs_wide.metrics, Logs_wide.timestamp
+            FROM Logs_wide
+            {' '.join(f'JOIN {table} ON {_dim_match(table, "Logs_wide")}' for table in LOG_DIMENSIONS)}
+            WHERE Logs_wide.log_id > ? AND Logs_wide.log_id <= ?
+        """, (after, upto))
+
+    # Copy the newest row first: jobs logged while the backfill runs then get
+    # log_ids above every old row instead of colliding with one not copied yet.
+    conn.execute("BEGIN IMMEDIATE")
+    if _table_exists(conn, "Logs_wide"):
+        last = conn.execute("SELECT MAX(log_id) FROM Logs_wide").fetchone()[0]
+        if last is not None:
+            copy(conn, last - 1, last)
+    conn.commit()
+
+    backfill_in_chunks(conn, 3, "Logs_wide", copy)
+    conn.execute("DROP TABLE IF EXISTS Logs_wide")
+    conn.commit()
+
+
+def _migrate_metric_blobs(conn):
+    # Content-addressed store for large metric values (see externalize_metrics)
     conn.execute("""
-        CREATE TABLE IF NOT EXISTS JobIDCounter (
-            counter_id INTEGER PRIMARY KEY,
-            next_job_id INTEGER
+        CREATE TABLE IF NOT EXISTS MetricBlobs (
+            hash TEXT PRIMARY KEY,
+            data BLOB,
+            size INTEGER
         )
     """)
-    # Initialize JobIDCounter if empty
-    cursor = conn.execute("SELECT COUNT(*) FROM JobIDCounter")
-    if cursor.fetchone()[0] == 0:
-        conn.execute("INSERT INTO JobIDCounter (counter_id, next_job_id) VALUES (1, 1)")
+    conn.commit()
 
+    def externalize(conn, after, upto):
+        # Rows logged before the blob store keep their output inline; move it out
+        rows = conn.execute(
+            "SELECT log_id, metrics FROM LogFacts WHERE log_id > ? AND log_id <= ? AND length(metrics) > ?",
+            (after, upto, METRIC_BLOB_THRESHOLD),
+        ).fetchall()
+        for log_id, metrics in rows:
+            try:
+                compact, blobs = externalize_metrics(json.loads(metrics))
+            except ValueError:
+                continue
+            if blobs:
+                store_metric_blobs(conn, blobs)
+                conn.execute("UPDATE LogFacts SET metrics = ? WHERE log_id = ?", (json.dumps(compact), log_id))
+
+    backfill_in_chunks(conn, 4, "LogFacts", externalize)
+
+
+def _migrate_iteration_results(conn):
+    # One row per iteration streamed by a v2 (generator) plugin, see test_runner.py
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS IterationResults (
+            job_id INTEGER NOT NULL,
+            iteration INTEGER NOT NULL,
+            outcome TEXT,
+            metrics TEXT,
+            timestamp TEXT,
+            PRIMARY KEY (job_id, iteration)
+        ) WITHOUT ROWID
+    """)
     conn.commit()
-    return conn
+
+
+# IterationMetrics rows (numeric top-level metrics) of the IterationResults row(s) `row`
+_ITERATION_METRICS_SELECT = """
+    SELECT {row}.job_id, {row}.iteration, metric.key, metric.value
+    FROM {tables}json_each(CASE WHEN json_valid({row}.metrics) THEN {row}.metrics ELSE '{{}}' END) AS metric
+    WHERE metric.type IN ('integer', 'real')
+"""
+
+
+def _migrate_iteration_metrics(conn):
+    # Narrow (job_id, iteration, metric, value) rows for percentile queries; a trigger
+    # fills them in the same statement (and batch) that inserts the IterationResults row
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS IterationMetrics (
+            job_id INTEGER NOT NULL,
+            iteration INTEGER NOT NULL,
+            metric TEXT NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY (job_id, iteration, metric)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS IterationResults_metrics AFTER INSERT ON IterationResults
+        BEGIN
+            INSERT OR REPLACE INTO IterationMetrics (job_id, iteration, metric, value)
+            {_ITERATION_METRICS_SELECT.format(row="NEW", tables="")};
+        END
+    """)
+    conn.commit()
+
+    def copy(conn, after, upto):
+        conn.execute(f"""
+            INSERT OR REPLACE INTO IterationMetrics (job_id, iteration, metric, value)
+            {_ITERATION_METRICS_SELECT.format(row="r", tables="IterationResults AS r, ")}
+              AND r.job_id > ? AND r.job_id <= ?
+        """, (after, upto))
+
+    backfill_in_chunks(conn, 6, "IterationResults", copy, key="job_id")
+
+
+def _migrate_log_id_high_water(conn):
+    # Without it LogFacts hands out MAX(log_id) + 1, so once the newest rows
+    # are archived their ids come back (and break LogsAll and last_log_id resumes)
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("DROP TRIGGER IF EXISTS Logs_insert")
+    create_star_schema(conn)
+    last = _archived_max_log_id(conn)
+    conn.execute("UPDATE LogIdHighWater SET last_log_id = ? WHERE last_log_id < ?", (last, last))
+    conn.commit()
+
+
+def _archived_max_log_id(conn):
+    # Highest log_id already moved into the monthly archives of this database
+    from archive import list_archives
+    path = next((row[2] for row in conn.execute("PRAGMA database_list") if row[1] == "main"), "")
+    highest = 0
+    for _, archive in list_archives(path) if path else []:
+        archive_conn = sqlite3.connect(archive)
+        try:
+            highest = max(highest, archive_conn.execute("SELECT MAX(log_id) FROM LogFacts").fetchone()[0] or 0)
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            archive_conn.close()
+    return highest
+
+
+def _migrate_iteration_shard(conn):
+    # Shard number of an iteration merged from a sharded job (NULL otherwise);
+    # a column rather than a metric, so IterationMetrics does not ingest it
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(IterationResults)")}
+    if "shard" not in columns:
+        conn.execute("ALTER TABLE IterationResults ADD COLUMN shard INTEGER")
+    conn.commit()
+
+
+def _migrate_iteration_details(conn):
+    # JSON "details" of a streamed iteration: data that describes it but is
+    # not a measurement (device counts, per-port results), kept out of metrics
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(IterationResults)")}
+    if "details" not in columns:
+        conn.execute("ALTER TABLE IterationResults ADD COLUMN details TEXT")
+    conn.commit()
+
+
+MIGRATIONS = [
+    (1, "DUTStatus, JobIDCounter and Logs tables", _migrate_base_tables),
+    (2, "Logs ip/username (and any other missing) columns", _migrate_logs_columns),
+    (3, "Logs star schema: LogFacts + dimension tables behind a Logs view", _migrate_star_schema),
+    (4, "MetricBlobs store; move large inline metrics into it", _migrate_metric_blobs),
+    (5, "IterationResults table", _migrate_iteration_results),
+    (6, "IterationMetrics table filled from IterationResults", _migrate_iteration_metrics),
+    (7, "LogIdHighWater: log_ids of archived rows are never reused", _migrate_log_id_high_water),
+    (8, "IterationResults shard column", _migrate_iteration_shard),
+    (9, "IterationResults details column", _migrate_iteration_details),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ---------------------- star schema ----------------------
+# Logs is a view over LogFacts (one narrow row of integers per job) joined with
+# dimension tables that hold each distinct string value once. Inserts into the
+# Logs view are routed by the Logs_insert trigger, so existing readers and
+# writers keep using Logs; aggregations should use the helpers below, which
+# filter and GROUP BY on the integer keys.
+
+# dimension table -> (id column, value columns)
+LOG_DIMENSIONS = {
+    "DimDevice": ("device_id", ["hardware_type", "serial", "com_port", "mac_address"]),
+    "DimHost": ("host_id", ["ip", "username"]),
+    "DimTest": ("test_id", ["test_name"]),
+    "DimParameters": ("parameters_id", ["parameters"]),
+    "DimOutcome": ("outcome_id", ["outcome"]),
+}
+
+
+def _dim_match(table, alias):
+    # NULL-safe equality (IS) between a dimension row and `alias` (NEW or a Logs row)
+    return " AND ".join(f"{table}.{c} IS {alias}.{c}" for c in LOG_DIMENSIONS[table][1])
+
+
+def create_log_facts_table(conn, schema="main"):
+    """LogFacts in `schema` (also used for the monthly archive files, see archive.py)."""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {schema}.LogFacts (
+            log_id INTEGER PRIMARY KEY,
+            job_id INTEGER,
+            dut INTEGER,
+            device_id INTEGER REFERENCES DimDevice(device_id),
+            host_id INTEGER REFERENCES DimHost(host_id),
+            test_id INTEGER REFERENCES DimTest(test_id),
+            parameters_id INTEGER REFERENCES DimParameters(parameters_id),
+            outcome_id INTEGER REFERENCES DimOutcome(outcome_id),
+            metrics TEXT,
+            timestamp DATETIME
+        )
+    """)
+    for col in ("job_id", "device_id", "host_id", "test_id", "timestamp"):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_LogFacts_{col} ON LogFacts ({col})")
+
+
+def logs_select(source="LogFacts"):
+    """The Logs columns: `source` (LogFacts or a union of it) joined back to the dimensions."""
+    joins = "\n".join(
+        f"        LEFT JOIN {table} ON {table}.{id_col} = LogFacts.{id_col}"
+        for table, (id_col, _) in LOG_DIMENSIONS.items()
+    )
+    return f"""
+        SELECT LogFacts.log_id, LogFacts.job_id, LogFacts.dut,
+               hardware_type, serial, com_port, mac_address, ip, username,
+               test_name, parameters, outcome, LogFacts.metrics, LogFacts.timestamp
+        FROM {source} AS LogFacts
+{joins}
+    """
+
+
+def create_star_schema(conn):
+    for table, (id_col, cols) in LOG_DIMENSIONS.items():
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ({id_col} INTEGER PRIMARY KEY, "
+            f"{', '.join(c + ' TEXT' for c in cols)}, UNIQUE ({', '.join(cols)}))"
+        )
+    create_log_facts_table(conn)
+    conn.execute(f"CREATE VIEW IF NOT EXISTS Logs AS {logs_select()}")
+
+    # Highest log_id ever inserted. Archiving deletes rows from LogFacts, so
+    # new rows take their ids from here rather than from MAX(log_id).
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS LogIdHighWater (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_log_id INTEGER NOT NULL
+        )
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO LogIdHighWater (id, last_log_id) "
+        "SELECT 1, COALESCE(MAX(log_id), 0) FROM LogFacts"
+    )
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS LogFacts_high_water AFTER INSERT ON LogFacts
+        BEGIN
+            UPDATE LogIdHighWater SET last_log_id = NEW.log_id WHERE NEW.log_id > last_log_id;
+        END
+    """)
+
+    intern = "\n".join(
+        f"            INSERT INTO {table} ({', '.join(cols)}) SELECT {', '.join('NEW.' + c for c in cols)}\n"
+        f"            WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {_dim_match(table, 'NEW')});"
+        for table, (_, cols) in LOG_DIMENSIONS.items()
+    )
+    lookups = ",\n".join(
+        f"                (SELECT {id_col} FROM {table} WHERE {_dim_match(table, 'NEW')})"
+        for table, (id_col, _) in LOG_DIMENSIONS.items()
+    )
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS Logs_insert INSTEAD OF INSERT ON Logs
+        BEGIN
+{intern}
+            INSERT INTO LogFacts (log_id, job_id, dut, {', '.join(id_col for id_col, _ in LOG_DIMENSIONS.values())},
+                                  metrics, timestamp)
+            VALUES (
+                COALESCE(NEW.log_id, MAX(
+                    (SELECT last_log_id FROM LogIdHighWater),
+                    COALESCE((SELECT MAX(log_id) FROM LogFacts), 0)
+                ) + 1),
+                NEW.job_id, NEW.dut,
+{lookups},
+                NEW.metrics, COALESCE(NEW.timestamp, datetime('now'))
+            );
+        END
+    """)
+
+
+def _dim_ids(table, column, value=None, exclude=None):
+    # Subquery + params selecting the ids of a dimension by one of its values
+    id_col = LOG_DIMENSIONS[table][0]
+    if exclude is not None:
+        return f"(SELECT {id_col} FROM {table} WHERE {column} != ?)", [exclude]
+    return f"(SELECT {id_col} FROM {table} WHERE {column} = ?)", [value]
+
+
+def _fact_filter(hardware_type=None, test_name=None, since=None):
+    """
+    WHERE clause (on LogFacts integer keys) for the dashboard selections:
+    hardware_type "All" means every managed DUT (not auto-detected devices);
+    since is a "YYYY-MM-DD HH:MM:SS" UTC lower bound on the timestamp.
+    """
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("LogFacts.timestamp >= ?")
+        params.append(since)
+    if hardware_type == "All" or (hardware_type is None and test_name == "All"):
+        sub, p = _dim_ids("DimDevice", "hardware_type", exclude="auto-detected")
+        clauses.append(f"LogFacts.device_id IN {sub}")
+        params += p
+    elif hardware_type is not None:
+        sub, p = _dim_ids("DimDevice", "hardware_type", hardware_type)
+        clauses.append(f"LogFacts.device_id IN {sub}")
+        params += p
+    if test_name not in (None, "All"):
+        sub, p = _dim_ids("DimTest", "test_name", test_name)
+        clauses.append(f"LogFacts.test_id IN {sub}")
+        params += p
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+# `source` below is LogFacts (hot rows only) or the LogFactsAll view that
+# archive.attach_archives creates when the time range reaches archived months.
+
+def outcome_counts_by_dut(conn, hardware_type=None, test_name=None, since=None, source="LogFacts"):
+    """[(dut, outcome, count)] for the dashboard pie/bar charts."""
+    where, params = _fact_filter(hardware_type, test_name, since)
+    return conn.execute(f"""
+        SELECT c.dut, DimOutcome.outcome, c.n
+        FROM (SELECT dut, outcome_id, COUNT(*) AS n FROM {source} AS LogFacts{where} GROUP BY dut, outcome_id) c
+        JOIN DimOutcome ON DimOutcome.outcome_id = c.outcome_id
+    """, params).fetchall()
+
+
+def job_history(conn, hardware_type=None, test_name=None, since=None, source="LogFacts"):
+    """[(job_id, dut, parameters, outcome, timestamp)] for the scatter/trend charts."""
+    where, params = _fact_filter(hardware_type, test_name, since)
+    return conn.execute(f"""
+        SELECT LogFacts.job_id, LogFacts.dut, DimParameters.parameters, DimOutcome.outcome, LogFacts.timestamp
+        FROM {source} AS LogFacts
+        JOIN DimParameters ON DimParameters.parameters_id = LogFacts.parameters_id
+        JOIN DimOutcome ON DimOutcome.outcome_id = LogFacts.outcome_id{where}
+    """, params).fetchall()
+
+
+def remote_usernames(conn):
+    return [row[0] for row in conn.execute("SELECT DISTINCT username FROM DimHost WHERE username IS NOT NULL")]
+
+
+def remote_history(conn, usernames, test_names, since=None, source="LogFacts"):
+    """[(username, test_name, outcome, parameters, timestamp)] for the remote dashboard."""
+    if not usernames or not test_names:
+        return []
+    placeholders_u = ",".join("?" * len(usernames))
+    placeholders_t = ",".join("?" * len(test_names))
+    since_clause = "" if since is None else "\n          AND LogFacts.timestamp >= ?"
+    return conn.execute(f"""
+        SELECT DimHost.username, DimTest.test_name, DimOutcome.outcome, DimParameters.parameters, LogFacts.timestamp
+        FROM {source} AS LogFacts
+        JOIN DimHost ON DimHost.host_id = LogFacts.host_id
+        JOIN DimTest ON DimTest.test_id = LogFacts.test_id
+        JOIN DimOutcome ON DimOutcome.outcome_id = LogFacts.outcome_id
+        JOIN DimParameters ON DimParameters.parameters_id = LogFacts.parameters_id
+        WHERE LogFacts.host_id IN (SELECT host_id FROM DimHost WHERE username IN ({placeholders_u}))
+          AND LogFacts.test_id IN (SELECT test_id FROM DimTest WHERE test_name IN ({placeholders_t})){since_clause}
+    """, list(usernames) + list(test_names) + ([] if since is None else [since])).fetchall()
+
+
+def iteration_results(conn, job_id):
+    """[{"iteration", "outcome", "metrics", "timestamp", "shard", "details"}] of one job, in iteration order."""
+    return [
+        {"iteration": iteration, "outcome": outcome, "metrics": json.loads(metrics or "{}"),
+         "timestamp": timestamp, "shard": shard, "details": json.loads(details or "{}")}
+        for iteration, outcome, metrics, timestamp, shard, details in conn.execute(
+            "SELECT iteration, outcome, metrics, timestamp, shard, details FROM IterationResults "
+            "WHERE job_id = ? ORDER BY iteration",
+            (job_id,),
+        )
+    ]
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def iteration_metric_percentiles(conn, hardware_type=None, test_name=None, since=None, source="LogFacts"):
+    """
+    [(dut, test_name, metric, samples, p50, p95, p99, mean, max)] of the
+    per-iteration metrics of the jobs in the dashboard selection. Percentiles
+    are nearest-rank, computed in SQL with window functions, so only one row
+    per (dut, test, metric) reaches Python.
+    """
+    where, params = _fact_filter(hardware_type, test_name, since)
+    percentiles = ",\n".join(
+        f"            MIN(CASE WHEN rank * 100 >= {p} * samples THEN value END) AS p{p}" for p in PERCENTILES
+    )
+    return conn.execute(f"""
+        WITH ranked AS (
+            SELECT LogFacts.dut, LogFacts.test_id, m.metric, m.value,
+                   ROW_NUMBER() OVER (PARTITION BY LogFacts.dut, LogFacts.test_id, m.metric ORDER BY m.value) AS rank,
+                   COUNT(*) OVER (PARTITION BY LogFacts.dut, LogFacts.test_id, m.metric) AS samples
+            FROM {source} AS LogFacts
+            JOIN IterationMetrics AS m ON m.job_id = LogFacts.job_id{where}
+        )
+        SELECT ranked.dut, DimTest.test_name, ranked.metric, MAX(samples),
+{percentiles},
+            AVG(value), MAX(value)
+        FROM ranked
+        JOIN DimTest ON DimTest.test_id = ranked.test_id
+        GROUP BY ranked.dut, ranked.test_id, ranked.metric
+        ORDER BY DimTest.test_name, ranked.metric, ranked.dut
+    """, params).fetchall()
+
+
+# ---------------------- metric blobs ----------------------
+# Metric values whose JSON is larger than METRIC_BLOB_THRESHOLD bytes (full
+# command output in metrics["details"], process lists, ...) are stored once in
+# MetricBlobs, zlib-compressed and keyed by the sha256 of their JSON. Logs.metrics
+# keeps {"$blob": "<sha256>"} in their place, so identical output from repeated
+# runs costs one small reference per row.
+
+METRIC_BLOB_THRESHOLD = 1024
+
+
+def is_blob_ref(value):
+    return isinstance(value, dict) and len(value) == 1 and "$blob" in value
+
+
+def externalize_metrics(metrics, threshold=METRIC_BLOB_THRESHOLD):
+    """
+    Split large top-level metric values out of `metrics`.
+    Returns (compact_metrics, {hash: compressed_json}); nothing is written here.
+    """
+    if not isinstance(metrics, dict):
+        return metrics, {}
+    compact, blobs = {}, {}
+    for key, value in metrics.items():
+        encoded = json.dumps(value).encode("utf-8")
+        if len(encoded) <= threshold:
+            compact[key] = value
+            continue
+        digest = hashlib.sha256(encoded).hexdigest()
+        blobs[digest] = (zlib.compress(encoded), len(encoded))
+        compact[key] = {"$blob": digest}
+    return compact, blobs
+
+
+def store_metric_blobs(conn, blobs):
+    """Insert blobs returned by externalize_metrics (caller commits); known hashes are skipped."""
+    if blobs:
+        conn.executemany(
+            "INSERT OR IGNORE INTO MetricBlobs (hash, data, size) VALUES (?, ?, ?)",
+            [(digest, data, size) for digest, (data, size) in blobs.items()],
+        )
+
+
+def resolve_metrics(conn, metrics, pending=None):
+    """
+    Replace {"$blob": hash} references in `metrics` with their stored values.
+    `pending` is an optional {hash: (data, size)} of blobs not committed yet.
+    Unknown hashes are left as references.
+    """
+    if not isinstance(metrics, dict):
+        return metrics
+    refs = {v["$blob"] for v in metrics.values() if is_blob_ref(v)}
+    if not refs:
+        return metrics
+    found = {digest: blob[0] for digest, blob in (pending or {}).items() if digest in refs}
+    missing = [digest for digest in refs if digest not in found]
+    if missing:
+        rows = conn.execute(
+            f"SELECT hash, data FROM MetricBlobs WHERE hash IN ({','.join('?' * len(missing))})", missing
+        )
+        found.update(rows)
+    return {
+        key: json.loads(zlib.decompress(found[value["$blob"]])) if is_blob_ref(value) and value["$blob"] in found
+        else value
+        for key, value in metrics.items()
+    }
@@ -0,0 +1,506 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/dut_simulator.py
+# Virtual DUT fleet for load testing on one Linux box (needs paramiko for the
+# SSH hosts; the serial consoles are plain ptys, driven by the boot jobs through
+# pyserial). Run from the repository root:
+#     python src/standalone/dut_simulator.py --ssh-hosts 200 --serial-duts 200
+# It starts, until Ctrl+C:
+#   * SSH hosts on 127.0.<n>.<m>:2222 (every 127.x address is loopback on Linux)
+#     answering the commands of the auto_detect_tests plugins (cat /proc/cpuinfo,
+#     systeminfo, tasklist, wmic, shutdown /r) after --latency seconds, including
+#     their batched multi-iteration scripts (_ssh_batch.py). A host that is
+#     restarted refuses connections for --reboot-downtime seconds.
+#   * pty serial consoles, linked as sim_fleet/ttySIM<dut>, answering
+#     COLD_BOOT / RESTART / WAKE_UP (and WARM_BOOT / S4 / REBOOT) with a boot log
+#     after --boot-time seconds; S4_SLEEP is acknowledged without a boot.
+# and writes
+#   * sim_fleet/inventory.json: the serial DUTs. Point the framework at it with
+#     STF_HARDWARE_FILE=sim_fleet/inventory.json (see hardware.py); their
+#     DUTStatus rows are added to --db.
+#   * sim_fleet/jobs.json: one job spec per virtual DUT, for
+#     STF_HARDWARE_FILE=sim_fleet/inventory.json python -m src.standalone.cli submit sim_fleet/jobs.json
+# --failure-rate makes that share of commands fail, --connect-failure-rate that
+# share of SSH connections drop before the handshake.
+import argparse
+import base64
+import heapq
+import json
+import os
+import random
+import selectors
+import socket
+import sys
+import threading
+import time
+import tty
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins", "auto_detect_tests"))
+
+from _ssh_batch import marker_line, output_hash, read_header
+from hardware import HARDWARE_FILE_ENV
+
+SIM_DUT_BASE = 1000  # virtual DUT ids start above the real ones
+SSH_USERNAME = "sim"
+SSH_PASSWORD = "sim"
+BOOT_COMMANDS = {"COLD_BOOT", "WARM_BOOT", "S4", "REBOOT", "RESTART", "WAKE_UP"}  # what the boot plugins send
+SLEEP_COMMANDS = {"S4_SLEEP"}
+
+
+def _import_paramiko():
+    try:
+        import paramiko
+    except ImportError:
+        raise RuntimeError("paramiko is required for the simulated SSH hosts (pip install paramiko)")
+    return paramiko
+
+
+# ---------------------- simulated SSH hosts ----------------------
+def command_output(host, command):
+    """(stdout, stderr, exit status) of one command on a simulated Windows/Linux host."""
+    if command.startswith("shutdown /r"):
+        return "", "", 0
+    if command == "echo %OS%":
+        return "Windows_NT\r\n", "", 0
+    if "Total Physical Memory" in command:
+        return f"Total Physical Memory:     {host['memory_mb']:,} MB\r\n", "", 0
+    if command.startswith("cat /proc/cpuinfo"):
+        return "".join(
+            f"processor\t: {i}\nvendor_id\t: GenuineIntel\nmodel name\t: {host['cpu']}\ncpu cores\t: {host['cores']}\n\n"
+            for i in range(host["cores"])
+        ), "", 0
+    if command.startswith("systeminfo"):
+        return (
+            f"Host Name:                 {host['name']}\r\n"
+            f"OS Name:                   Microsoft Windows 11 Pro\r\n"
+            f"System Manufacturer:       Simulated\r\n"
+            f"Processor(s):              1 Processor(s) Installed.\r\n"
+            f"                           [01]: {host['cpu']}\r\n"
+            f"Total Physical Memory:     {host['memory_mb']:,} MB\r\n"
+        ), "", 0
+    if command.startswith("tasklist"):
+        rows = [("System Idle Process", 0, 8), ("System", 4, 144), ("svchost.exe", 1020, 24560),
+                ("explorer.exe", 4312, 98304), ("python.exe", 7780, 40960)]
+        return (
+            "Image Name                     PID Session Name        Session#    Mem Usage\r\n"
+            "========================= ======== ================ =========== ============\r\n"
+            + "".join(f"{name:<25} {pid:>8} Services                   0 {mem:>9,} K\r\n" for name, pid, mem in rows)
+        ), "", 0
+    if command.startswith("wmic logicaldisk"):
+        return (
+            "Caption  FreeSpace     Size\r\n"
+            f"C:       {host['disk_free']:<13} {host['disk_size']}\r\n"
+        ), "", 0
+    return "", f"'{command.split()[0]}' is not recognized as an internal or external command\r\n", 1
+
+
+class SimulatedSSHHost:
+    """One virtual SSH host: address, machine description, and reboot state."""
+
+    def __init__(self, index, ip, port, rng):
+        self.index = index
+        self.ip = ip
+        self.port = port
+        self.down_until = 0.0
+        self.machine = {
+            "name": f"SIM-HOST-{index:04d}",
+            "cpu": rng.choice(["Intel(R) Xeon(R) Gold 6338 CPU @ 2.00GHz", "AMD EPYC 7763 64-Core Processor",
+                               "Intel(R) Core(TM) i7-12700 CPU @ 2.10GHz"]),
+            "cores": rng.choice([4, 8, 16]),
+            "memory_mb": rng.choice([16384, 32768, 65536]),
+            "disk_size": 512110190592,
+            "disk_free": rng.randrange(10**10, 4 * 10**11),
+        }
+
+    def is_down(self):
+        return time.time() < self.down_until
+
+
+class SSHFleet:
+    """
+    Many SimulatedSSHHosts served by one selector thread (accepts) plus
+    paramiko's own thread per connection.
+    """
+
+    def __init__(self, count, port=2222, latency=0.05, reboot_downtime=30.0, failure_rate=0.0,
+                 connect_failure_rate=0.0, seed=0):
+        self.paramiko = _import_paramiko()
+        self.rng = random.Random(seed)
+        self.latency = latency
+        self.reboot_downtime = reboot_downtime
+        self.failure_rate = failure_rate
+        self.connect_failure_rate = connect_failure_rate
+        # 127.0.1.1, 127.0.1.2, ... (skip .0 and .255 in every /24)
+        self.hosts = [
+            SimulatedSSHHost(i, f"127.0.{1 + i // 254}.{1 + i % 254}", port, self.rng) for i in range(count)
+        ]
+        self.host_key = self.paramiko.RSAKey.generate(2048)
+        self.selector = selectors.DefaultSelector()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"connections": 0, "refused": 0, "commands": 0, "failed": 0, "reboots": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def start(self):
+        for host in self.hosts:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((host.ip, host.port))
+            sock.listen(64)
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ, host)
+        self._thread = threading.Thread(target=self._accept_loop, name="ssh-fleet", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for key in list(self.selector.get_map().values()):
+            key.fileobj.close()
+        self.selector.close()
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            for key, _ in self.selector.select(timeout=0.5):
+                try:
+                    conn, _ = key.fileobj.accept()
+                except BlockingIOError:
+                    continue
+                host = key.data
+                if host.is_down() or self.rng.random() < self.connect_failure_rate:
+                    self._count("refused")
+                    conn.close()
+                    continue
+                self._count("connections")
+                conn.setblocking(True)
+                threading.Thread(target=self._serve, args=(conn, host), daemon=True).start()
+
+    def _serve(self, conn, host):
+        paramiko = self.paramiko
+        fleet = self
+
+        class Server(paramiko.ServerInterface):
+            def get_allowed_auths(self, username):
+                return "password,publickey"
+
+            def check_auth_password(self, username, password):
+                ok = username == SSH_USERNAME and password == SSH_PASSWORD
+                return paramiko.AUTH_SUCCESSFUL if ok else paramiko.AUTH_FAILED
+
+            def check_auth_publickey(self, username, key):
+                return paramiko.AUTH_SUCCESSFUL if username == SSH_USERNAME else paramiko.AUTH_FAILED
+
+            def check_channel_request(self, kind, chanid):
+                if kind == "session":
+                    return paramiko.OPEN_SUCCEEDED
+                return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+            def check_channel_exec_request(self, channel, command):
+                command = command.decode("utf-8", errors="replace")
+                threading.Thread(target=fleet._run_command, args=(channel, host, command), daemon=True).start()
+                return True
+
+        transport = paramiko.Transport(conn)
+        transport.add_server_key(self.host_key)
+        try:
+            transport.start_server(server=Server())
+            while transport.is_active() and not self._stop.is_set():
+                transport.accept(timeout=1)  # exec requests are handled in check_channel_exec_request
+        except (paramiko.SSHException, EOFError, OSError):
+            pass
+        finally:
+            transport.close()
+
+    def _run_command(self, channel, host, command):
+        if command.startswith("powershell ") and "-EncodedCommand" in command:
+            self._run_batch(channel, host, command)
+            return
+        self._count("commands")
+        time.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+        if self.rng.random() < self.failure_rate:
+            self._count("failed")
+            stdout, stderr, status = "", "Simulated failure\r\n", 1
+        else:
+            stdout, stderr, status = command_output(host.machine, command)
+        try:
+            if stdout:
+                channel.sendall(stdout.encode("utf-8"))
+            if stderr:
+                channel.sendall_stderr(stderr.encode("utf-8"))
+            channel.send_exit_status(status)
+        finally:
+            channel.close()
+        if command.startswith("shutdown /r") and status == 0:
+            self._count("reboots")
+            host.down_until = time.time() + self.reboot_downtime
+
+    def _run_batch(self, channel, host, command):
+        """Emulate an _ssh_batch script: every iteration here, one line streamed back per iteration."""
+        job = read_header(base64.b64decode(command.split()[-1]).decode("utf-16-le"))
+        try:
+            if job is None:
+                channel.sendall_stderr(b"Simulated hosts only run _ssh_batch scripts\r\n")
+                channel.send_exit_status(1)
+                return
+            first = None
+            for i in range(1, job["iterations"] + 1):
+                self._count("commands")
+                seconds = self.latency * self.rng.uniform(0.5, 1.5)
+                time.sleep(seconds)
+                if self.rng.random() < self.failure_rate:
+                    self._count("failed")
+                    stdout, stderr, status = "", "Simulated failure", 1
+                else:
+                    stdout, stderr, status = command_output(host.machine, job["command"])
+                stdout = stdout.strip()
+                digest = output_hash(stdout)
+                first = first or digest
+                shipped = stdout if i == 1 or (job["ship"] and digest != first) else None
+                line = marker_line(i, status, seconds * 1000, digest, shipped, stderr.strip() or None)
+                channel.sendall((line + "\r\n").encode("utf-8"))
+                if stderr:
+                    break
+                if i < job["iterations"]:
+                    time.sleep(job["delay"])
+            channel.send_exit_status(0)
+        finally:
+            channel.close()
+
+
+# ---------------------- simulated serial consoles ----------------------
+class SerialConsole:
+    """One pty-backed console; clients open `link` (or `path`) like a COM port."""
+
+    def __init__(self, dut, link):
+        self.dut = dut
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # no echo or newline translation, like a UART
+        self.path = os.ttyname(self.slave)
+        self.link = link
+        if os.path.lexists(link):
+            os.remove(link)
+        os.symlink(self.path, link)
+        self.buffer = b""
+        self.booting = False
+
+    def close(self):
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        if os.path.lexists(self.link):
+            os.remove(self.link)
+
+
+class SerialFleet:
+    """
+    Many SerialConsoles driven by one selector thread. Boot output is scheduled
+    on a timer heap in the same thread, so hundreds of consoles need no extra threads.
+    """
+
+    def __init__(self, count, link_dir, latency=0.05, boot_time=2.0, failure_rate=0.0, seed=0):
+        self.rng = random.Random(seed)
+        self.latency = latency
+        self.boot_time = boot_time
+        self.failure_rate = failure_rate
+        self.consoles = [
+            SerialConsole(SIM_DUT_BASE + 1 + i, os.path.abspath(os.path.join(link_dir, f"ttySIM{SIM_DUT_BASE + 1 + i}")))
+            for i in range(count)
+        ]
+        self.selector = selectors.DefaultSelector()
+        self._timers = []  # heap of (due, sequence, console, bytes)
+        self._sequence = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"commands": 0, "boots": 0, "failed": 0}
+
+    def start(self):
+        for console in self.consoles:
+            self.selector.register(console.master, selectors.EVENT_READ, console)
+        self._thread = threading.Thread(target=self._loop, name="serial-fleet", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.selector.close()
+        for console in self.consoles:
+            console.close()
+
+    def _later(self, delay, console, text):
+        self._sequence += 1
+        data = None if text is None else text.encode("utf-8")
+        heapq.heappush(self._timers, (time.time() + delay, self._sequence, console, data))
+
+    def _command(self, console, line):
+        self.stats["commands"] += 1
+        command = line.strip().upper()
+        if not command:
+            return
+        if command not in BOOT_COMMANDS and command not in SLEEP_COMMANDS:
+            self._later(self.latency, console, f"ERR unknown command {command}\r\n")
+            return
+        if console.booting:
+            self._later(self.latency, console, "ERR busy\r\n")
+            return
+        if command in SLEEP_COMMANDS:
+            self._later(self.latency, console, f"{command} accepted, DUT {console.dut} entering S4\r\n")
+            return
+        self.stats["boots"] += 1
+        console.booting = True
+        boot_time = self.boot_time * self.rng.uniform(0.8, 1.2)
+        self._later(self.latency, console, f"{command} accepted, DUT {console.dut} going down\r\n")
+        self._later(boot_time * 0.3, console, "BIOS POST ... OK\r\n")
+        if self.rng.random() < self.failure_rate:
+            self.stats["failed"] += 1
+            self._later(boot_time, console, "Kernel panic - not syncing: simulated failure\r\n")
+        else:
+            self._later(boot_time, console, f"sim-dut-{console.dut} login: \r\n")
+        self._later(boot_time, console, None)  # marks the end of the boot
+
+    def _loop(self):
+        while not self._stop.is_set():
+            timeout = 0.5
+            if self._timers:
+                timeout = max(0.0, min(timeout, self._timers[0][0] - time.time()))
+            for key, _ in self.selector.select(timeout=timeout):
+                console = key.data
+                try:
+                    data = os.read(console.master, 4096)
+                except OSError:
+                    continue
+                console.buffer += data
+                while b"\n" in console.buffer or b"\r" in console.buffer:
+                    cut = min(i for i in (console.buffer.find(b"\n"), console.buffer.find(b"\r")) if i >= 0)
+                    line, console.buffer = console.buffer[:cut], console.buffer[cut + 1:]
+                    self._command(console, line.decode("ascii", errors="replace"))
+            now = time.time()
+            while self._timers and self._timers[0][0] <= now:
+                _, _, console, data = heapq.heappop(self._timers)
+                if data is None:
+                    console.booting = False
+                    continue
+                try:
+                    os.write(console.master, data)
+                except OSError:
+                    pass
+
+
+# ---------------------- fleet files ----------------------
+def fleet_inventory(serial_fleet, hardware_types):
+    """mock_hardware_detection-style DUT list for the serial consoles."""
+    return [
+        {
+            "DUT": console.dut,
+            "hardware_type": hardware_types[i % len(hardware_types)],
+            "serial": f"SIM{console.dut:06d}",
+            "com_port": console.link,
+            "mac_address": "02:00:00:{:02X}:{:02X}:{:02X}".format(
+                (console.dut >> 16) & 0xFF, (console.dut >> 8) & 0xFF, console.dut & 0xFF),
+        }
+        for i, console in enumerate(serial_fleet.consoles)
+    ]
+
+
+def fleet_jobs(inventory, ssh_fleet, iterations=1):
+    """One job spec per virtual DUT / SSH host, in the cli.py submit format."""
+    remote_tests = ["cpuinformation", "systeminformation", "memoryinformation",
+                    "diskinformation", "activeprocessinformation"]
+    # The boot jobs drive the pty consoles through the plugins' serial engine (needs pyserial)
+    serial_parameters = {"expect": "login:", "fail_on": "Kernel panic", "boot_timeout": 20}
+    jobs = [
+        {"test": "cold_boot", "dut": h["DUT"], "iterations": iterations, "delay": 0,
+         "parameters": dict(serial_parameters, ports=h["com_port"])}
+        for h in inventory
+    ]
+    for i, host in enumerate(ssh_fleet.hosts if ssh_fleet else []):
+        jobs.append({
+            "test": remote_tests[i % len(remote_tests)], "ip": host.ip, "username": SSH_USERNAME,
+            "password": SSH_PASSWORD, "port": host.port, "iterations": iterations, "delay": 0,
+        })
+    return jobs
+
+
+def write_json(path, data):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def register_duts(db_path, inventory_path):
+    """Add DUTStatus rows for the virtual DUTs (init_db syncs them from STF_HARDWARE_FILE)."""
+    os.environ[HARDWARE_FILE_ENV] = inventory_path
+    from database import init_db
+    init_db(db_path).close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulated SSH hosts and serial DUTs for load testing")
+    parser.add_argument("--ssh-hosts", type=int, default=50)
+    parser.add_argument("--serial-duts", type=int, default=50)
+    parser.add_argument("--port", type=int, default=2222, help="SSH port of every host (22 needs root)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before a command answers")
+    parser.add_argument("--reboot-downtime", type=float, default=30, help="Seconds a restarted host is unreachable")
+    parser.add_argument("--boot-time", type=float, default=2, help="Seconds a serial DUT takes to boot")
+    parser.add_argument("--failure-rate", type=float, default=0.02, help="Share of commands/boots that fail")
+    parser.add_argument("--connect-failure-rate", type=float, default=0.0, help="Share of SSH connections dropped")
+    parser.add_argument("--hardware-types", default="Dgx,woa", help="Assigned round-robin to the serial DUTs")
+    parser.add_argument("--dir", default="sim_fleet", help="Directory for the tty links and fleet files")
+    parser.add_argument("--db", default="framework.db", help="Database that gets DUTStatus rows for the fleet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "openpty"):
+        parser.error("The simulator needs ptys (Linux or macOS)")
+    os.makedirs(args.dir, exist_ok=True)
+
+    ssh_fleet = serial_fleet = None
+    try:
+        if args.ssh_hosts:
+            ssh_fleet = SSHFleet(args.ssh_hosts, args.port, args.latency, args.reboot_downtime,
+                                 args.failure_rate, args.connect_failure_rate, args.seed).start()
+        serial_fleet = SerialFleet(args.serial_duts, args.dir, args.latency, args.boot_time,
+                                   args.failure_rate, args.seed).start()
+
+        inventory = fleet_inventory(serial_fleet, [t.strip() for t in args.hardware_types.split(",") if t.strip()])
+        inventory_path = os.path.abspath(os.path.join(args.dir, "inventory.json"))
+        jobs_path = os.path.join(args.dir, "jobs.json")
+        write_json(inventory_path, inventory)
+        write_json(jobs_path, fleet_jobs(inventory, ssh_fleet))
+        if inventory:
+            register_duts(args.db, inventory_path)
+
+        print(f"{len(ssh_fleet.hosts) if ssh_fleet else 0} SSH hosts on 127.0.x.y:{args.port} "
+              f"(user {SSH_USERNAME!r}, password {SSH_PASSWORD!r}), {len(inventory)} serial DUTs in {args.dir}/")
+        print(f"Run jobs against them with:\n"
+              f"  {HARDWARE_FILE_ENV}={inventory_path} python -m src.standalone.cli --db {args.db} submit {jobs_path}")
+        print("Ctrl+C to stop")
+        while True:
+            time.sleep(10)
+            parts = []
+            if ssh_fleet:
+                parts.append("ssh " + ", ".join(f"{k} {v}" for k, v in ssh_fleet.stats.items()))
+            parts.append("serial " + ", ".join(f"{k} {v}" for k, v in serial_fleet.stats.items()))
+            print(" | ".join(parts))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if ssh_fleet:
+            ssh_fleet.stop()
+        if serial_fleet:
+            serial_fleet.stop()
+
+
+if __name__ == "__main__":
+    main()
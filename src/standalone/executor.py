@@ -3,21 +3,202 @@
 
 import sqlite3
 import json
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from database import externalize_metrics, store_metric_blobs
+from hardware import mock_hardware_detection
+from metrics_exporter import observe_db_write, observe_job
+from plugin_registry import estimate_duration, find_plugin
 from test_runner import run_test_in_cmd
 
 
+def reserve_job_ids(conn, count=1):
+    """
+    Atomically reserve `count` consecutive job ids in one round-trip and return
+    them as a range. The counter is bumped with a single UPDATE ... RETURNING,
+    so concurrent submitters (UI, CLI, service) can never get the same id.
+    The caller commits (the write lock is held until then).
+    """
+    if count < 1:
+        return range(0)
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        row = conn.execute(
+            "UPDATE JobIDCounter SET next_job_id = next_job_id + ? WHERE counter_id = 1 RETURNING next_job_id",
+            (count,),
+        ).fetchone()
+    else:
+        # No RETURNING: the UPDATE takes the write lock first, so the SELECT still sees our own bump
+        conn.execute("UPDATE JobIDCounter SET next_job_id = next_job_id + ? WHERE counter_id = 1", (count,))
+        row = conn.execute("SELECT next_job_id FROM JobIDCounter WHERE counter_id = 1").fetchone()
+    end = row[0]
+    return range(end - count, end)
+
+
 def get_next_job_id(conn):
-    cursor = conn.execute("SELECT next_job_id FROM JobIDCounter WHERE counter_id = 1")
-    job_id = cursor.fetchone()[0]
+    return reserve_job_ids(conn, 1)[0]
+
+
+LOG_INSERT_SQL = """INSERT INTO Logs
+    (job_id, dut, hardware_type, serial, com_port, mac_address,
+        test_name, parameters, outcome, metrics, ip, username, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+ITERATION_INSERT_SQL = """INSERT OR REPLACE INTO IterationResults
+    (job_id, iteration, outcome, metrics, timestamp, shard, details) VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+
+def iteration_rows(job_id, result):
+    """IterationResults rows (ITERATION_INSERT_SQL) for the iterations a v2 plugin streamed."""
+    return [
+        (job_id, record["iteration"], record["outcome"], json.dumps(record.get("metrics", {})),
+         record.get("timestamp"), record.get("shard"),
+         json.dumps(record["details"]) if record.get("details") else None)
+        for record in result.get("iterations") or []
+    ]
+
+
+def log_row(job, result, dut=None):
+    """
+    Build the Logs row for a finished job (parameters for LOG_INSERT_SQL) and
+    the metric blobs it references: returns (row, blobs), see externalize_metrics.
+    The timestamp is taken now, in the same UTC format as datetime('now'),
+    so rows written later by a ResultWriter keep their completion time.
+    """
+    parameters = job.get("parameters") or {}
+    metrics, blobs = externalize_metrics(result.get("metrics", {}))
+    row = (
+        job.get("job_id"),
+        job.get("dut") if dut is None else dut,
+        job.get("hardware_type"),
+        job.get("serial"),
+        job.get("com_port"),
+        job.get("mac_address"),
+        job.get("test_name"),
+        json.dumps(parameters),
+        result.get("outcome"),
+        json.dumps(metrics),
+        parameters.get("ip"),
+        parameters.get("username"),
+        time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+    )
+    return row, blobs
+
+
+def log_job_result(conn, job, result, dut=None, writer=None):
+    """
+    Insert one finished job into Logs, and its streamed iterations into
+    IterationResults (caller commits).
+    `dut` overrides job["dut"], e.g. -1 for external (auto-detected) devices.
+    With a ResultWriter the rows are handed to it instead and committed in its next batch.
+    The job's duration and queue wait are recorded for the metrics exporter.
+    """
+    observe_job(job, result)
+    row, blobs = log_row(job, result, dut=dut)
+    iterations = iteration_rows(job.get("job_id"), result)
+    if writer is not None:
+        writer.write(row, blobs, iterations)
+    else:
+        store_metric_blobs(conn, blobs)
+        conn.execute(LOG_INSERT_SQL, row)
+        if iterations:
+            conn.executemany(ITERATION_INSERT_SQL, iterations)
+
+
+def begin_immediate(conn):
+    """
+    Start a write transaction right away so a read-modify-write of a DUT queue
+    cannot interleave with another connection (UI, CLI, service workers).
+    """
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+
+
+def job_estimate(job):
+    """Expected run time of a queued job in seconds (plugin expected_duration x iterations), or None."""
+    plugin = find_plugin(job.get("test_name"))
+    return None if plugin is None else estimate_duration(plugin, job.get("iterations", 1))
+
+
+def _by_estimate(job_queue, longest=False):
+    # Jobs without an estimate go last; ties keep queue order. One registry lookup per distinct test/iterations.
+    cache = {}
+    estimates = [
+        cache[key] if key in cache else cache.setdefault(key, job_estimate(job))
+        for job, key in ((job, (job.get("test_name"), job.get("iterations", 1))) for job in job_queue)
+    ]
+    known = [i for i, e in enumerate(estimates) if e is not None]
+    if not known:
+        return 0
+    return min(known, key=lambda i: (-estimates[i] if longest else estimates[i], i))
+
+
+# Order in which a DUT queue is worked through: policy -> index of the next job.
+# queue_simulator.py compares them on recorded or synthetic workloads.
+QUEUE_POLICIES = {
+    "fifo": lambda job_queue: 0,
+    "shortest": _by_estimate,
+    "longest": lambda job_queue: _by_estimate(job_queue, longest=True),
+}
+
+
+def pop_next_job(conn, dut, policy="fifo"):
+    """
+    Atomically take the next job off a DUT queue (chosen by QUEUE_POLICIES[policy])
+    and mark the DUT Busy. When the queue is empty the DUT is marked Free and None is returned.
+    """
+    begin_immediate(conn)
+    row = conn.execute("SELECT job_queue FROM DUTStatus WHERE dut = ?", (dut,)).fetchone()
+    if row is None:
+        # Row disappeared or was removed
+        conn.commit()
+        return None
+
+    job_queue = json.loads(row[0] or "[]")
+    if not job_queue:
+        conn.execute("UPDATE DUTStatus SET status = ? WHERE dut = ?", ("Free", dut))
+        conn.commit()
+        return None
+
+    job = job_queue.pop(QUEUE_POLICIES[policy](job_queue))
+    # The DUT is Busy while a dequeued job runs (jobs may be queued on a Free DUT by enqueue_job)
     conn.execute(
-        "UPDATE JobIDCounter SET next_job_id = ? WHERE counter_id = 1", (job_id + 1,)
+        "UPDATE DUTStatus SET status = ?, job_queue = ? WHERE dut = ?",
+        ("Busy", json.dumps(job_queue), dut),
     )
-    return job_id
+    conn.commit()
+    return job
 
 
-def process_jobs(conn, dut, hardware_type, serial, com_port, mac_address):
+def run_and_log_job(conn, job, dut=None, writer=None):
     """
-    Process queued jobs for a given DUT. If DUT row is missing, simply return.
+    Run one job in the test runner, log it to Logs and return its result.
+    Without a writer the row is inserted and committed here (one fsync per job).
+    """
+    try:
+        result = run_test_in_cmd(job)
+    except Exception as e:
+        # Ensure we always log something
+        result = {"outcome": "Fail", "metrics": {"error": str(e)}}
+
+    if writer is None:
+        started = time.perf_counter()
+        log_job_result(conn, job, result, dut=dut)
+        conn.commit()
+        observe_db_write(time.perf_counter() - started, 1, "per-job")
+    else:
+        log_job_result(conn, job, result, dut=dut, writer=writer)
+    return result
+
+
+def process_jobs(conn, dut, hardware_type, serial, com_port, mac_address, writer=None, policy="fifo"):
+    """
+    Process queued jobs for a given DUT, in QUEUE_POLICIES[policy] order. If DUT row is missing, simply return.
+    Pass a ResultWriter to batch the Logs inserts of several drains into group commits.
     """
     cursor = conn.execute("SELECT job_queue FROM DUTStatus WHERE dut = ?", (dut,))
     row = cursor.fetchone()
@@ -31,82 +212,41 @@ def process_jobs(conn, dut, hardware_type, serial, com_port, mac_address):
         }
 
     while True:
-        cursor = conn.execute("SELECT job_queue FROM DUTStatus WHERE dut = ?", (dut,))
-        row = cursor.fetchone()
-        if row is None:
-            # Row disappeared or was removed; stop processing
+        job = pop_next_job(conn, dut, policy)
+        if job is None:
             break
-
-        job_queue = json.loads(row[0])
-
-        if not job_queue:
-            conn.execute(
-                "UPDATE DUTStatus SET status = ? WHERE dut = ?", ("Free", dut)
-            )
-            conn.commit()
-            break
-
-        job = job_queue.pop(0)
-        conn.execute(
-            "UPDATE DUTStatus SET job_queue = ? WHERE dut = ?",
-            (json.dumps(job_queue), dut),
-        )
-        conn.commit()
-
-        try:
-            result = run_test_in_cmd(job)
-        except Exception as e:
-            # Ensure we always log something
-            result = {"outcome": "Fail", "metrics": {"error": str(e)}}
-
-        conn.execute(
-            "INSERT INTO Logs (job_id, dut, hardware_type, serial, com_port, mac_address, test_name, parameters, outcome, metrics, ip, username, timestamp) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))",
-            (
-                job_id,
-                dut_db,
-                hardware_type,
-                serial,
-                com_port,
-                mac_address,
-                test_name,
-                json.dumps(parameters),
-                result.get("outcome"),
-                json.dumps(result.get("metrics", {})),
-                parameters.get("ip"),
-                parameters.get("username"),
-            ),
-        )
-
-        conn.commit()
+        run_and_log_job(conn, job, dut=dut, writer=writer)
 
     return {"outcome": "ProcessedQueue", "metrics": {}, "queued": False}
 
 
 def submit_job(
-    conn, dut, hardware_type, serial, com_port, mac_address, test_name, iterations, parameters
+    conn, dut, hardware_type, serial, com_port, mac_address, test_name, iterations, parameters,
+    shards=1, job_id=None,
 ):
     """
     Submit a job. If DUT exists in DUTStatus, respect queueing and Busy/Free.
     If DUT doesn't exist (e.g. an auto-detected network device), run immediately
     and log result without attempting to modify DUTStatus.
+    With shards > 1 the iterations are split across Free DUTs of the same
+    hardware_type and merged into one parent job (see submit_sharded_job).
+    Pass a job_id already reserved with reserve_job_ids to use it for this job.
     Always return a dict describing the job result or queued state.
     """
 
     if parameters is None:
         parameters = {}
 
-    import streamlit as st
     # Detect manual vs auto-detect
     cursor = conn.execute("SELECT 1 FROM DUTStatus WHERE dut = ?", (dut,))
     row = cursor.fetchone()
     manual_mode = row is not None
 
     if not manual_mode:
-        # Auto-detect mode → enforce SSH details
-        parameters["ip"] = parameters.get("ip") or st.session_state.get("auto_detected_device")
-        parameters["username"] = parameters.get("username") or st.session_state.get("auto_detect_username")
-        parameters["password"] = parameters.get("password") or st.session_state.get("auto_detect_password")
+        # Auto-detect mode → enforce SSH details (callers pass them in parameters)
+        parameters["ip"] = parameters.get("ip")
+        parameters["username"] = parameters.get("username")
+        parameters["password"] = parameters.get("password")
 
         if not parameters["ip"] or not parameters["username"]:
             return {
@@ -123,8 +263,16 @@ def submit_job(
         parameters["username"] = None
         parameters["password"] = None
 
+    if manual_mode and shards > 1:
+        sharded = submit_sharded_job(
+            conn, dut, hardware_type, serial, com_port, mac_address,
+            test_name, iterations, parameters, shards, job_id=job_id,
+        )
+        if sharded is not None:
+            return sharded
 
-    job_id = get_next_job_id(conn)
+    if job_id is None:
+        job_id = get_next_job_id(conn)
     job = {
         "job_id": job_id,
         "dut": dut,
@@ -155,26 +303,7 @@ def submit_job(
             result = {"outcome": "Fail", "metrics": {"error": str(e)}}
 
         try:
-            conn.execute(
-                """INSERT INTO Logs
-                (job_id, dut, hardware_type, serial, com_port, mac_address,
-                    test_name, parameters, outcome, metrics, ip, username, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
-                (
-                    job_id,
-                    dut_db,
-                    hardware_type,
-                    serial,
-                    com_port,
-                    mac_address,
-                    test_name,
-                    json.dumps(parameters),
-                    result.get("outcome"),
-                    json.dumps(result.get("metrics", {})),
-                    parameters.get("ip"),
-                    parameters.get("username"),
-                ),
-            )
+            log_job_result(conn, job, result, dut=dut_db)
             conn.commit()
         except Exception:
             return {
@@ -205,26 +334,7 @@ def submit_job(
             except Exception as e:
                 result = {"outcome": "Fail", "metrics": {"error": str(e)}}
 
-            conn.execute(
-                """INSERT INTO Logs
-                (job_id, dut, hardware_type, serial, com_port, mac_address,
-                    test_name, parameters, outcome, metrics, ip, username, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
-                (
-                    job_id,
-                    dut,
-                    hardware_type,
-                    serial,
-                    com_port,
-                    mac_address,
-                    test_name,
-                    json.dumps(parameters),
-                    result.get("outcome"),
-                    json.dumps(result.get("metrics", {})),
-                    parameters.get("ip"),
-                    parameters.get("username"),
-                ),
-            )
+            log_job_result(conn, job, result)
             conn.commit()
 
             process_jobs(conn, dut, hardware_type, serial, com_port, mac_address)
@@ -236,6 +346,7 @@ def submit_job(
             }
         else:
             # Add to queue
+            job["queued_at"] = time.time()
             job_queue.append(job)
             conn.execute(
                 "UPDATE DUTStatus SET job_queue = ? WHERE dut = ?",
@@ -249,3 +360,474 @@ def submit_job(
                 "queued": True,
             }
 
+
+
+def enqueue_job(
+    conn, dut, hardware_type, serial, com_port, mac_address, test_name, iterations, parameters, job_id=None
+):
+    """
+    Append a job to a managed DUT's queue without running anything, even if the
+    DUT is Free. The job runs when the queue is next drained (process_jobs).
+    Batch submitters pass ids reserved up front with reserve_job_ids.
+    Returns the same dict shape as a queued submit_job.
+    """
+    begin_immediate(conn)
+    row = conn.execute("SELECT job_queue FROM DUTStatus WHERE dut = ?", (dut,)).fetchone()
+    if row is None:
+        conn.commit()
+        return {
+            "job_id": None,
+            "outcome": "Fail",
+            "metrics": {"error": f"DUT {dut} is not a managed DUT"},
+            "queued": False,
+        }
+
+    parameters = dict(parameters or {})
+    parameters["ip"] = None
+    parameters["username"] = None
+    parameters["password"] = None
+
+    if job_id is None:
+        job_id = get_next_job_id(conn)
+    job_queue = json.loads(row[0] or "[]")
+    job_queue.append({
+        "job_id": job_id,
+        "dut": dut,
+        "hardware_type": hardware_type,
+        "serial": serial,
+        "com_port": com_port,
+        "mac_address": mac_address,
+        "test_name": test_name,
+        "iterations": iterations,
+        "parameters": parameters,
+        "queued_at": time.time(),
+    })
+    conn.execute("UPDATE DUTStatus SET job_queue = ? WHERE dut = ?", (json.dumps(job_queue), dut))
+    conn.commit()
+    return {"job_id": job_id, "outcome": "queued", "metrics": {}, "queued": True}
+
+
+def cancel_queued_job(conn, job_id):
+    """
+    Remove a job from whichever DUT queue holds it.
+    Returns the DUT id it was removed from, or None if it was not queued.
+    """
+    begin_immediate(conn)
+    for dut, job_queue_json in conn.execute("SELECT dut, job_queue FROM DUTStatus").fetchall():
+        job_queue = json.loads(job_queue_json or "[]")
+        remaining = [job for job in job_queue if job.get("job_id") != job_id]
+        if len(remaining) != len(job_queue):
+            conn.execute("UPDATE DUTStatus SET job_queue = ? WHERE dut = ?", (json.dumps(remaining), dut))
+            conn.commit()
+            return dut
+    conn.commit()
+    return None
+
+
+def resolve_job_target(conn, spec):
+    """
+    Return the hardware dict a job spec targets, or None for a remote (SSH) job.
+    Specs name one target: "dut", "hardware_type" (least-loaded DUT of the pool) or "ip".
+    """
+    if spec.get("ip"):
+        return None
+    if spec.get("dut") is not None:
+        for h in mock_hardware_detection():
+            if h["DUT"] == int(spec["dut"]):
+                return h
+        raise ValueError(f"Unknown DUT {spec['dut']}")
+    if spec.get("hardware_type"):
+        h = select_pool_dut(conn, spec["hardware_type"])
+        if h is None:
+            raise ValueError(f"No managed DUT of type {spec['hardware_type']}")
+        return h
+    raise ValueError(f"Job spec needs one of dut, hardware_type or ip: {spec}")
+
+
+def job_spec_parameters(spec):
+    """Build job parameters (iterations, delay, SSH details) from a job spec."""
+    parameters = dict(spec.get("parameters") or {})
+    parameters["iterations"] = int(spec.get("iterations", parameters.get("iterations", 10)))
+    parameters["delay"] = int(spec.get("delay", parameters.get("delay", 5)))
+    for key in ("ip", "username", "password", "key_file", "port", "fail_fast", "profile"):
+        if spec.get(key):
+            parameters[key] = spec[key]
+    return parameters
+
+
+def get_pool_load(conn, hardware_type):
+    """
+    Return [(hardware, status, queue_length), ...] for every managed DUT of the
+    given hardware_type. DUTs without a DUTStatus row are left out of the pool.
+    """
+    pool = []
+    for h in mock_hardware_detection():
+        if h["hardware_type"] != hardware_type:
+            continue
+        row = conn.execute(
+            "SELECT status, job_queue FROM DUTStatus WHERE dut = ?", (h["DUT"],)
+        ).fetchone()
+        if row is None:
+            continue
+        status, job_queue_json = row
+        pool.append((h, status, len(json.loads(job_queue_json or "[]"))))
+    return pool
+
+
+def pool_load(entry):
+    """Sort key of a get_pool_load entry: queued jobs plus the running one, then the DUT id."""
+    h, status, queue_length = entry
+    busy = 0 if status == "Free" else 1
+    return (queue_length + busy, h["DUT"])
+
+
+def select_pool_dut(conn, hardware_type):
+    """
+    Pick the least-loaded DUT of the requested hardware_type.
+    A Free DUT with an empty queue always wins; otherwise the DUT with the
+    shortest queue is chosen (a Busy DUT counts its running job as load).
+    Ties go to the lowest DUT id so dispatch is deterministic.
+    """
+    pool = get_pool_load(conn, hardware_type)
+    if not pool:
+        return None
+    return min(pool, key=pool_load)[0]
+
+
+def submit_pool_job(conn, hardware_type, test_name, iterations, parameters, shards=1, job_id=None):
+    """
+    Submit a job to any DUT of the given hardware_type instead of a fixed DUT id.
+    The job is routed to the least-loaded DUT (see select_pool_dut) and then
+    follows the normal submit_job queueing rules on that DUT.
+    """
+    hardware = select_pool_dut(conn, hardware_type)
+    if hardware is None:
+        return {
+            "job_id": None,
+            "dut": None,
+            "outcome": "Fail",
+            "metrics": {"error": f"No managed DUT of type {hardware_type}"},
+            "queued": False,
+        }
+
+    result = submit_job(
+        conn, hardware["DUT"], hardware["hardware_type"], hardware["serial"],
+        hardware["com_port"], hardware["mac_address"], test_name, iterations, parameters,
+        shards=shards, job_id=job_id,
+    )
+    result["dut"] = hardware["DUT"]
+    return result
+
+
+def run_jobs_parallel(jobs, max_workers=None):
+    """
+    Run several jobs at the same time, one worker thread per job, and return
+    their results in the same order. Each job runs in its own subprocess
+    (run_test_in_cmd), so threads only wait on I/O. No DB access happens here.
+    """
+    def run_one(job):
+        try:
+            return run_test_in_cmd(job)
+        except Exception as e:
+            return {"outcome": "Fail", "metrics": {"error": str(e)}}
+
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or len(jobs)) as pool:
+        return list(pool.map(run_one, jobs))
+
+
+def split_iterations(iterations, shards):
+    """Split an iteration count into `shards` near-equal positive parts."""
+    shards = max(1, min(shards, iterations))
+    base, extra = divmod(iterations, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def merge_shard_results(shard_jobs, shard_results):
+    """
+    Merge shard outcomes into one parent result: Pass only if every shard passed.
+    Per-shard outcome/metrics are kept under metrics["shards"]; runtime is the
+    slowest shard since the shards ran side by side. Streamed iterations are
+    renumbered 1..N across the shards, in shard order, and keep their shard
+    number in record["shard"] (not in metrics, which IterationMetrics ingests).
+    """
+    shard_summaries, iterations = [], []
+    for job, result in zip(shard_jobs, shard_results):
+        for record in result.get("iterations") or []:
+            iterations.append(dict(record, iteration=len(iterations) + 1, shard=len(shard_summaries) + 1))
+        shard_summaries.append({
+            "job_id": job["job_id"],
+            "dut": job["dut"],
+            "iterations": job["iterations"],
+            "outcome": result.get("outcome"),
+            "metrics": result.get("metrics", {}),
+        })
+
+    outcome = "Pass" if all(r.get("outcome") == "Pass" for r in shard_results) else "Fail"
+    runtimes = [
+        r.get("metrics", {}).get("runtime") for r in shard_results
+        if isinstance(r.get("metrics", {}).get("runtime"), (int, float))
+    ]
+    metrics = {
+        "shard_count": len(shard_jobs),
+        "passed_shards": sum(1 for r in shard_results if r.get("outcome") == "Pass"),
+        "shards": shard_summaries,
+    }
+    if runtimes:
+        metrics["runtime"] = max(runtimes)
+    return {"outcome": outcome, "metrics": metrics, "iterations": iterations}
+
+
+def submit_sharded_job(
+    conn, dut, hardware_type, serial, com_port, mac_address, test_name, iterations, parameters, shards,
+    job_id=None,
+):
+    """
+    Split `iterations` across up to `shards` Free DUTs of the same hardware_type
+    (the requested DUT first when it is Free), run the shards in parallel and
+    log a single parent row in Logs with the merged outcome and metrics.
+    Shard jobs get their own job ids (and job_<id>.txt logs) but no Logs rows,
+    so dashboards and the AI agent count one submission once.
+    Returns None when fewer than two DUTs are Free, so the caller falls back to
+    the normal single-DUT submission.
+    """
+    # Pick and reserve every target DUT and all job ids (parent + shards) in one
+    # write transaction, so a concurrent submitter cannot take the same Free DUT
+    begin_immediate(conn)
+    free = [
+        h for h, status, queue_length in get_pool_load(conn, hardware_type)
+        if status == "Free" and queue_length == 0
+    ]
+    free.sort(key=lambda h: (h["DUT"] != dut, h["DUT"]))
+    targets = free[:max(1, min(shards, iterations))]
+    if len(targets) < 2:
+        conn.commit()
+        return None
+
+    for h in targets:
+        conn.execute("UPDATE DUTStatus SET status = ? WHERE dut = ?", ("Busy", h["DUT"]))
+    shard_ids = reserve_job_ids(conn, len(targets))
+    parent_job_id = job_id if job_id is not None else get_next_job_id(conn)
+    conn.commit()
+
+    shard_jobs = []
+    for index, (h, shard_iterations) in enumerate(zip(targets, split_iterations(iterations, len(targets)))):
+        shard_parameters = dict(parameters)
+        shard_parameters.update({
+            "iterations": shard_iterations,
+            "parent_job_id": parent_job_id,
+            "shard": index + 1,
+        })
+        shard_jobs.append({
+            "job_id": shard_ids[index],
+            "dut": h["DUT"],
+            "hardware_type": h["hardware_type"],
+            "serial": h["serial"],
+            "com_port": h["com_port"],
+            "mac_address": h["mac_address"],
+            "test_name": test_name,
+            "iterations": shard_iterations,
+            "parameters": shard_parameters,
+        })
+
+    shard_results = run_jobs_parallel(shard_jobs)
+    result = merge_shard_results(shard_jobs, shard_results)
+
+    parent_parameters = dict(parameters)
+    parent_parameters["shards"] = [job["job_id"] for job in shard_jobs]
+    # Logged against the first shard's DUT: the requested one only when it took part
+    lead = targets[0]
+    parent_job = {
+        "job_id": parent_job_id,
+        "dut": lead["DUT"],
+        "hardware_type": lead["hardware_type"],
+        "serial": lead["serial"],
+        "com_port": lead["com_port"],
+        "mac_address": lead["mac_address"],
+        "test_name": test_name,
+        "iterations": iterations,
+        "parameters": parent_parameters,
+        "started_at": min((job["started_at"] for job in shard_jobs if "started_at" in job), default=None),
+    }
+    log_job_result(conn, parent_job, result)
+    conn.commit()
+
+    # Release the shard DUTs (and run anything that queued up meanwhile)
+    for h in targets:
+        process_jobs(conn, h["DUT"], h["hardware_type"], h["serial"], h["com_port"], h["mac_address"])
+
+    return {
+        "job_id": parent_job_id,
+        "outcome": result["outcome"],
+        "metrics": result["metrics"],
+        "queued": False,
+    }
+
+
+# Action space shared by parameter sweeps and the QLearningAgent (ai_model imports it
+# from here, so sweeps and the benchmark do not need numpy)
+ITERATIONS_OPTIONS = [5, 8, 10, 15]
+DELAY_OPTIONS = [3, 4, 5, 6]
+
+
+def expand_sweep(pairs=None, iterations_options=None, delay_options=None):
+    """
+    Return the (iterations, delay) pairs of a sweep: either the explicit `pairs`
+    list, or the full grid of iterations_options x delay_options. Missing option
+    lists default to the QLearningAgent action space.
+    """
+    if pairs:
+        return [(int(i), int(d)) for i, d in pairs]
+
+    iterations_options = iterations_options or ITERATIONS_OPTIONS
+    delay_options = delay_options or DELAY_OPTIONS
+    return [(int(i), int(d)) for i in iterations_options for d in delay_options]
+
+
+def run_jobs_on_duts(conn, jobs, duts, writer=None):
+    """
+    Run `jobs` across the given DUTs (hardware dicts): one worker thread per DUT
+    pulls the next pending job, so every DUT stays busy until the list is empty
+    and each DUT still runs one job at a time. Job DUT fields are filled in by
+    the worker that picks the job up. Results are logged to Logs from this
+    thread as they arrive. Returns [(job, result), ...] in completion order.
+    """
+    pending = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+    finished = queue.Queue()
+
+    def lane(hardware):
+        while True:
+            try:
+                job = pending.get_nowait()
+            except queue.Empty:
+                return
+            job.update({
+                "dut": hardware["DUT"],
+                "hardware_type": hardware["hardware_type"],
+                "serial": hardware["serial"],
+                "com_port": hardware["com_port"],
+                "mac_address": hardware["mac_address"],
+            })
+            try:
+                result = run_test_in_cmd(job)
+            except Exception as e:
+                result = {"outcome": "Fail", "metrics": {"error": str(e)}}
+            finished.put((job, result))
+
+    workers = [threading.Thread(target=lane, args=(h,), daemon=True) for h in duts]
+    for w in workers:
+        w.start()
+
+    completed = []
+    while len(completed) < len(jobs):
+        job, result = finished.get()
+        log_job_result(conn, job, result, writer=writer)
+        if writer is None:
+            conn.commit()
+        completed.append((job, result))
+
+    for w in workers:
+        w.join()
+    return completed
+
+
+def submit_sweep(
+    conn, hardware_type, test_name, parameters=None, pairs=None,
+    iterations_options=None, delay_options=None,
+):
+    """
+    Submit a parameter sweep: one child job per (iterations, delay) pair, all
+    tagged with a shared parameters["sweep_id"]. Children run in parallel across
+    every Free DUT of the hardware_type (sequentially per DUT). When no DUT of
+    that type is Free, the children are queued on the least-loaded DUTs instead.
+    """
+    parameters = dict(parameters or {})
+    parameters["ip"] = None
+    parameters["username"] = None
+    parameters["password"] = None
+
+    sweep_id = uuid.uuid4().hex[:12]
+    sweep_pairs = expand_sweep(pairs, iterations_options, delay_options)
+
+    # Pick and reserve the Free DUTs and the child job ids in one write transaction,
+    # like submit_sharded_job. A pool with no DUTs takes no ids.
+    begin_immediate(conn)
+    pool = get_pool_load(conn, hardware_type)
+    if not pool:
+        conn.commit()
+        return {
+            "job_id": None,
+            "sweep_id": sweep_id,
+            "outcome": "Fail",
+            "metrics": {"error": f"No managed DUT of type {hardware_type}"},
+            "queued": False,
+        }
+    free = [h for h, status, queue_length in pool if status == "Free" and queue_length == 0]
+    for h in free:
+        conn.execute("UPDATE DUTStatus SET status = ? WHERE dut = ?", ("Busy", h["DUT"]))
+    job_ids = reserve_job_ids(conn, len(sweep_pairs))
+    conn.commit()
+
+    jobs = []
+    for job_id, (iterations, delay) in zip(job_ids, sweep_pairs):
+        child_parameters = dict(parameters)
+        child_parameters.update({"iterations": iterations, "delay": delay, "sweep_id": sweep_id})
+        jobs.append({
+            "job_id": job_id,
+            "test_name": test_name,
+            "iterations": iterations,
+            "parameters": child_parameters,
+        })
+
+    if not free:
+        # Everything is busy: spread the children over the DUT queues, least loaded first.
+        # enqueue_job appends each one under the write lock.
+        for job in jobs:
+            h = select_pool_dut(conn, hardware_type)
+            enqueue_job(
+                conn, h["DUT"], h["hardware_type"], h["serial"], h["com_port"], h["mac_address"],
+                test_name, job["iterations"], job["parameters"], job_id=job["job_id"],
+            )
+        return {
+            "job_id": None,
+            "sweep_id": sweep_id,
+            "job_ids": [job["job_id"] for job in jobs],
+            "outcome": "queued",
+            "metrics": {},
+            "queued": True,
+        }
+
+    completed = run_jobs_on_duts(conn, jobs, free)
+
+    # Release the DUTs (and run anything that queued up meanwhile)
+    for h in free:
+        process_jobs(conn, h["DUT"], h["hardware_type"], h["serial"], h["com_port"], h["mac_address"])
+
+    results = sorted(
+        (
+            {
+                "job_id": job["job_id"],
+                "dut": job["dut"],
+                "iterations": job["parameters"]["iterations"],
+                "delay": job["parameters"]["delay"],
+                "outcome": result.get("outcome"),
+            }
+            for job, result in completed
+        ),
+        key=lambda r: r["job_id"],
+    )
+    return {
+        "job_id": None,
+        "sweep_id": sweep_id,
+        "job_ids": [r["job_id"] for r in results],
+        "outcome": "Completed",
+        "metrics": {
+            "jobs": len(results),
+            "passed": sum(1 for r in results if r["outcome"] == "Pass"),
+            "results": results,
+        },
+        "queued": False,
+    }
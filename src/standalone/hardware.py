@@ -1,12 +1,44 @@
 # Copyright (c) 2025 Varun Kumar BS.
 # This file contains proprietary code and/or utilities for development purposes.
 
+import json
+import os
 import subprocess
 import platform
 import re
 
+# Path of a JSON list of DUTs (same keys as below) that replaces the static list,
+# e.g. the virtual fleet written by dut_simulator.py. Re-read when the file changes.
+HARDWARE_FILE_ENV = "STF_HARDWARE_FILE"
+_inventory_cache = {}  # path -> (mtime_ns, [DUT dicts])
+
+
+def load_inventory(path):
+    """DUTs listed in an inventory file (fresh dicts on every call, like the static list)."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _inventory_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = _inventory_cache[path] = (mtime_ns, json.load(f))
+    return [dict(h) for h in cached[1]]
+
+
+def inventory_signature():
+    """Changes whenever mock_hardware_detection() may return a different list."""
+    path = os.environ.get(HARDWARE_FILE_ENV)
+    if not path:
+        return None
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except OSError:
+        return path, None
+
+
 def mock_hardware_detection():
-    """Static list of known DUTs (fallback)."""
+    """Static list of known DUTs (fallback), or the inventory file named by STF_HARDWARE_FILE."""
+    path = os.environ.get(HARDWARE_FILE_ENV)
+    if path:
+        return load_inventory(path)
     return [
         {"DUT": 1, "hardware_type": "Dgx", "serial": "123456", "com_port": "COM3", "mac_address": "00:1A:2B:3C:4D:5E"},
         {"DUT": 2, "hardware_type": "woa", "serial": "123457", "com_port": "COM4", "mac_address": "00:1A:2B:3C:4D:5F"},
@@ -0,0 +1,259 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/metrics_exporter.py
+# Prometheus metrics (text exposition format 0.0.4) for queue depth, DUT state,
+# job latency, runner utilization and database write latency.
+#   * The job service serves them at GET /metrics (histograms included: they are
+#     collected in the process that runs the jobs).
+#   * Standalone, from the repository root, for the database-backed gauges only:
+#         python -m src.standalone.metrics_exporter --port 9600
+#         python -m src.standalone.metrics_exporter --textfile /var/lib/node_exporter/stf.prom
+#     (--textfile rewrites the file every --interval seconds, for node_exporter's
+#     textfile collector).
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hardware import mock_hardware_detection
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; jobs range from sub-second dummy plugins to multi-minute reboots
+LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+DB_WRITE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def _value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Cumulative Prometheus histogram, one series per label set (thread-safe)."""
+
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            labels = dict(zip(self.label_names, key))
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_labels(dict(labels, le=_value(bound)))} {count}")
+            lines.append(f"{self.name}_bucket{_labels(dict(labels, le='+Inf'))} {values[-1]}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_value(round(values[-2], 6))}")
+            lines.append(f"{self.name}_count{_labels(labels)} {values[-1]}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter, one series per label set (thread-safe)."""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = dict(self._series)
+        for key, value in sorted(series.items()):
+            lines.append(f"{self.name}{_labels(dict(zip(self.label_names, key)))} {_value(value)}")
+        return lines
+
+
+# ---------------------- process-wide instruments ----------------------
+JOB_DURATION = Histogram(
+    "stf_job_duration_seconds", "Wall time of finished jobs, from start to result.",
+    LATENCY_BUCKETS, ("test_name", "outcome"),
+)
+JOB_WAIT = Histogram(
+    "stf_job_wait_seconds", "Time finished jobs spent queued before they started.",
+    LATENCY_BUCKETS, ("test_name",),
+)
+JOBS_FINISHED = Counter("stf_jobs_finished_total", "Jobs finished in this process.", ("outcome",))
+DB_WRITE = Histogram(
+    "stf_db_write_seconds", "Duration of Logs write transactions (one job, or one ResultWriter batch).",
+    DB_WRITE_BUCKETS, ("mode",),
+)
+DB_ROWS_WRITTEN = Counter("stf_db_rows_written_total", "Logs rows committed in this process.", ("mode",))
+INSTRUMENTS = [JOB_DURATION, JOB_WAIT, JOBS_FINISHED, DB_WRITE, DB_ROWS_WRITTEN]
+
+
+def observe_job(job, result, finished_at=None):
+    """Record a finished job's duration (from job["started_at"]) and queue wait (from job["queued_at"])."""
+    finished_at = finished_at or time.time()
+    outcome = result.get("outcome") or "Unknown"
+    JOBS_FINISHED.inc(outcome=outcome)
+    started_at = job.get("started_at")
+    if started_at is None:
+        return
+    JOB_DURATION.observe(max(0.0, finished_at - started_at), test_name=job.get("test_name"), outcome=outcome)
+    if job.get("queued_at") is not None:
+        JOB_WAIT.observe(max(0.0, started_at - job["queued_at"]), test_name=job.get("test_name"))
+
+
+def observe_db_write(seconds, rows, mode):
+    """Record one Logs write transaction; mode is "per-job" or "batch" (ResultWriter)."""
+    DB_WRITE.observe(seconds, mode=mode)
+    DB_ROWS_WRITTEN.inc(rows, mode=mode)
+
+
+# ---------------------- exposition ----------------------
+def _gauge(name, help_text, samples):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{_labels(labels)} {_value(value)}" for labels, value in samples]
+    return lines
+
+
+def database_metrics(conn):
+    """Per-DUT queue depth and Busy/Free state from DUTStatus (one small query)."""
+    hardware = {h["DUT"]: h["hardware_type"] for h in mock_hardware_detection()}
+    depth, state = [], []
+    for dut, status, job_queue in conn.execute("SELECT dut, status, job_queue FROM DUTStatus ORDER BY dut"):
+        labels = {"dut": dut, "hardware_type": hardware.get(dut, "unknown")}
+        depth.append((labels, len(json.loads(job_queue or "[]"))))
+        for name in ("Busy", "Free"):
+            state.append((dict(labels, state=name), 1 if status == name else 0))
+    return (
+        _gauge("stf_dut_queue_depth", "Jobs waiting in each DUT queue.", depth)
+        + _gauge("stf_dut_state", "1 for the DUT's current state (Busy or Free).", state)
+        + _gauge("stf_queued_jobs", "Jobs waiting in all DUT queues.", [({}, sum(v for _, v in depth))])
+    )
+
+
+def scheduler_metrics(scheduler):
+    """Runner pool utilization and buffered results of a JobScheduler."""
+    running = scheduler.running_jobs().values()
+    writer_stats = scheduler.writer.stats()
+    dut_capacity = len(mock_hardware_detection())
+    busy = {
+        "dut": sum(1 for job in running if job.get("dut") != "auto"),
+        "remote": sum(1 for job in running if job.get("dut") == "auto"),
+    }
+    capacity = {"dut": dut_capacity, "remote": scheduler.remote_workers}
+    return (
+        _gauge("stf_runner_busy", "Jobs executing, per runner pool.", [({"pool": p}, n) for p, n in busy.items()])
+        + _gauge("stf_runner_capacity", "Jobs that can execute at once, per runner pool.",
+                 [({"pool": p}, n) for p, n in capacity.items()])
+        + _gauge("stf_runner_utilization", "Busy / capacity, per runner pool.",
+                 [({"pool": p}, busy[p] / capacity[p] if capacity[p] else 0) for p in busy])
+        + _gauge("stf_remote_queue_depth", "Remote (SSH) jobs waiting for a worker.",
+                 [({}, len(scheduler.pending_remote_jobs()))])
+        + _gauge("stf_result_writer_buffered", "Finished jobs buffered in the result writer, not committed yet.",
+                 [({}, writer_stats["buffered"])])
+        + _gauge("stf_result_writer_failed", "Finished jobs whose Logs row the result writer could not commit.",
+                 [({}, writer_stats["failed"])])
+    )
+
+
+def render_metrics(conn, scheduler=None):
+    """The full exposition text: database gauges, scheduler gauges (if any) and this process's instruments."""
+    lines = database_metrics(conn)
+    if scheduler is not None:
+        lines += scheduler_metrics(scheduler)
+    for instrument in INSTRUMENTS:
+        lines += instrument.render()
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path, conn, scheduler=None):
+    """Write the metrics for node_exporter's textfile collector (write-then-rename, never half-written)."""
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(render_metrics(conn, scheduler))
+    os.replace(path + ".tmp", path)
+
+
+def make_handler(db_path, scheduler=None):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            conn = sqlite3.connect(db_path, timeout=30)
+            try:
+                body = render_metrics(conn, scheduler).encode("utf-8")
+            finally:
+                conn.close()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return MetricsHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prometheus metrics for the SmartTestFramework database")
+    parser.add_argument("--db", default="framework.db")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9600)
+    parser.add_argument("--textfile", help="Write metrics to this file instead of serving HTTP")
+    parser.add_argument("--interval", type=float, default=15, help="Seconds between --textfile updates")
+    args = parser.parse_args(argv)
+
+    if args.textfile:
+        print(f"Writing metrics to {args.textfile} every {args.interval:g}s")
+        while True:
+            conn = sqlite3.connect(args.db, timeout=30)
+            try:
+                write_textfile(args.textfile, conn)
+            finally:
+                conn.close()
+            time.sleep(args.interval)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.db))
+    print(f"Serving metrics on http://{args.host}:{args.port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/parquet_export.py
+# Incremental, columnar export of job history for offline analytics.
+# Run from the repository root (needs pyarrow: pip install pyarrow):
+#     python -m src.standalone.cli export-parquet exports/logs
+# Output is one Parquet file per chunk, partitioned by day (hive style):
+#     exports/logs/date=2025-06-01/part-00001201-00001450.parquet
+#     exports/logs/_export_state.json        last exported log_id + column types
+# The database is opened read-only, so exports never block the app or workers.
+import datetime
+import json
+import os
+import sqlite3
+from archive import attach_archives
+from database import is_blob_ref
+
+EXPORT_CHUNK_SIZE = 20000
+STATE_FILE = "_export_state.json"
+
+# Logs columns exported as-is (parameters/metrics are also kept as raw JSON)
+BASE_COLUMNS = [
+    ("log_id", "int64"), ("job_id", "int64"), ("dut", "int64"),
+    ("hardware_type", "string"), ("serial", "string"), ("com_port", "string"), ("mac_address", "string"),
+    ("ip", "string"), ("username", "string"), ("test_name", "string"), ("outcome", "string"),
+    ("timestamp", "timestamp"), ("parameters", "string"), ("metrics", "string"),
+]
+
+# Parameter keys whose values are never exported: a key containing any of
+# these (case-insensitive, at any depth) is written as REDACTED instead
+SENSITIVE_KEYS = ("password", "passwd", "secret", "token", "api_key", "private_key", "credential")
+REDACTED = "***"
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("pyarrow is required for Parquet export (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+def load_state(out_dir):
+    path = os.path.join(out_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {"last_log_id": 0, "columns": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(out_dir, state):
+    # Write-then-rename so an interrupted export never leaves a half-written state file
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def redact(data):
+    """A copy of `data` with the values of SENSITIVE_KEYS replaced by REDACTED."""
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if value is not None and any(s in str(key).lower() for s in SENSITIVE_KEYS)
+            else redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(value) for value in data]
+    return data
+
+
+def value_type(value):
+    """Column type for one flattened value: bool, double, string, or json (nested)."""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "double"
+    if isinstance(value, str):
+        return "string"
+    return "json"
+
+
+def flatten(prefix, data, columns):
+    """
+    Flatten a parameters/metrics dict into {prefix + key: value}. A key's type is
+    fixed the first time it is seen (recorded in `columns`) so every file of the
+    export has the same schema; values of another type become null (the raw
+    JSON column still has them). Blob references export as their sha256 string.
+    """
+    flat = {}
+    if not isinstance(data, dict):
+        return flat
+    for key, value in data.items():
+        if value is None:
+            continue
+        name = f"{prefix}{key}"
+        if is_blob_ref(value):
+            name, value = f"{name}_blob", value["$blob"]
+        kind = columns.setdefault(name, value_type(value))
+        if kind == "json":
+            flat[name] = json.dumps(value)
+        elif kind == value_type(value):
+            flat[name] = float(value) if kind == "double" else value
+    return flat
+
+
+def _arrow_type(pa, kind):
+    return {
+        "int64": pa.int64(), "double": pa.float64(), "bool": pa.bool_(),
+        "string": pa.string(), "json": pa.string(), "timestamp": pa.timestamp("s"),
+    }[kind]
+
+
+def _schema(pa, columns):
+    return pa.schema(
+        [(name, _arrow_type(pa, kind)) for name, kind in BASE_COLUMNS]
+        + [(name, _arrow_type(pa, kind)) for name, kind in sorted(columns.items())]
+    )
+
+
+def _parse_timestamp(ts):
+    try:
+        return datetime.datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+
+def open_readonly(db_path):
+    return sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+
+
+def export_parquet(db_path, out_dir, chunk_size=EXPORT_CHUNK_SIZE, include_archives=True):
+    """
+    Export Logs rows with log_id greater than the last exported one. Each chunk
+    of `chunk_size` rows is split by day and written as Parquet files; the
+    state file is updated after every chunk, so an interrupted export resumes
+    where it stopped. Returns {"rows", "files", "last_log_id"}.
+    """
+    pa, pq = _import_pyarrow()
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(out_dir)
+    columns = state["columns"]
+
+    conn = open_readonly(db_path)
+    try:
+        table = "Logs"
+        if include_archives:
+            attach_archives(conn, db_path)
+            table = "LogsAll"
+        names = [name for name, _ in BASE_COLUMNS]
+        query = f"SELECT {', '.join(names)} FROM {table} WHERE log_id > ? ORDER BY log_id LIMIT ?"
+
+        exported, files = 0, 0
+        while True:
+            rows = conn.execute(query, (state["last_log_id"], chunk_size)).fetchall()
+            if not rows:
+                break
+
+            partitions = {}
+            for row in rows:
+                record = dict(zip(names, row))
+                record["timestamp"] = _parse_timestamp(record["timestamp"])
+                parameters = redact(json.loads(record["parameters"] or "{}"))
+                record["parameters"] = json.dumps(parameters)
+                record.update(flatten("param_", parameters, columns))
+                record.update(flatten("metric_", json.loads(record["metrics"] or "{}"), columns))
+                day = record["timestamp"].strftime("%Y-%m-%d") if record["timestamp"] else "unknown"
+                partitions.setdefault(day, []).append(record)
+
+            schema = _schema(pa, columns)
+            for day, records in partitions.items():
+                arrays = [pa.array([r.get(field.name) for r in records], type=field.type) for field in schema]
+                part_dir = os.path.join(out_dir, f"date={day}")
+                os.makedirs(part_dir, exist_ok=True)
+                name = f"part-{records[0]['log_id']:08d}-{records[-1]['log_id']:08d}.parquet"
+                pq.write_table(pa.Table.from_arrays(arrays, schema=schema), os.path.join(part_dir, name))
+                files += 1
+
+            exported += len(rows)
+            state["last_log_id"] = rows[-1][0]
+            save_state(out_dir, state)
+    finally:
+        conn.close()
+
+    return {"rows": exported, "files": files, "last_log_id": state["last_log_id"]}
+
+
+def export_schema(out_dir):
+    """The full schema of an export (columns added by later chunks included)."""
+    pa, _ = _import_pyarrow()
+    return _schema(pa, load_state(out_dir)["columns"])
+
+
+def read_export(out_dir, columns=None, filter=None):
+    """
+    Read an export back as one pyarrow Table. Files written before a column
+    first appeared get nulls for it. `filter` is a pyarrow.dataset expression,
+    e.g. pyarrow.dataset.field("date") >= "2025-06-01" to prune partitions.
+    """
+    pa, _ = _import_pyarrow()
+    import pyarrow.dataset as ds
+    schema = export_schema(out_dir).append(pa.field("date", pa.string()))
+    dataset = ds.dataset(out_dir, format="parquet", partitioning="hive", schema=schema,
+                         exclude_invalid_files=True)
+    return dataset.to_table(columns=columns, filter=filter)
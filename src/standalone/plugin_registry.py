@@ -0,0 +1,166 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/plugin_registry.py
+# Test plugin discovery shared by the UI, the test runner and test plans.
+# Plugins are the .py files in src/plugins/tests (managed DUTs) and
+# src/plugins/auto_detect_tests (remote devices over SSH); files starting with
+# "_" are helper modules, not plugins. A plugin may declare its metadata as a
+# literal dict, read with ast (the plugin is never imported here):
+#     PLUGIN_META = {
+#         "name": "Cold Boot",                 # display name, plugin["title"] (default: file name)
+#         "target": "dut",                     # "dut" or "remote" (default: from the folder)
+#         "description": "...",
+#         "parameters": {"iterations": {"type": "int", "default": 1, "min": 1}, ...},
+#         "expected_duration": 0.5,            # seconds per iteration
+#         "timeout": 30,                       # seconds per iteration before the job is killed
+#         "timeout_parameter": "boot_timeout", # optional: per-iteration timeout grows by this parameter
+#     }
+# plugin["streaming"] tells whether run_test is a (v2) generator that yields one
+# record per iteration; see test_runner.RUNNER_BODY.
+# Each folder is scanned once and rescanned only when its mtime changes
+# (a plugin is added, removed or renamed, or saved by an editor that replaces the file).
+import ast
+import os
+import threading
+
+# Search order when a name exists in both folders (remote first, as the runner always did)
+PLUGIN_FOLDERS = [("remote", "auto_detect_tests"), ("dut", "tests")]
+TARGETS = {"dut", "remote"}
+
+_cache = {}  # directory -> (mtime_ns, {name: plugin})
+_cache_lock = threading.Lock()
+
+
+def plugin_dirs(root=None):
+    """[(default target, directory)] in search order. `root` defaults to the working directory."""
+    base = os.path.join(root or os.getcwd(), "src", "plugins")
+    return [(target, os.path.join(base, folder)) for target, folder in PLUGIN_FOLDERS]
+
+
+def _parse_plugin(path):
+    """(PLUGIN_META or {}, whether run_test yields)."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    meta, streaming = {}, False
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "PLUGIN_META" for t in node.targets
+        ):
+            meta = ast.literal_eval(node.value)
+            if not isinstance(meta, dict):
+                raise ValueError("PLUGIN_META must be a dict")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "run_test":
+            streaming = any(isinstance(n, (ast.Yield, ast.YieldFrom)) for n in ast.walk(node))
+    return meta, streaming
+
+
+def read_plugin(path, target):
+    """Metadata of one plugin file, with defaults for everything it does not declare."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    plugin = {
+        "name": name,
+        "title": name,
+        "target": target,
+        "path": path,
+        "description": "",
+        "parameters": {},
+        "expected_duration": None,
+        "timeout": None,
+        "timeout_parameter": None,
+        "streaming": False,
+        "error": None,
+    }
+    try:
+        meta, plugin["streaming"] = _parse_plugin(path)
+    except (OSError, SyntaxError, ValueError) as e:
+        plugin["error"] = f"Invalid PLUGIN_META: {e}"
+        return plugin
+    if meta.get("target", target) not in TARGETS:
+        plugin["error"] = f"Unknown target {meta['target']!r}"
+        return plugin
+    plugin["title"] = meta.get("name", name)
+    for key in ("target", "description", "parameters", "expected_duration", "timeout", "timeout_parameter"):
+        if key in meta:
+            plugin[key] = meta[key]
+    return plugin
+
+
+def scan_directory(directory, target):
+    """{name: plugin} for one folder, from the cache unless the folder changed."""
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    with _cache_lock:
+        cached = _cache.get(directory)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    plugins = {}
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if entry.name.endswith(".py") and not entry.name.startswith("_") and entry.is_file():
+            plugin = read_plugin(entry.path, target)
+            plugins[plugin["name"]] = plugin
+    with _cache_lock:
+        _cache[directory] = (mtime_ns, plugins)
+    return plugins
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def list_plugins(target=None, root=None):
+    """All plugins (optionally only one target), sorted by name. Returned dicts are copies."""
+    plugins = {}
+    for default_target, directory in reversed(plugin_dirs(root)):
+        plugins.update(scan_directory(directory, default_target))
+    return [dict(p) for _, p in sorted(plugins.items()) if target is None or p["target"] == target]
+
+
+def plugin_names(target=None, root=None):
+    return [p["name"] for p in list_plugins(target, root)]
+
+
+def find_plugin(name, root=None):
+    """The plugin called `name` (searched in PLUGIN_FOLDERS order), or None."""
+    for target, directory in plugin_dirs(root):
+        plugin = scan_directory(directory, target).get(name)
+        if plugin is not None:
+            return dict(plugin)
+    return None
+
+
+def is_remote_test(name, root=None):
+    """Remote (SSH) tests run against a network device, not a managed DUT."""
+    plugin = find_plugin(name, root)
+    return plugin is not None and plugin["target"] == "remote"
+
+
+def parameter_defaults(plugin):
+    """{parameter: default} for the parameters the plugin declares a default for."""
+    return {
+        key: spec["default"]
+        for key, spec in (plugin.get("parameters") or {}).items()
+        if isinstance(spec, dict) and "default" in spec
+    }
+
+
+def estimate_duration(plugin, iterations):
+    """Expected run time in seconds, or None if the plugin does not declare one."""
+    if plugin.get("expected_duration") is None:
+        return None
+    return plugin["expected_duration"] * max(1, int(iterations))
+
+
+def job_timeout(plugin, iterations, parameters=None):
+    """Seconds after which the runner kills the test, or None for no limit."""
+    if not plugin.get("timeout"):
+        return None
+    per_iteration = plugin["timeout"]
+    if plugin.get("timeout_parameter"):
+        name = plugin["timeout_parameter"]
+        per_iteration += float((parameters or {}).get(name, parameter_defaults(plugin).get(name, 0)))
+    return per_iteration * max(1, int(iterations))
@@ -0,0 +1,259 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/queue_simulator.py
+# Discrete-event simulation of the DUT queues, for comparing queue policies
+# (executor.QUEUE_POLICIES) and routing before changing the real dispatch.
+# Run from the repository root:
+#     python src/standalone/queue_simulator.py --db framework.db                     replay Logs
+#     python src/standalone/queue_simulator.py --db framework.db --synthetic --days 14 --rate 40
+# Jobs are ordered by the real executor.QUEUE_POLICIES and routed by the
+# select_pool_dut load rule (executor.pool_load), on in-memory DUT queues; only
+# the test runs are simulated, on a virtual clock. Keeping the queues out of
+# SQLite keeps a run linear in the number of jobs for fifo (shortest/longest
+# rescan the waiting queue per pick, like pop_next_job does).
+# Test durations come from Logs (metrics.phases, recorded since the runner
+# started timing its phases), else from the plugin's expected_duration.
+import argparse
+import calendar
+import heapq
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from executor import QUEUE_POLICIES, pool_load
+from hardware import mock_hardware_detection
+from plugin_registry import estimate_duration, find_plugin
+
+DEFAULT_ITERATION_SECONDS = 60  # for tests with neither history nor expected_duration
+ROUTINGS = ["recorded", "pool"]
+
+
+def _epoch(timestamp):
+    return calendar.timegm(time.strptime(timestamp, "%Y-%m-%d %H:%M:%S"))
+
+
+def _percentile(sorted_values, p):
+    # Nearest-rank, like database.iteration_metric_percentiles
+    if not sorted_values:
+        return None
+    return round(sorted_values[max(0, -(-p * len(sorted_values) // 100) - 1)], 2)
+
+
+# ---------------------- workload ----------------------
+def load_history(db_path, since=None):
+    """[{"dut", "hardware_type", "test_name", "iterations", "finished", "seconds"}] of managed DUT jobs in Logs."""
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(f"""
+            SELECT dut, hardware_type, test_name, timestamp,
+                   json_extract(parameters, '$.iterations'), json_extract(metrics, '$.phases.total')
+            FROM Logs
+            WHERE dut >= 0 AND timestamp IS NOT NULL{'' if since is None else ' AND timestamp >= ?'}
+            ORDER BY timestamp
+        """, () if since is None else (since,)).fetchall()
+    finally:
+        conn.close()
+    return [
+        {"dut": dut, "hardware_type": hardware_type, "test_name": test_name,
+         "iterations": int(iterations or 1), "finished": _epoch(ts),
+         "seconds": None if total_ms is None else total_ms / 1000}
+        for dut, hardware_type, test_name, ts, iterations, total_ms in rows
+    ]
+
+
+class DurationModel:
+    """Samples job run times: measured seconds per iteration of the same test, else the plugin's estimate."""
+
+    def __init__(self, history, seed=0):
+        self.rng = random.Random(seed)
+        self.per_iteration = {}
+        for row in history:
+            if row["seconds"] is not None:
+                self.per_iteration.setdefault(row["test_name"], []).append(row["seconds"] / row["iterations"])
+        self._plugins = {}
+
+    def sample(self, test_name, iterations):
+        samples = self.per_iteration.get(test_name)
+        if samples:
+            return self.rng.choice(samples) * iterations
+        if test_name not in self._plugins:
+            self._plugins[test_name] = find_plugin(test_name)
+        plugin = self._plugins[test_name]
+        estimate = estimate_duration(plugin, iterations) if plugin else None
+        return estimate if estimate is not None else DEFAULT_ITERATION_SECONDS * iterations
+
+
+def replay_workload(history, durations, load_factor=1.0):
+    """
+    Jobs arriving as recorded (a job arrives its run time before it finished),
+    with inter-arrival gaps divided by load_factor to simulate more load.
+    """
+    jobs = []
+    for row in history:
+        seconds = row["seconds"] if row["seconds"] is not None else durations.sample(row["test_name"], row["iterations"])
+        jobs.append(dict(row, seconds=seconds, arrival=row["finished"] - seconds))
+    if not jobs:
+        return []
+    jobs.sort(key=lambda j: j["arrival"])
+    start = jobs[0]["arrival"]
+    for i, job in enumerate(jobs):
+        job["arrival"] = (job["arrival"] - start) / load_factor
+        job["id"] = i
+    return jobs
+
+
+def synthetic_workload(history, durations, days, rate, seed=0):
+    """Poisson arrivals of `rate` jobs/hour for `days` days, with the test/DUT/iterations mix of history."""
+    rng = random.Random(seed)
+    mix = history or [
+        {"dut": h["DUT"], "hardware_type": h["hardware_type"], "test_name": name, "iterations": 5}
+        for h in mock_hardware_detection() for name in ("cold_boot", "warm_boot")
+    ]
+    jobs, clock, horizon = [], 0.0, days * 86400
+    while True:
+        clock += rng.expovariate(rate / 3600)
+        if clock >= horizon:
+            return jobs
+        row = rng.choice(mix)
+        jobs.append({
+            "id": len(jobs), "dut": row["dut"], "hardware_type": row["hardware_type"],
+            "test_name": row["test_name"], "iterations": row["iterations"], "arrival": clock,
+            "seconds": durations.sample(row["test_name"], row["iterations"]),
+        })
+
+
+# ---------------------- simulation ----------------------
+def simulate(jobs, policy="fifo", routing="recorded"):
+    """
+    Run the workload through the real queue policy with a virtual clock.
+    routing "recorded" sends each job to the DUT it ran on; "pool" picks the
+    least-loaded DUT of its hardware type, as select_pool_dut does.
+    Returns the per-policy report dict.
+    """
+    hardware = {h["DUT"]: h for h in mock_hardware_detection()}
+    pools = {}
+    for h in hardware.values():
+        pools.setdefault(h["hardware_type"], []).append(h)
+    pick = QUEUE_POLICIES[policy]
+    events = [(job["arrival"], 0, job["id"], job) for job in jobs]  # (time, kind 0=arrive 1=finish, tiebreak, job)
+    heapq.heapify(events)
+    queues = {dut: [] for dut in hardware}
+    running, waits = {}, []
+    busy = {dut: 0.0 for dut in hardware}
+    dropped = finished = 0
+    clock = 0.0
+    wall_started = time.perf_counter()
+
+    def start_next(dut, now):
+        queue = queues[dut]
+        if not queue:
+            running.pop(dut, None)
+            return
+        job = queue.pop(pick(queue))
+        waits.append(now - job["arrival"])
+        running[dut] = job
+        busy[dut] += job["seconds"]
+        heapq.heappush(events, (now + job["seconds"], 1, job["id"], dict(job, ran_on=dut)))
+
+    while events:
+        clock, kind, _, job = heapq.heappop(events)
+        if kind == 1:
+            finished += 1
+            start_next(job["ran_on"], clock)
+            continue
+
+        if routing == "pool":
+            pool = [(h, "Busy" if h["DUT"] in running else "Free", len(queues[h["DUT"]]))
+                    for h in pools.get(job["hardware_type"], [])]
+            h = min(pool, key=pool_load)[0] if pool else None
+        else:
+            h = hardware.get(job["dut"])
+        if h is None:
+            dropped += 1  # DUT (or hardware type) not in the current inventory
+            continue
+        queues[h["DUT"]].append(job)
+        if h["DUT"] not in running:
+            start_next(h["DUT"], clock)
+
+    waits.sort()
+    span = clock - (jobs[0]["arrival"] if jobs else 0)
+    return {
+        "policy": policy,
+        "routing": routing,
+        "jobs": finished,
+        "dropped": dropped,
+        "simulated_hours": round(span / 3600, 2),
+        "wall_seconds": round(time.perf_counter() - wall_started, 2),
+        "throughput_per_hour": round(finished / (span / 3600), 2) if span else None,
+        "wait_mean_s": round(sum(waits) / len(waits), 2) if waits else None,
+        "wait_p50_s": _percentile(waits, 50),
+        "wait_p95_s": _percentile(waits, 95),
+        "wait_p99_s": _percentile(waits, 99),
+        "wait_max_s": round(waits[-1], 2) if waits else None,
+        "utilization": {dut: round(seconds / span, 4) if span else 0.0 for dut, seconds in busy.items()},
+    }
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def print_reports(reports):
+    print(f"{'policy':<10} {'routing':<9} {'jobs':>7} {'jobs/h':>8} {'wait p50':>10} {'p95':>10} "
+          f"{'p99':>10} {'mean util':>9}")
+    for r in reports:
+        util = r["utilization"]
+        mean_util = sum(util.values()) / len(util) if util else 0
+        print(f"{r['policy']:<10} {r['routing']:<9} {r['jobs']:>7} {r['throughput_per_hour'] or 0:>8.1f} "
+              f"{_seconds(r['wait_p50_s']):>10} {_seconds(r['wait_p95_s']):>10} {_seconds(r['wait_p99_s']):>10} {mean_util:>9.1%}")
+    for r in reports:
+        if r["dropped"]:
+            print(f"{r['policy']}/{r['routing']}: {r['dropped']} jobs dropped (DUT or hardware type not in the inventory)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare DUT queue policies on a recorded or synthetic workload")
+    parser.add_argument("--db", default="framework.db", help="Database whose Logs provide the workload and durations")
+    parser.add_argument("--since", help="Only use Logs rows from this UTC timestamp (YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument("--policies", default=",".join(QUEUE_POLICIES), help="Comma separated QUEUE_POLICIES")
+    parser.add_argument("--routing", default="recorded", help=f"Comma separated, from {', '.join(ROUTINGS)}")
+    parser.add_argument("--load-factor", type=float, default=1.0, help="Replay arrivals this many times faster")
+    parser.add_argument("--synthetic", action="store_true", help="Poisson arrivals instead of replaying Logs")
+    parser.add_argument("--days", type=float, default=7, help="Synthetic workload length")
+    parser.add_argument("--rate", type=float, default=20, help="Synthetic arrivals per hour")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write the reports as JSON")
+    args = parser.parse_args(argv)
+
+    policies = [p.strip() for p in args.policies.split(",") if p.strip()]
+    routings = [r.strip() for r in args.routing.split(",") if r.strip()]
+    unknown = (set(policies) - set(QUEUE_POLICIES)) | (set(routings) - set(ROUTINGS))
+    if unknown:
+        parser.error(f"Unknown policy/routing: {', '.join(sorted(unknown))}")
+
+    history = load_history(args.db, args.since) if os.path.exists(args.db) else []
+    durations = DurationModel(history, args.seed)
+    if args.synthetic:
+        jobs = synthetic_workload(history, durations, args.days, args.rate, args.seed)
+    else:
+        jobs = replay_workload(history, durations, args.load_factor)
+    if not jobs:
+        parser.error("Empty workload: no managed DUT jobs in Logs (try --synthetic)")
+    print(f"{len(jobs)} jobs, {len(durations.per_iteration)} tests with measured durations")
+
+    reports = [simulate(jobs, policy, routing) for routing in routings for policy in policies]
+    print_reports(reports)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"Reports written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/result_writer.py
+# Write-behind Logs writer: buffers finished job rows and inserts them in one
+# transaction per batch (group commit) instead of one commit + fsync per job.
+# Benchmark from the repository root:
+#     python src/standalone/result_writer.py --jobs 2000 --threads 8
+import argparse
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import init_db, store_metric_blobs
+from executor import ITERATION_INSERT_SQL, LOG_INSERT_SQL
+from metrics_exporter import observe_db_write
+
+log = logging.getLogger(__name__)
+
+# durability -> PRAGMA synchronous used by the writer connection
+#   full:   write() blocks until its row is committed; rows that arrive while a
+#           commit is in progress share the next one. Nothing is lost on a crash.
+#   normal: write() returns at once; rows are committed every batch_size rows or
+#           flush_interval seconds. A crash loses at most the unflushed buffer.
+#   off:    like normal, and SQLite skips fsync. Fastest; an OS crash or power
+#           loss can also lose recently committed batches.
+DURABILITY_MODES = {"full": "FULL", "normal": "NORMAL", "off": "OFF"}
+
+_STOP = object()
+
+
+class ResultWriter:
+    """
+    Background writer for Logs rows (built with executor.log_row).
+
+    A single thread with its own connection owns all Logs inserts, so job
+    threads never wait on the SQLite write lock. Rows (and their metric blobs)
+    that are buffered but not yet committed are visible through
+    pending_results() and pending_blobs(). Call close() (or flush()) before
+    reading the results back from Logs.
+
+    A batch that cannot be committed is retried row by row; rows that still
+    fail are kept in failed_results() (counted in stats()["failed"]) until
+    retry_failed() queues them again. They are never dropped.
+    """
+
+    def __init__(self, db_path="framework.db", batch_size=100, flush_interval=0.5, durability="normal"):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {sorted(DURABILITY_MODES)}")
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = {}  # job_id -> row buffered but not committed yet
+        self._pending_blobs = {}  # hash -> (data, size) referenced by buffered rows
+        self._failed = {}  # job_id (or sequence) -> (row, blobs, iterations, error) that could not be committed
+        self._failed_sequence = 0
+        self._thread = None
+        self._closed = False
+        self.rows_written = 0
+        self.flushes = 0
+        self.last_error = None
+
+    # ---------------------- lifecycle ----------------------
+    def start(self):
+        self._closed = False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Flush everything still buffered and stop the writer thread."""
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------------- writing ----------------------
+    def write(self, row, blobs=None, iterations=None):
+        """
+        Queue one Logs row and the metric blobs it references (executor.log_row),
+        plus the job's IterationResults rows (executor.iteration_rows).
+        In "full" durability this returns once the row is committed.
+        """
+        if self._closed:
+            raise RuntimeError("ResultWriter is closed")
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            if row[0] is not None:
+                self._pending[row[0]] = row
+            self._pending_blobs.update(blobs or {})
+        waiter = self._waiter() if self.durability == "full" else None
+        self._queue.put((row, blobs, iterations, waiter))
+        if waiter is not None:
+            self._wait(waiter)
+
+    def flush(self):
+        """Commit everything written so far, whatever the thresholds."""
+        if self._thread is None:
+            return
+        waiter = self._waiter()
+        self._queue.put((None, None, None, waiter))
+        self._wait(waiter)
+
+    def pending_results(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def pending_blobs(self):
+        with self._lock:
+            return dict(self._pending_blobs)
+
+    def failed_results(self):
+        """{job_id: (row, error)} of rows that could not be committed."""
+        with self._lock:
+            return {key: (row, error) for key, (row, _, _, error) in self._failed.items()}
+
+    def retry_failed(self):
+        """Queue the rows in failed_results() again; returns how many."""
+        with self._lock:
+            failed, self._failed = list(self._failed.values()), {}
+            for row, blobs, _, _ in failed:
+                if row[0] is not None:
+                    self._pending[row[0]] = row
+                self._pending_blobs.update(blobs or {})
+        for row, blobs, iterations, _ in failed:
+            self._queue.put((row, blobs, iterations, None))
+        return len(failed)
+
+    def stats(self):
+        return {
+            "durability": self.durability,
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "rows_per_flush": round(self.rows_written / self.flushes, 1) if self.flushes else 0,
+            "buffered": len(self.pending_results()),
+            "failed": len(self.failed_results()),
+            "last_error": self.last_error,
+        }
+
+    @staticmethod
+    def _waiter():
+        return {"event": threading.Event(), "error": None}
+
+    @staticmethod
+    def _wait(waiter):
+        waiter["event"].wait()
+        if waiter["error"]:
+            raise sqlite3.DatabaseError(f"ResultWriter could not commit: {waiter['error']}")
+
+    # ---------------------- writer thread ----------------------
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL lets readers (UI, service) keep going while a batch commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={DURABILITY_MODES[self.durability]}")
+        return conn
+
+    def _run(self):
+        conn = self._connect()
+        batch, waiters = [], []  # batch: [(row, blobs, iterations)]
+        first_at = 0.0
+        try:
+            while True:
+                if not batch:
+                    timeout = None
+                elif self.durability == "full":
+                    timeout = 0  # group commit: take whatever queued up during the last commit
+                else:
+                    timeout = max(0.0, first_at + self.flush_interval - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                try:
+                    if item is not None:
+                        row, row_blobs, row_iterations, waiter = item
+                        if row is not None:
+                            if not batch:
+                                first_at = time.monotonic()
+                            batch.append((row, row_blobs or {}, row_iterations or []))
+                        if waiter is not None:
+                            waiters.append(waiter)
+                    if item is None or item[0] is None or len(batch) >= self.batch_size:
+                        flushing, flush_waiters, batch, waiters = batch, waiters, [], []
+                        self._flush(conn, flushing, flush_waiters)
+                except Exception as e:
+                    # Keep the thread alive whatever a batch does; _flush has settled its rows
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    log.error("ResultWriter: %s", self.last_error)
+            self._flush(conn, batch, waiters)
+        finally:
+            conn.close()
+
+    def _insert(self, conn, batch, attempts):
+        """Insert (row, blobs, iterations) items in one transaction, retrying while the database is locked."""
+        for attempt in range(attempts):
+            try:
+                with conn:
+                    for _, blobs, _ in batch:
+                        store_metric_blobs(conn, blobs)
+                    conn.executemany(LOG_INSERT_SQL, [row for row, _, _ in batch])
+                    conn.executemany(ITERATION_INSERT_SQL, [it for _, _, iterations in batch for it in iterations])
+                return
+            except sqlite3.OperationalError:
+                if attempt == attempts - 1:
+                    raise
+                # Database stayed locked past the busy timeout; back off and retry
+                time.sleep(0.1 * (attempt + 1))
+
+    def _flush(self, conn, batch, waiters, attempts=5):
+        """
+        Commit a batch; if that fails, commit its rows one by one and keep the
+        ones that still fail in failed_results(). Waiters are always released
+        (with the error, if any row of the batch failed).
+        """
+        committed, failed, error = [], [], None
+        try:
+            if not batch:
+                return
+            started = time.perf_counter()
+            try:
+                self._insert(conn, batch, attempts)
+                committed = batch
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                log.warning("ResultWriter: batch of %d rows failed (%s); committing row by row", len(batch), error)
+                for item in batch:
+                    try:
+                        self._insert(conn, [item], attempts)
+                        committed.append(item)
+                    except Exception as row_error:
+                        failed.append(item + (f"{type(row_error).__name__}: {row_error}",))
+            if committed:
+                observe_db_write(time.perf_counter() - started, len(committed), "batch")
+                self.rows_written += len(committed)
+                self.flushes += 1
+            if failed:
+                error = failed[-1][3]
+                self.last_error = error
+                log.error("ResultWriter: %d Logs rows kept in failed_results(): %s", len(failed), error)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            failed = [item + (error,) for item in batch if item not in committed]
+            self.last_error = error
+        finally:
+            with self._lock:
+                for row, blobs, _ in batch:
+                    self._pending.pop(row[0], None)
+                    for digest in blobs:
+                        self._pending_blobs.pop(digest, None)
+                for item in failed:
+                    self._failed_sequence += 1
+                    key = item[0][0] if item[0][0] is not None else f"unnumbered-{self._failed_sequence}"
+                    self._failed[key] = item
+            for waiter in waiters:
+                waiter["error"] = error if failed else None
+                waiter["event"].set()
+
+
+# ---------------------- benchmark ----------------------
+def _benchmark_rows(count, thread_index):
+    from executor import log_row
+    job = {"dut": thread_index, "hardware_type": "Dgx", "serial": "-", "com_port": "-",
+           "mac_address": "-", "test_name": "cold_boot", "parameters": {"iterations": 1, "delay": 1}}
+    result = {"outcome": "Pass", "metrics": {"iterations": 1, "passes": 1}}
+    return [log_row(dict(job, job_id=thread_index * count + i), result) for i in range(count)]
+
+
+def _run_threads(threads, per_thread, work):
+    workers = [threading.Thread(target=work, args=(t, _benchmark_rows(per_thread, t))) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start
+
+
+def benchmark(jobs=2000, threads=8, batch_size=100, flush_interval=0.5, work_dir=None):
+    """
+    Time `jobs` Logs inserts from `threads` concurrent job threads: first the
+    per-job INSERT + commit path, then a ResultWriter in each durability mode.
+    Every run uses a fresh database. Returns {label: jobs_per_second}.
+    """
+    per_thread = max(1, jobs // threads)
+    total = per_thread * threads
+    work_dir = work_dir or tempfile.mkdtemp(prefix="result_writer_bench_")
+    results = {}
+
+    db_path = os.path.join(work_dir, "per_job_commit.db")
+    init_db(db_path).close()
+
+    def per_job_commit(_, rows):
+        conn = sqlite3.connect(db_path, timeout=60)
+        for row, blobs in rows:
+            store_metric_blobs(conn, blobs)
+            conn.execute(LOG_INSERT_SQL, row)
+            conn.commit()
+        conn.close()
+
+    results["per-job commit"] = total / _run_threads(threads, per_thread, per_job_commit)
+
+    for durability in DURABILITY_MODES:
+        db_path = os.path.join(work_dir, f"writer_{durability}.db")
+        init_db(db_path).close()
+        writer = ResultWriter(db_path, batch_size=batch_size, flush_interval=flush_interval,
+                              durability=durability).start()
+
+        def buffered(_, rows):
+            for row, blobs in rows:
+                writer.write(row, blobs)
+
+        start = time.perf_counter()
+        _run_threads(threads, per_thread, buffered)
+        writer.close()  # include the final flush in the timing
+        elapsed = time.perf_counter() - start
+        results[f"writer ({durability}, {writer.flushes} commits)"] = total / elapsed
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Logs inserts: per-job commit vs ResultWriter")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    print(f"Logging {args.jobs} job results from {args.threads} threads")
+    for label, rate in benchmark(args.jobs, args.threads, args.batch_size, args.flush_interval).items():
+        print(f"  {label:<36} {rate:>10.0f} jobs/s")
+
+
+if __name__ == "__main__":
+    main()
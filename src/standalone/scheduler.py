@@ -0,0 +1,234 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/scheduler.py
+# Background job scheduler: callers only enqueue, worker threads run the jobs.
+import json
+import queue
+import sqlite3
+import threading
+import time
+from archive import start_background_archiver
+from database import init_db
+from hardware import mock_hardware_detection
+from executor import (
+    cancel_queued_job, enqueue_job, get_next_job_id, job_spec_parameters,
+    pop_next_job, resolve_job_target, run_and_log_job,
+)
+from result_writer import ResultWriter
+from test_runner import cancel_running_test
+
+
+class JobScheduler:
+    """
+    Runs queued jobs in the background so submitters never block.
+
+    * One drain thread per managed DUT with work queued (sequential per DUT,
+      parallel across DUTs), each on its own SQLite connection.
+    * A small pool of threads for remote (SSH) jobs, which have no DUT queue.
+      Remote jobs wait in memory, so they are lost if the process stops.
+
+    A DUT that is Busy with a job started elsewhere (e.g. the Streamlit UI) is
+    left alone; whoever runs that job drains the rest of the queue.
+
+    Finished jobs go through one ResultWriter, so results from all DUTs are
+    group-committed to Logs (see result_writer.DURABILITY_MODES).
+    DUT queues are worked through in executor.QUEUE_POLICIES[queue_policy] order.
+    """
+
+    def __init__(self, db_path="framework.db", poll_interval=0.5, remote_workers=8, durability="normal",
+                 queue_policy="fifo"):
+        self.db_path = db_path
+        self.queue_policy = queue_policy
+        self.poll_interval = poll_interval
+        self.remote_workers = remote_workers
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._active_duts = set()
+        self._running = {}          # job_id -> job currently executing here
+        self._remote_pending = {}   # job_id -> remote job waiting for a worker
+        self._remote_queue = queue.Queue()
+        self._threads = []
+        self._drains = []           # per-DUT drain threads started by _loop
+        self.writer = ResultWriter(db_path, durability=durability)
+
+    def connect(self):
+        return sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+
+    # ---------------------- lifecycle ----------------------
+    def start(self):
+        init_db(self.db_path).close()
+        start_background_archiver(self.db_path)
+        self.writer.start()
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._loop, name="scheduler", daemon=True)]
+        for i in range(self.remote_workers):
+            self._threads.append(threading.Thread(target=self._remote_worker, name=f"remote-{i}", daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for _ in range(self.remote_workers):
+            self._remote_queue.put(None)
+        # Jobs already running finish and hand their rows to the writer before it closes
+        for t in self._threads:
+            t.join()
+        with self._lock:
+            drains, self._drains = self._drains, []
+        for t in drains:
+            t.join()
+        self.writer.close()
+
+    def wake(self):
+        self._wake.set()
+
+    # ---------------------- submission ----------------------
+    def submit(self, spec, conn=None, job_id=None):
+        """
+        Queue one job spec ({"test", "dut" | "hardware_type" | "ip", "iterations", "delay", ...})
+        and return immediately with its job_id (or use a job_id from reserve_job_ids).
+        """
+        own_conn = conn is None
+        conn = conn or self.connect()
+        try:
+            try:
+                target = resolve_job_target(conn, spec)
+            except ValueError as e:
+                return {"job_id": None, "outcome": "Fail", "metrics": {"error": str(e)}, "queued": False}
+
+            parameters = job_spec_parameters(spec)
+            if target is not None:
+                result = enqueue_job(
+                    conn, target["DUT"], target["hardware_type"], target["serial"], target["com_port"],
+                    target["mac_address"], spec["test"], parameters["iterations"], parameters,
+                    job_id=job_id,
+                )
+                result["dut"] = target["DUT"]
+                self.wake()
+                return result
+
+            if not parameters.get("username"):
+                return {"job_id": None, "outcome": "Fail", "queued": False,
+                        "metrics": {"error": "Remote jobs need ip and username"}}
+            job = {
+                "job_id": job_id if job_id is not None else get_next_job_id(conn),
+                "dut": "auto",
+                "hardware_type": "auto-detected",
+                "serial": "-",
+                "com_port": "-",
+                "mac_address": "-",
+                "test_name": spec["test"],
+                "iterations": parameters["iterations"],
+                "parameters": parameters,
+                "queued_at": time.time(),
+            }
+            conn.commit()
+            with self._lock:
+                self._remote_pending[job["job_id"]] = job
+            self._remote_queue.put(job)
+            return {"job_id": job["job_id"], "dut": "auto", "outcome": "queued", "metrics": {}, "queued": True}
+        finally:
+            if own_conn:
+                conn.close()
+
+    def cancel(self, job_id, conn=None):
+        """Cancel a queued or running job. Returns "queued", "running" or None (not found)."""
+        with self._lock:
+            if self._remote_pending.pop(job_id, None) is not None:
+                return "queued"
+        own_conn = conn is None
+        conn = conn or self.connect()
+        try:
+            if cancel_queued_job(conn, job_id) is not None:
+                return "queued"
+        finally:
+            if own_conn:
+                conn.close()
+        if cancel_running_test(job_id):
+            return "running"
+        return None
+
+    # ---------------------- introspection ----------------------
+    def running_jobs(self):
+        with self._lock:
+            return dict(self._running)
+
+    def pending_remote_jobs(self):
+        with self._lock:
+            return dict(self._remote_pending)
+
+    def active_dut_count(self):
+        with self._lock:
+            return len(self._active_duts)
+
+    # ---------------------- workers ----------------------
+    def _loop(self):
+        conn = self.connect()
+        hardware = {h["DUT"]: h for h in mock_hardware_detection()}
+        try:
+            while not self._stop.is_set():
+                for dut, status, job_queue in conn.execute("SELECT dut, status, job_queue FROM DUTStatus").fetchall():
+                    if status != "Free" or not json.loads(job_queue or "[]") or dut not in hardware:
+                        continue
+                    with self._lock:
+                        if dut in self._active_duts:
+                            continue
+                        self._active_duts.add(dut)
+                        drain = threading.Thread(target=self._drain, args=(hardware[dut],), daemon=True)
+                        self._drains = [t for t in self._drains if t.is_alive()] + [drain]
+                    drain.start()
+                conn.commit()
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            conn.close()
+
+    def _drain(self, hardware):
+        conn = self.connect()
+        dut = hardware["DUT"]
+        try:
+            while not self._stop.is_set():
+                # Dequeue and register as running in one step, so a status lookup
+                # never falls between the DUT queue and _running
+                with self._lock:
+                    job = pop_next_job(conn, dut, self.queue_policy)
+                    if job is not None:
+                        self._start(job)
+                if job is None:
+                    break
+                self._run(conn, job, dut)
+        finally:
+            with self._lock:
+                self._active_duts.discard(dut)
+            conn.close()
+
+    def _remote_worker(self):
+        conn = self.connect()
+        try:
+            while True:
+                job = self._remote_queue.get()
+                if job is None:
+                    break
+                with self._lock:
+                    if self._remote_pending.pop(job["job_id"], None) is None:
+                        continue  # cancelled while waiting
+                    self._start(job)
+                self._run(conn, job, -1)
+        finally:
+            conn.close()
+
+    def _start(self, job):
+        """Mark a job running; the caller holds self._lock."""
+        job["started_at"] = time.time()
+        self._running[job["job_id"]] = job
+
+    def _run(self, conn, job, dut):
+        try:
+            run_and_log_job(conn, job, dut=dut, writer=self.writer)
+        finally:
+            with self._lock:
+                self._running.pop(job["job_id"], None)
@@ -0,0 +1,302 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# src/standalone/service.py
+# Local HTTP/JSON job service backed by the background JobScheduler.
+# Run from the repository root:
+#     python -m src.standalone.service --port 8600
+#
+#   POST   /jobs                 submit one job spec (or a list) -> 202 + job ids
+#   GET    /jobs                 list queued / running / recent completed jobs (?state=&limit=)
+#   GET    /jobs/<id>            job status and result ("log_failed" if its Logs row could not be written)
+#   DELETE /jobs/<id>            cancel a queued or running job (also POST /jobs/<id>/cancel)
+#   GET    /jobs/<id>/log        job log text (?offset=N; ?follow=1 streams until the job ends)
+#   GET    /jobs/<id>/iterations per-iteration results of a streaming (v2) plugin
+#   GET    /metrics              Prometheus metrics (see metrics_exporter.py)
+import argparse
+import json
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import iteration_results, resolve_metrics
+from executor import reserve_job_ids
+from metrics_exporter import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from scheduler import JobScheduler
+
+
+def job_log_path(job_id):
+    return os.path.abspath(os.path.join("src", "logs", f"job_{job_id}.txt"))
+
+
+def get_job_status(scheduler, conn, job_id):
+    """Return the status dict of a job, or None if the id is unknown. Metric blobs are expanded."""
+    # States are checked in the order a job moves through them (queued, running,
+    # buffered in the writer, committed). Each move adds the job to its next state
+    # before dropping it from the previous one, so a job that moves on while we
+    # look is still found further down.
+    remote = scheduler.pending_remote_jobs().get(job_id)
+    if remote is not None:
+        return {"job_id": job_id, "status": "queued", "dut": "auto", "test_name": remote["test_name"]}
+
+    for dut, job_queue in conn.execute("SELECT dut, job_queue FROM DUTStatus"):
+        for position, job in enumerate(json.loads(job_queue or "[]")):
+            if job.get("job_id") == job_id:
+                return {"job_id": job_id, "status": "queued", "dut": dut,
+                        "test_name": job.get("test_name"), "position": position + 1}
+
+    running = scheduler.running_jobs().get(job_id)
+    if running is not None:
+        return {"job_id": job_id, "status": "running", "dut": running["dut"],
+                "test_name": running["test_name"], "started_at": running.get("started_at"),
+                "progress": running.get("progress")}
+
+    # Finished but still buffered in the result writer
+    row = scheduler.writer.pending_results().get(job_id)
+    if row is not None:
+        status = pending_row_status(row)
+        status["metrics"] = resolve_metrics(conn, status["metrics"], pending=scheduler.writer.pending_blobs())
+        return status
+
+    # Finished, but the result writer could not commit the row
+    failed = scheduler.writer.failed_results().get(job_id)
+    if failed is not None:
+        row, error = failed
+        status = pending_row_status(row)
+        status.update(status="log_failed", error=error)
+        return status
+
+    row = conn.execute(
+        "SELECT dut, test_name, outcome, metrics, timestamp FROM Logs WHERE job_id = ?", (job_id,)
+    ).fetchone()
+    if row is not None:
+        dut, test_name, outcome, metrics, timestamp = row
+        return {
+            "job_id": job_id, "status": "completed", "dut": dut, "test_name": test_name,
+            "outcome": outcome, "metrics": resolve_metrics(conn, json.loads(metrics or "{}")),
+            "finished_at": timestamp,
+        }
+    return None
+
+
+def pending_row_status(row):
+    """Status dict for a Logs row (executor.log_row) that is not committed yet."""
+    return {
+        "job_id": row[0], "status": "completed", "dut": row[1], "test_name": row[6],
+        "outcome": row[8], "metrics": json.loads(row[9] or "{}"), "finished_at": row[12],
+    }
+
+
+def list_jobs(scheduler, conn, state=None, limit=100):
+    jobs = []
+    if state in (None, "queued"):
+        for dut, job_queue in conn.execute("SELECT dut, job_queue FROM DUTStatus"):
+            for position, job in enumerate(json.loads(job_queue or "[]")):
+                jobs.append({"job_id": job.get("job_id"), "status": "queued", "dut": dut,
+                             "test_name": job.get("test_name"), "position": position + 1})
+        for job_id, job in scheduler.pending_remote_jobs().items():
+            jobs.append({"job_id": job_id, "status": "queued", "dut": "auto", "test_name": job["test_name"]})
+    if state in (None, "running"):
+        for job_id, job in scheduler.running_jobs().items():
+            jobs.append({"job_id": job_id, "status": "running", "dut": job["dut"], "test_name": job["test_name"]})
+    if state in (None, "completed"):
+        for row in scheduler.writer.pending_results().values():
+            status = pending_row_status(row)
+            status.pop("metrics")
+            jobs.append(status)
+        for row, error in scheduler.writer.failed_results().values():
+            status = pending_row_status(row)
+            status.pop("metrics")
+            status.update(status="log_failed", error=error)
+            jobs.append(status)
+        for job_id, dut, test_name, outcome, timestamp in conn.execute(
+            "SELECT job_id, dut, test_name, outcome, timestamp FROM Logs ORDER BY log_id DESC LIMIT ?", (limit,)
+        ):
+            jobs.append({"job_id": job_id, "status": "completed", "dut": dut, "test_name": test_name,
+                         "outcome": outcome, "finished_at": timestamp})
+    return jobs[:limit]
+
+
+def make_handler(scheduler):
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        # ---------------------- helpers ----------------------
+        def log_message(self, format, *args):
+            pass  # keep the console quiet under load
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"null")
+
+        def route(self):
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            return parts, query
+
+        def job_id_from(self, parts):
+            try:
+                return int(parts[1])
+            except (IndexError, ValueError):
+                self.send_json(400, {"error": "Invalid job id"})
+                return None
+
+        # ---------------------- verbs ----------------------
+        def do_POST(self):
+            parts, _ = self.route()
+            if parts == ["jobs"]:
+                try:
+                    payload = self.read_json()
+                except ValueError:
+                    return self.send_json(400, {"error": "Body must be JSON"})
+                specs = payload if isinstance(payload, list) else [payload]
+                if not all(isinstance(s, dict) and s.get("test") for s in specs):
+                    return self.send_json(400, {"error": "Every job spec needs a test"})
+                conn = scheduler.connect()
+                try:
+                    # One round-trip reserves ids for the whole batch
+                    job_ids = reserve_job_ids(conn, len(specs))
+                    conn.commit()
+                    results = [scheduler.submit(spec, conn=conn, job_id=job_id) for spec, job_id in zip(specs, job_ids)]
+                finally:
+                    conn.close()
+                return self.send_json(202, results if isinstance(payload, list) else results[0])
+            if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+                return self.cancel(parts)
+            self.send_json(404, {"error": "Not found"})
+
+        def do_DELETE(self):
+            parts, _ = self.route()
+            if len(parts) == 2 and parts[0] == "jobs":
+                return self.cancel(parts)
+            self.send_json(404, {"error": "Not found"})
+
+        def do_GET(self):
+            parts, query = self.route()
+            if parts == ["metrics"]:
+                return self.send_metrics()
+            if not parts or parts[0] != "jobs":
+                return self.send_json(404, {"error": "Not found"})
+
+            conn = scheduler.connect()
+            try:
+                if len(parts) == 1:
+                    return self.send_json(200, list_jobs(
+                        scheduler, conn, state=query.get("state"), limit=int(query.get("limit", 100))
+                    ))
+                job_id = self.job_id_from(parts)
+                if job_id is None:
+                    return
+                if len(parts) == 2:
+                    status = get_job_status(scheduler, conn, job_id)
+                    if status is None:
+                        return self.send_json(404, {"error": f"Unknown job {job_id}"})
+                    return self.send_json(200, status)
+                if len(parts) == 3 and parts[2] == "log":
+                    return self.stream_log(conn, job_id, int(query.get("offset", 0)), query.get("follow") == "1")
+                if len(parts) == 3 and parts[2] == "iterations":
+                    return self.send_json(200, iteration_results(conn, job_id))
+            finally:
+                conn.close()
+            self.send_json(404, {"error": "Not found"})
+
+        def send_metrics(self):
+            conn = scheduler.connect()
+            try:
+                body = render_metrics(conn, scheduler).encode("utf-8")
+            finally:
+                conn.close()
+            self.send_response(200)
+            self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def cancel(self, parts):
+            job_id = self.job_id_from(parts)
+            if job_id is None:
+                return
+            cancelled = scheduler.cancel(job_id)
+            if cancelled is None:
+                return self.send_json(404, {"error": f"Job {job_id} is not queued or running"})
+            self.send_json(200, {"job_id": job_id, "cancelled": cancelled})
+
+        def stream_log(self, conn, job_id, offset, follow):
+            """Send the log from `offset`; with follow, keep sending chunks until the job finishes."""
+            path = job_log_path(job_id)
+            if not follow:
+                if not os.path.exists(path):
+                    return self.send_json(404, {"error": f"No log for job {job_id}"})
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    body = f.read()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("X-Next-Offset", str(offset + len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            while True:
+                status = get_job_status(scheduler, conn, job_id)
+                finished = status is None or status["status"] in ("completed", "log_failed")
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        chunk = f.read()
+                    if chunk:
+                        offset += len(chunk)
+                        self.wfile.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+                        self.wfile.flush()
+                if finished:
+                    break
+                time.sleep(0.5)
+            self.wfile.write(b"0\r\n\r\n")
+
+    return JobRequestHandler
+
+
+def serve(host="127.0.0.1", port=8600, db_path="framework.db", durability="normal"):
+    scheduler = JobScheduler(db_path=db_path, durability=durability).start()
+    server = ThreadingHTTPServer((host, port), make_handler(scheduler))
+    print(f"SmartTestFramework job service on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        scheduler.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SmartTestFramework local job service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--db", default="framework.db")
+    parser.add_argument("--durability", choices=["full", "normal", "off"], default="normal",
+                        help="How result rows are committed to Logs (see result_writer.py)")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.db, args.durability)
+
+
+if __name__ == "__main__":
+    main()
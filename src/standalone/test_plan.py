@@ -0,0 +1,229 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from hardware import mock_hardware_detection
+from executor import begin_immediate, get_next_job_id, get_pool_load, log_job_result, process_jobs
+from plugin_registry import is_remote_test
+from test_runner import run_test_in_cmd
+
+
+def load_plan(path):
+    """
+    Load a test plan from a .json or .yaml/.yml file. YAML needs PyYAML installed.
+
+    Plan format:
+        {
+            "name": "standard_sequence",
+            "hardware_type": "Dgx",          # default pool for every step
+            "fail_fast": false,              # true -> stop starting new steps after any failure
+            "ssh": {"ip": ..., "username": ..., "password": ...},   # for auto_detect_tests steps
+            "steps": [
+                {"id": "cold", "test": "cold_boot", "iterations": 5, "delay": 3},
+                {"id": "warm", "test": "warm_boot", "depends_on": ["cold"]},
+                ...
+            ]
+        }
+
+    Step keys: id, test, depends_on, iterations, delay, parameters, dut (pin to one
+    DUT), hardware_type (override the plan pool), continue_on_failure (let
+    dependents run even if this step fails).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("PyYAML is required for YAML test plans (pip install pyyaml)")
+            plan = yaml.safe_load(f)
+        else:
+            plan = json.load(f)
+
+    plan.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    validate_plan(plan)
+    return plan
+
+
+def list_plans(plans_dir):
+    """Return plan file names (json/yaml) found in plans_dir."""
+    if not os.path.isdir(plans_dir):
+        return []
+    return sorted(f for f in os.listdir(plans_dir) if f.endswith((".json", ".yaml", ".yml")))
+
+
+def validate_plan(plan):
+    """Raise ValueError for duplicate ids, unknown dependencies or cycles."""
+    steps = plan.get("steps") or []
+    if not steps:
+        raise ValueError("Test plan has no steps")
+
+    ids = [step.get("id") or step.get("test") for step in steps]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate step ids in test plan: {ids}")
+    for step, step_id in zip(steps, ids):
+        step["id"] = step_id
+        if not step.get("test"):
+            raise ValueError(f"Step {step_id} has no test")
+        for dep in step.get("depends_on", []):
+            if dep not in ids:
+                raise ValueError(f"Step {step_id} depends on unknown step {dep}")
+
+    # Kahn's algorithm: every step must become ready at some point
+    remaining = {step["id"]: set(step.get("depends_on", [])) for step in steps}
+    while remaining:
+        ready = [s for s, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Test plan has a dependency cycle between {sorted(remaining)}")
+        for s in ready:
+            del remaining[s]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_plan(conn, plan, ssh=None, poll_interval=2):
+    """
+    Execute a test plan. Steps whose dependencies have passed are started as
+    soon as a Free DUT of their hardware type is available, so independent
+    branches run concurrently across DUTs. A failed step marks everything
+    downstream as Skipped (unless it has continue_on_failure); with plan-level
+    fail_fast no new steps are started after the first failure. When every
+    matching DUT is held by other jobs, the plan polls until one is Free.
+    Every step is logged to Logs with plan_run_id / plan_step in its parameters.
+    Returns {"plan_run_id", "outcome", "steps": {step_id: {...}}}.
+    """
+    validate_plan(plan)
+    plan_run_id = uuid.uuid4().hex[:12]
+    ssh = dict(plan.get("ssh") or {}, **(ssh or {}))
+    steps = {step["id"]: step for step in plan["steps"]}
+    state = {step_id: {"status": "pending", "job_id": None, "dut": None} for step_id in steps}
+    aborted = False
+
+    def blocked(step):
+        # A dependency failed without continue_on_failure, or was skipped
+        for dep in step.get("depends_on", []):
+            dep_status = state[dep]["status"]
+            if dep_status == "Skipped":
+                return True
+            if dep_status == "Fail" and not steps[dep].get("continue_on_failure"):
+                return True
+        return False
+
+    def ready(step):
+        return all(state[dep]["status"] in ("Pass", "Fail") for dep in step.get("depends_on", []))
+
+    def claim_dut(step):
+        # Returns a hardware dict marked Busy, "remote" for SSH tests, "missing" if the
+        # step has no managed DUT (or SSH host) at all, or None if its DUTs are all in use right now
+        if is_remote_test(step["test"]):
+            return "remote" if ssh.get("ip") else "missing"
+        hardware_type = step.get("hardware_type") or plan.get("hardware_type")
+        if step.get("dut") is not None:
+            pinned = next((h for h in mock_hardware_detection() if h["DUT"] == step["dut"]), None)
+            hardware_type = pinned["hardware_type"] if pinned else None
+        pool = get_pool_load(conn, hardware_type) if hardware_type else []
+        if step.get("dut") is not None:
+            pool = [entry for entry in pool if entry[0]["DUT"] == step["dut"]]
+        if not pool:
+            return "missing"
+        for h, status, queue_length in pool:
+            if status != "Free" or queue_length != 0:
+                continue
+            # Another connection may have taken the DUT since get_pool_load; only
+            # the conditional UPDATE decides who owns it
+            begin_immediate(conn)
+            claimed = conn.execute(
+                "UPDATE DUTStatus SET status = 'Busy' WHERE dut = ? AND status = 'Free'", (h["DUT"],)
+            ).rowcount
+            conn.commit()
+            if claimed:
+                return h
+        return None
+
+    def build_job(step, hardware):
+        parameters = dict(step.get("parameters") or {})
+        parameters.setdefault("iterations", step.get("iterations", 1))
+        parameters.setdefault("delay", step.get("delay", 1))
+        parameters.update({"plan_run_id": plan_run_id, "plan_step": step["id"], "plan": plan["name"]})
+        job = {
+            "job_id": get_next_job_id(conn),
+            "test_name": step["test"],
+            "iterations": parameters["iterations"],
+            "parameters": parameters,
+        }
+        if hardware == "remote":
+            parameters.update({k: ssh.get(k) for k in ("ip", "username", "password", "key_file") if ssh.get(k)})
+            job.update({"dut": -1, "hardware_type": "auto-detected", "serial": "-", "com_port": "-", "mac_address": "-"})
+        else:
+            parameters.update({"ip": None, "username": None, "password": None})
+            job.update({
+                "dut": hardware["DUT"],
+                "hardware_type": hardware["hardware_type"],
+                "serial": hardware["serial"],
+                "com_port": hardware["com_port"],
+                "mac_address": hardware["mac_address"],
+            })
+        conn.commit()
+        return job
+
+    def run_one(job):
+        try:
+            return run_test_in_cmd(job)
+        except Exception as e:
+            return {"outcome": "Fail", "metrics": {"error": str(e)}}
+
+    running = {}  # future -> (step_id, job, hardware)
+    with ThreadPoolExecutor(max_workers=max(1, len(steps))) as pool:
+        while True:
+            # Propagate skips downstream of failures
+            for step_id, step in steps.items():
+                if state[step_id]["status"] == "pending" and (aborted or blocked(step)):
+                    state[step_id]["status"] = "Skipped"
+
+            # Start everything that is ready and has a DUT available
+            for step_id, step in steps.items():
+                if state[step_id]["status"] != "pending" or not ready(step):
+                    continue
+                hardware = claim_dut(step)
+                if hardware is None:
+                    continue
+                if hardware == "missing":
+                    error = "No SSH host for this step" if is_remote_test(step["test"]) else "No managed DUT for this step"
+                    state[step_id].update({"status": "Fail", "metrics": {"error": error}})
+                    aborted = aborted or bool(plan.get("fail_fast"))
+                    continue
+                job = build_job(step, hardware)
+                state[step_id].update({"status": "running", "job_id": job["job_id"], "dut": job["dut"]})
+                running[pool.submit(run_one, job)] = (step_id, job, hardware)
+
+            if not running:
+                if not any(state[s]["status"] == "pending" for s in steps):
+                    break
+                # Ready steps are waiting for DUTs held by jobs outside this plan
+                time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id, job, hardware = running.pop(future)
+                result = future.result()
+                log_job_result(conn, job, result)
+                conn.commit()
+                if hardware != "remote":
+                    process_jobs(conn, hardware["DUT"], hardware["hardware_type"], hardware["serial"],
+                                 hardware["com_port"], hardware["mac_address"])
+                outcome = "Pass" if result.get("outcome") == "Pass" else "Fail"
+                state[step_id].update({"status": outcome, "metrics": result.get("metrics", {})})
+                if outcome == "Fail" and plan.get("fail_fast"):
+                    aborted = True
+
+    statuses = [s["status"] for s in state.values()]
+    return {
+        "plan_run_id": plan_run_id,
+        "plan": plan["name"],
+        "outcome": "Pass" if all(s == "Pass" for s in statuses) else "Fail",
+        "steps": state,
+    }
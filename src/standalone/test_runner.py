@@ -6,37 +6,206 @@ import os
 import random
 import sys
 import tempfile
+import threading
+import time
 import json as _json
+from plugin_registry import find_plugin, job_timeout, parameter_defaults, plugin_dirs
 
+# Test subprocesses currently running in this process, keyed by job_id (used for cancel)
+_running_processes = {}
+_cancelled_jobs = set()
+_running_lock = threading.Lock()
 
-def run_test_in_cmd(job):
+
+def is_test_running(job_id):
+    with _running_lock:
+        return job_id in _running_processes
+
+
+def running_job_ids():
+    with _running_lock:
+        return list(_running_processes)
+
+
+def cancel_running_test(job_id):
+    """
+    Kill the test subprocess of a running job. The job is then reported with
+    outcome "Cancelled". Returns False if the job is not running in this process.
+    """
+    with _running_lock:
+        process = _running_processes.get(job_id)
+        if process is None:
+            return False
+        _cancelled_jobs.add(job_id)
+    process.kill()
+    return True
+
+
+ITER_MARKER = "===ITER=== "
+PHASES_MARKER = "===PHASES=== "
+
+# Runs in the test subprocess after TEST_MODULE, ITERATIONS, PARAMS, PROFILE and
+# PROFILE_PATH are defined.
+# v2 plugins make run_test a generator (or async generator) that yields one record
+# per iteration, e.g. {"outcome": "Pass", "metrics": {"boot_time": 41.2}}, and may
+# return a final {"metrics": {...}}. Numeric metrics are measurements (they feed
+# IterationMetrics); anything else describing the iteration goes in an optional
+# "details" dict. Each record is printed as an ITER_MARKER line
+# as soon as it is yielded. With params["fail_fast"] the generator is closed after
+# the first failed iteration. Legacy plugins just return one final result.
+# The subprocess reports when it started, imported the plugin and finished as a
+# PHASES_MARKER line. With PROFILE, the import and the test run under cProfile and
+# tracemalloc; see write_profile for the files written next to the job log.
+RUNNER_BODY = """
+import asyncio, importlib, inspect, json, time
+
+phases = {"started": time.time()}
+profiler = None
+if PROFILE:
+    import cProfile, tracemalloc
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+
+def write_profile():
+    profiler.disable()
+    snapshot = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    import pstats
+    profiler.dump_stats(PROFILE_PATH + ".prof")
+    with open(PROFILE_PATH + "_profile.txt", "w", encoding="utf-8") as f:
+        f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\\n\\nTop allocations by line:\\n")
+        for stat in snapshot.statistics("lineno")[:20]:
+            f.write(f"{stat}\\n")
+        f.write("\\nCPU profile, top 30 by cumulative time (full profile: python -m pstats <job>.prof):\\n")
+        pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(30)
+    return {"cpu_profile": PROFILE_PATH + ".prof", "report": PROFILE_PATH + "_profile.txt",
+            "peak_memory_kb": round(peak / 1024, 1)}
+
+
+plugin = importlib.import_module(TEST_MODULE)
+phases["imported"] = time.time()
+try:
+    r = plugin.run_test(ITERATIONS, PARAMS)
+except TypeError:
+    r = plugin.run_test(ITERATIONS)
+
+records = []
+
+
+def emit(record):
+    if not isinstance(record, dict):
+        record = {"outcome": record}
+    outcome = str(record.get("outcome") or record.get("result") or record.get("status") or "Fail")
+    record = {
+        "iteration": int(record.get("iteration", len(records) + 1)),
+        "outcome": "Pass" if outcome.lower().startswith("pass") else "Fail",
+        "metrics": record["metrics"] if isinstance(record.get("metrics"), dict) else {},
+        **({"details": record["details"]} if isinstance(record.get("details"), dict) else {}),
+    }
+    records.append(record)
+    print("===ITER=== " + json.dumps(record, default=str), flush=True)
+    return PARAMS.get("fail_fast") and record["outcome"] != "Pass"
+
+
+async def consume_async(gen):
+    try:
+        async for record in gen:
+            if emit(record):
+                return True
+        return False
+    finally:
+        await gen.aclose()
+
+
+if inspect.isgenerator(r) or inspect.isasyncgen(r):
+    summary, aborted = None, False
+    if inspect.isasyncgen(r):
+        aborted = asyncio.run(consume_async(r))
+    else:
+        while True:
+            try:
+                record = next(r)
+            except StopIteration as stop:
+                summary = stop.value
+                break
+            if emit(record):
+                r.close()
+                aborted = True
+                break
+    summary = summary if isinstance(summary, dict) else {}
+    failed = sum(1 for record in records if record["outcome"] != "Pass")
+    metrics = dict(summary.get("metrics") or {}, iterations_run=len(records), iterations_failed=failed)
+    if aborted:
+        metrics["aborted"] = "fail_fast"
+    passed = records and not failed and str(summary.get("outcome", "Pass")).lower().startswith("pass")
+    r = {"outcome": "Pass" if passed else "Fail", "metrics": metrics, "streamed": True}
+
+if profiler is not None:
+    phases["profile"] = write_profile()
+phases["finished"] = time.time()
+print("===PHASES=== " + json.dumps(phases), flush=True)
+
+print("\\n===RESULT_START===")
+print(json.dumps(r, default=str))
+print("===RESULT_END===")
+"""
+
+
+# (phase, from mark, to mark): "begin", "spawned", "exited" and "parsed" are taken
+# in this process, "started", "imported" and "finished" inside the test subprocess
+PHASES = [
+    ("setup", "begin", "spawned"),       # plugin lookup, runner file
+    ("spawn", "spawned", "started"),     # interpreter start-up
+    ("import", "started", "imported"),   # plugin module import
+    ("execute", "imported", "finished"),
+    ("teardown", "finished", "exited"),  # interpreter shutdown, remaining output
+    ("parse", "exited", "parsed"),       # log parsing
+]
+
+
+def job_phases(marks):
+    """Phase durations in milliseconds (phases whose marks are missing are left out)."""
+    phases = {
+        name: round((marks[end] - marks[start]) * 1000, 1)
+        for name, start, end in PHASES if start in marks and end in marks
+    }
+    phases["total"] = round((max(marks.values()) - marks["begin"]) * 1000, 1)
+    return phases
+
+
+def profiling_requested(params):
+    """Profile a job with parameters["profile"], or every job with STF_PROFILE=1."""
+    return bool(params.get("profile")) or os.environ.get("STF_PROFILE") == "1"
+
+
+def run_test_in_cmd(job, on_iteration=None):
     """
     Run the named test in a new process and return {"outcome": ..., "metrics": {...}}.
-    Search for the test module first in src/plugins/tests, then in src/plugins/auto_detect_tests.
-    The test module must expose run_test(iterations, **kwargs) or run_test(iterations).
+    The test module is looked up in the plugin registry (plugin_registry.py);
+    parameters it declares defaults for are filled in, and a test running past
+    its declared timeout is killed and reported as failed.
+    The test module must expose run_test(iterations, **kwargs) or run_test(iterations),
+    either returning one result or yielding one record per iteration (see RUNNER_BODY).
+    Streamed iterations are returned under result["iterations"]; while the test
+    runs each one is passed to on_iteration(job, record) and counted in job["progress"].
+    metrics["phases"] has the time spent in each PHASES step. When profiling is
+    requested (profiling_requested), metrics["profile"] has the paths of the
+    job_<id>.prof / job_<id>_profile.txt files written next to the job log.
     We call it via a temporary runner file to avoid shell escaping issues.
     """
 
+    marks = {"begin": time.time()}
+    job.setdefault("started_at", marks["begin"])
     test_name = job.get("test_name")
     iterations = job.get("iterations", 1)
     job_id = job.get("job_id")
 
-    tests_dir = os.path.join(os.getcwd(), "src", "plugins", "tests")
-    auto_tests_dir = os.path.join(os.getcwd(), "src", "plugins", "auto_detect_tests")
-
-    # Determine test file path (prefer auto_detect_tests first if present there)
-    candidate_paths = [
-        os.path.join(auto_tests_dir, f"{test_name}.py"),
-        os.path.join(tests_dir, f"{test_name}.py"),
-    ]
+    plugin = find_plugin(test_name)
 
-    found_path = None
-    for p in candidate_paths:
-        if os.path.exists(p):
-            found_path = p
-            break
-
-    if not found_path:
+    if plugin is None:
         # Create logs dir and write error
         os.makedirs("src/logs", exist_ok=True)
         log_file = os.path.abspath(os.path.join("src", "logs", f"job_{job_id}.txt"))
@@ -52,9 +221,11 @@ def run_test_in_cmd(job):
     log_file = os.path.abspath(os.path.join("src", "logs", f"job_{job_id}.txt"))
     error_log = os.path.abspath(os.path.join("src", "logs", f"job_{job_id}_error.txt"))
 
+    found_path = plugin["path"]
+
     # Build PYTHONPATH to include both test directories so import will work
     env = os.environ.copy()
-    pythonpath_parts = [auto_tests_dir, tests_dir]
+    pythonpath_parts = [directory for _, directory in plugin_dirs()]
     env["PYTHONPATH"] = (
         os.pathsep.join([p for p in pythonpath_parts if os.path.exists(p)])
         + os.pathsep
@@ -62,23 +233,18 @@ def run_test_in_cmd(job):
     )
 
     # Prepare parameters
-    params = job.get("parameters", {})
-    params_literal = _json.dumps(params)
-
-    # Runner code with no leading spaces (fix for IndentationError)
-    runner_code = f"""import json,sys
-import {test_name}
-
-params = json.loads('''{params_literal}''')
-try:
-    r = {test_name}.run_test({iterations}, params)
-except TypeError:
-    r = {test_name}.run_test({iterations})
-print("\\n===RESULT_START===")
-print(json.dumps(r))
-print("===RESULT_END===")
-"""
+    params = dict(parameter_defaults(plugin), **job.get("parameters", {}))
+    timeout = job_timeout(plugin, iterations, params)
 
+    runner_code = (
+        f"import json\n"
+        f"TEST_MODULE = {test_name!r}\n"
+        f"ITERATIONS = {int(iterations)}\n"
+        f"PARAMS = json.loads({_json.dumps(params)!r})\n"
+        f"PROFILE = {profiling_requested(params)!r}\n"
+        f"PROFILE_PATH = {os.path.splitext(log_file)[0]!r}\n"
+        + RUNNER_BODY
+    )
 
     # Write this to a temp file
     with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".py") as tmpfile:
@@ -86,25 +252,85 @@ print("===RESULT_END===")
         runner_path = tmpfile.name
 
     cmd = [sys.executable, runner_path]
+    streamed, profile = [], None
+    job["progress"] = {"iterations": iterations, "done": 0, "failed": 0}
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        process.kill()
 
     try:
-        # Run the test subprocess and capture stdout to the log file
+        # Run the test subprocess; its output is copied line by line to the log file
         with open(log_file, "w", encoding="utf-8") as lf:
+            marks["spawned"] = time.time()
             process = subprocess.Popen(
                 cmd,
-                stdout=lf,
+                stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 env=env,
                 cwd=os.path.dirname(found_path),
                 shell=False,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
             )
-            process.wait()
+            with _running_lock:
+                _running_processes[job_id] = process
+            watchdog = threading.Timer(timeout, kill_on_timeout) if timeout else None
+            if watchdog is not None:
+                watchdog.daemon = True
+                watchdog.start()
+            try:
+                for line in process.stdout:
+                    lf.write(line)
+                    lf.flush()
+                    if line.startswith(ITER_MARKER):
+                        record = _json.loads(line[len(ITER_MARKER):])
+                        record["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+                        streamed.append(record)
+                        job["progress"]["done"] += 1
+                        job["progress"]["failed"] += record["outcome"] != "Pass"
+                        if on_iteration is not None:
+                            on_iteration(job, record)
+                    elif line.startswith(PHASES_MARKER):
+                        child_marks = _json.loads(line[len(PHASES_MARKER):])
+                        profile = child_marks.pop("profile", None)
+                        marks.update(child_marks)
+                process.wait()
+                marks["exited"] = time.time()
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+                with _running_lock:
+                    _running_processes.pop(job_id, None)
+                os.remove(runner_path)
     except Exception as e:
         with open(error_log, "w", encoding="utf-8") as f:
             f.write(f"Subprocess error: {str(e)}")
         return {
             "outcome": "Fail",
-            "metrics": {"error": f"Subprocess failed: {str(e)}", "serial": job.get("serial")},
+            "metrics": {"error": f"Subprocess failed: {str(e)}", "serial": job.get("serial"),
+                        "phases": job_phases(marks)},
+            "iterations": streamed,
+        }
+
+    with _running_lock:
+        cancelled = job_id in _cancelled_jobs
+        _cancelled_jobs.discard(job_id)
+    if cancelled:
+        return {
+            "outcome": "Cancelled",
+            "metrics": {"error": "Cancelled by user", "serial": job.get("serial"),
+                        "phases": job_phases(marks)},
+            "iterations": streamed,
+        }
+    if timed_out.is_set():
+        return {
+            "outcome": "Fail",
+            "metrics": {"error": f"Timed out after {timeout:g}s", "serial": job.get("serial"),
+                        "phases": job_phases(marks)},
+            "iterations": streamed,
         }
 
     # After process completes, attempt to read log and determine outcome.
@@ -122,12 +348,13 @@ print("===RESULT_END===")
     # Basic heuristic to decide pass/fail
     outcome = "Fail"
     metrics = {"runtime": random.randint(100, 1000), "serial": job.get("serial")}
+    data = None
 
     try:
-        import re, json as _json2
-        m = re.search(r"===RESULT_START===\\s*(\\{{.*\\}})\\s*===RESULT_END===", log_content, re.DOTALL)
+        import re
+        m = re.search(r"===RESULT_START===\s*(\{.*\})\s*===RESULT_END===", log_content, re.DOTALL)
         if m:
-            data = _json2.loads(m.group(1))
+            data = _json.loads(m.group(1))
             if isinstance(data, dict):
                 out = data.get("outcome") or data.get("result") or data.get("status")
                 if out:
@@ -138,6 +365,15 @@ print("===RESULT_END===")
     except Exception:
         pass
 
+    if profile is not None:
+        metrics["profile"] = profile
+    marks["parsed"] = time.time()
+    metrics["phases"] = job_phases(marks)
+
+    if isinstance(data, dict) and data.get("streamed"):
+        # v2 plugin: the outcome comes from its iterations, not from words in the log
+        return {"outcome": outcome, "metrics": metrics, "iterations": streamed}
+
     if "Result: Pass" in log_content or "PASS" in log_content.upper():
         outcome = "Pass"
 
@@ -0,0 +1,23 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+# The standalone modules import each other as top-level modules (see
+# src/standalone/*.py), so the tests put that directory and the plugin helper
+# directories on sys.path the same way.
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in ("src/standalone", "src/plugins/tests", "src/plugins/auto_detect_tests"):
+    sys.path.insert(0, os.path.join(ROOT, path))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A migrated database in a temporary directory."""
+    from database import init_db
+    path = str(tmp_path / "framework.db")
+    init_db(path).close()
+    return path
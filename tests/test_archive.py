@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import sqlite3
+
+from archive import archive_old_logs, list_archives, logs_source
+from database import init_db
+
+
+def _insert(conn, job_id, timestamp):
+    conn.execute(
+        "INSERT INTO Logs (job_id, dut, hardware_type, test_name, parameters, outcome, metrics, timestamp) "
+        "VALUES (?, 1, 'Dgx', 'Cold Boot', '{}', 'Pass', '{}', ?)", (job_id, timestamp),
+    )
+    conn.commit()
+
+
+def test_old_rows_move_to_monthly_archives(db_path):
+    conn = init_db(db_path)
+    try:
+        _insert(conn, 1, "2020-01-05 10:00:00")
+        _insert(conn, 2, "2020-02-05 10:00:00")
+        _insert(conn, 3, "2999-01-01 00:00:00")
+        assert archive_old_logs(conn, db_path, keep_months=0) == {"2020-01": 1, "2020-02": 1}
+        assert [month for month, _ in list_archives(db_path)] == ["2020-01", "2020-02"]
+        assert [r[0] for r in conn.execute("SELECT job_id FROM Logs")] == [3]
+
+        assert logs_source(conn, db_path, "2999-01-01 00:00:00") == "LogFacts"
+        assert logs_source(conn, db_path) == "LogFactsAll"
+        assert sorted(r[0] for r in conn.execute("SELECT job_id FROM LogsAll")) == [1, 2, 3]
+    finally:
+        conn.close()
+
+
+def test_archives_past_the_attach_limit_are_still_read(db_path):
+    conn = init_db(db_path)
+    try:
+        for month in range(1, 13):
+            _insert(conn, month, f"2020-{month:02d}-05 10:00:00")
+        archive_old_logs(conn, db_path, keep_months=0)
+        assert len(list_archives(db_path)) == 12 > conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+
+        assert logs_source(conn, db_path) == "LogFactsAll"
+        assert sorted(r[0] for r in conn.execute("SELECT job_id FROM LogsAll")) == list(range(1, 13))
+        # Calling it again (the dashboard does on every rerun) gives the same rows
+        logs_source(conn, db_path)
+        assert conn.execute("SELECT COUNT(*) FROM LogsAll").fetchone()[0] == 12
+    finally:
+        conn.close()
+
+
+def test_log_ids_of_archived_rows_are_not_reused(db_path):
+    conn = init_db(db_path)
+    try:
+        _insert(conn, 1, "2020-01-05 10:00:00")
+        _insert(conn, 2, "2020-01-06 10:00:00")
+        archived = [r[0] for r in conn.execute("SELECT log_id FROM Logs")]
+        archive_old_logs(conn, db_path, keep_months=0)
+        assert conn.execute("SELECT COUNT(*) FROM LogFacts").fetchone()[0] == 0
+
+        _insert(conn, 3, "2999-01-01 00:00:00")
+        new_id = conn.execute("SELECT log_id FROM Logs WHERE job_id = 3").fetchone()[0]
+        assert new_id > max(archived)
+        logs_source(conn, db_path)
+        log_ids = [r[0] for r in conn.execute("SELECT log_id FROM LogsAll")]
+        assert len(log_ids) == len(set(log_ids)) == 3
+    finally:
+        conn.close()
+
+
+def test_high_water_migration_counts_existing_archives(db_path):
+    conn = init_db(db_path)
+    _insert(conn, 1, "2020-01-05 10:00:00")
+    archive_old_logs(conn, db_path, keep_months=0)
+    # A database archived before migration 7 existed
+    conn.execute("DROP TABLE LogIdHighWater")
+    conn.execute("DELETE FROM schema_version WHERE version >= 7")
+    conn.commit()
+    conn.close()
+
+    conn = init_db(db_path)
+    try:
+        _insert(conn, 2, "2999-01-01 00:00:00")
+        assert conn.execute("SELECT log_id FROM Logs WHERE job_id = 2").fetchone()[0] == 2
+    finally:
+        conn.close()
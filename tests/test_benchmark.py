@@ -0,0 +1,32 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import os
+import sqlite3
+
+import pytest
+
+import benchmark
+from benchmark import generate_history
+
+
+def test_generate_history(tmp_path):
+    db_path = str(tmp_path / "bench.db")
+    generate_history(db_path, 50, queued=0)
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM Logs").fetchone()[0] == 50
+    finally:
+        conn.close()
+
+
+def test_failed_generate_removes_the_new_database(tmp_path, monkeypatch):
+    def synthetic_jobs(*args):
+        raise ImportError("No module named 'numpy'")
+        yield
+
+    monkeypatch.setattr(benchmark, "synthetic_jobs", synthetic_jobs)
+    db_path = str(tmp_path / "bench.db")
+    with pytest.raises(ImportError):
+        generate_history(db_path, 50)
+    assert not os.path.exists(db_path)
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import json
+import sqlite3
+
+import executor
+from cli import main
+from database import init_db
+from executor import enqueue_job, reserve_job_ids
+
+SPECS = [
+    {"dut": 1, "test": "cold_boot", "iterations": 5},
+    {"ip": "192.168.0.5", "username": "lab", "password": "x", "test": "cpuinformation"},
+    {"hardware_type": "Dgx", "test": "warm_boot", "iterations": 10, "shards": 2},
+    {"hardware_type": "Dgx", "test": "warm_boot", "iterations": 10},
+    {"dut": 99, "test": "cold_boot"},
+]
+
+
+def _next_job_id(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT next_job_id FROM JobIDCounter").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_reserve_job_ids_hands_out_consecutive_ranges(db_path):
+    conn = init_db(db_path)
+    try:
+        first = reserve_job_ids(conn, 3)
+        second = reserve_job_ids(conn, 2)
+        conn.commit()
+        assert list(first) == [1, 2, 3]
+        assert list(second) == [4, 5]
+        assert list(reserve_job_ids(conn, 0)) == []
+    finally:
+        conn.close()
+
+
+def test_submit_without_wait_skips_remote_and_sharded_specs(db_path, tmp_path, capsys):
+    jobs = tmp_path / "jobs.json"
+    jobs.write_text(json.dumps(SPECS))
+    # The unknown DUT fails the submit
+    assert main(["--db", db_path, "submit", str(jobs)]) == 1
+    results = json.loads(capsys.readouterr().out)
+
+    assert [r["outcome"] for r in results] == ["queued", "Skipped", "Skipped", "queued", "Fail"]
+    assert [r["job_id"] for r in results[1:3] + results[4:]] == [None, None, None]
+    # Only the two specs that were queued took a job id
+    assert _next_job_id(db_path) == 3
+
+    conn = sqlite3.connect(db_path)
+    try:
+        queued = [job for (q,) in conn.execute("SELECT job_queue FROM DUTStatus") for job in json.loads(q)]
+    finally:
+        conn.close()
+    assert sorted(job["job_id"] for job in queued) == [1, 2]
+    assert all("shards" not in job["parameters"] for job in queued)
+
+
+def test_submit_wait_drains_only_the_targeted_duts(db_path, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(executor, "run_test_in_cmd", lambda job: {"outcome": "Pass", "metrics": {}})
+    conn = init_db(db_path)
+    try:
+        # Someone else's job, queued on DUT 2 before this submit
+        enqueue_job(conn, 2, "woa", "SN2", "COM4", "-", "cold_boot", 1, {"iterations": 1})
+    finally:
+        conn.close()
+
+    jobs = tmp_path / "jobs.json"
+    jobs.write_text(json.dumps([{"dut": 1, "test": "cold_boot", "iterations": 1}]))
+    assert main(["--db", db_path, "submit", str(jobs), "--wait"]) == 0
+    assert [r["dut"] for r in json.loads(capsys.readouterr().out)] == [1]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert len(json.loads(conn.execute("SELECT job_queue FROM DUTStatus WHERE dut = 2").fetchone()[0])) == 1
+    finally:
+        conn.close()
+
+    jobs.write_text(json.dumps([{"dut": 1, "test": "cold_boot"}, {"dut": 99, "test": "cold_boot"}]))
+    assert main(["--db", db_path, "submit", str(jobs), "--wait"]) == 1
@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import json
+import os
+import sqlite3
+
+from database import SCHEMA_VERSION, init_db, iteration_results, schema_version
+from executor import ITERATION_INSERT_SQL, iteration_rows
+from hardware import HARDWARE_FILE_ENV
+
+
+def test_fresh_database_gets_every_migration(db_path):
+    conn = init_db(db_path)
+    try:
+        assert schema_version(conn) == SCHEMA_VERSION
+        versions = [v for (v,) in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        assert versions == list(range(1, SCHEMA_VERSION + 1))
+        assert conn.execute("SELECT type FROM sqlite_master WHERE name = 'Logs'").fetchone()[0] == "view"
+    finally:
+        conn.close()
+
+
+def test_legacy_logs_table_is_migrated(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    # Logs as it was before schema_version existed: no ip/username columns
+    conn.execute("""
+        CREATE TABLE Logs (
+            log_id INTEGER PRIMARY KEY, job_id INTEGER, dut INTEGER, hardware_type TEXT,
+            serial TEXT, com_port TEXT, mac_address TEXT, test_name TEXT,
+            parameters TEXT, outcome TEXT, metrics TEXT, timestamp DATETIME
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO Logs (job_id, dut, hardware_type, test_name, parameters, outcome, metrics, timestamp) "
+        "VALUES (?, 1, 'Dgx', 'Cold Boot', '{}', ?, ?, '2025-01-01 00:00:00')",
+        [(1, "Pass", json.dumps({"boot_time": 12})), (2, "Fail", json.dumps({"boot_time": 30}))],
+    )
+    conn.commit()
+    conn.close()
+
+    conn = init_db(path)
+    try:
+        assert schema_version(conn) == SCHEMA_VERSION
+        rows = conn.execute("SELECT job_id, outcome, ip, metrics FROM Logs ORDER BY job_id").fetchall()
+        assert [(r[0], r[1], r[2]) for r in rows] == [(1, "Pass", None), (2, "Fail", None)]
+        assert json.loads(rows[0][3]) == {"boot_time": 12}
+    finally:
+        conn.close()
+
+
+def test_init_db_syncs_new_duts(db_path, tmp_path, monkeypatch):
+    inventory = tmp_path / "inventory.json"
+    inventory.write_text(json.dumps([
+        {"DUT": 1, "hardware_type": "Dgx", "serial": "1", "com_port": "COM3", "mac_address": ""},
+        {"DUT": 42, "hardware_type": "Sim", "serial": "42", "com_port": "COM42", "mac_address": ""},
+    ]))
+    monkeypatch.setenv(HARDWARE_FILE_ENV, str(inventory))
+    # The schema is already current, so only the DUT sync runs
+    conn = init_db(db_path)
+    try:
+        assert conn.execute("SELECT status FROM DUTStatus WHERE dut = 42").fetchone() == ("Free",)
+    finally:
+        conn.close()
+
+
+def test_init_db_syncs_only_when_the_inventory_changes(db_path, tmp_path, monkeypatch):
+    inventory = tmp_path / "inventory.json"
+    inventory.write_text(json.dumps([{"DUT": 7, "hardware_type": "Sim", "serial": "7", "com_port": "", "mac_address": ""}]))
+    monkeypatch.setenv(HARDWARE_FILE_ENV, str(inventory))
+    init_db(db_path).close()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM DUTStatus WHERE dut = 7")
+    conn.commit()
+    conn.close()
+
+    # Same inventory: no DUTStatus scan
+    conn = init_db(db_path)
+    try:
+        assert conn.execute("SELECT 1 FROM DUTStatus WHERE dut = 7").fetchone() is None
+    finally:
+        conn.close()
+
+    stat = os.stat(inventory)
+    os.utime(inventory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    conn = init_db(db_path)
+    try:
+        assert conn.execute("SELECT status FROM DUTStatus WHERE dut = 7").fetchone() == ("Free",)
+    finally:
+        conn.close()
+
+
+def test_iteration_details_are_not_metrics(db_path):
+    result = {"iterations": [
+        {"iteration": 1, "outcome": "Pass", "metrics": {"boot_time": 12.5},
+         "details": {"devices": 2, "devices_failed": 0}, "timestamp": "2025-01-01 00:00:00"},
+    ]}
+    conn = init_db(db_path)
+    try:
+        conn.executemany(ITERATION_INSERT_SQL, iteration_rows(9, result))
+        conn.commit()
+        [stored] = iteration_results(conn, 9)
+        assert stored["metrics"] == {"boot_time": 12.5}
+        assert stored["details"] == {"devices": 2, "devices_failed": 0}
+        assert conn.execute("SELECT metric FROM IterationMetrics WHERE job_id = 9").fetchall() == [("boot_time",)]
+    finally:
+        conn.close()
@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import textwrap
+
+import pytest
+
+from _serial_engine import run_record
+from plugin_registry import find_plugin, job_timeout
+from test_runner import run_test_in_cmd
+
+STREAMING_PLUGIN = '''
+import time
+
+PLUGIN_META = {"name": "Streamer", "timeout": 5}
+
+
+def run_test(iterations, params=None):
+    for i in range(iterations):
+        if params.get("hang"):
+            time.sleep(60)
+        outcome = "Fail" if i + 1 == params.get("fail_at") else "Pass"
+        yield {"outcome": outcome, "metrics": {"boot_time": i + 0.5}, "details": {"port": f"COM{i}"}}
+    return {"metrics": {"note": "done"}}
+'''
+
+
+@pytest.fixture
+def plugin_root(tmp_path, monkeypatch):
+    """A working directory whose src/plugins/tests holds the streamer plugin."""
+    directory = tmp_path / "src" / "plugins" / "tests"
+    directory.mkdir(parents=True)
+    (directory / "streamer.py").write_text(textwrap.dedent(STREAMING_PLUGIN))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _job(iterations, **parameters):
+    return {"job_id": 1, "test_name": "streamer", "iterations": iterations, "parameters": parameters}
+
+
+def test_streamed_iterations_are_parsed(plugin_root):
+    seen = []
+    result = run_test_in_cmd(_job(3), on_iteration=lambda job, record: seen.append(record["iteration"]))
+    assert result["outcome"] == "Pass"
+    assert seen == [1, 2, 3]
+    assert [r["metrics"] for r in result["iterations"]] == [{"boot_time": 0.5}, {"boot_time": 1.5}, {"boot_time": 2.5}]
+    assert [r["details"] for r in result["iterations"]] == [{"port": "COM0"}, {"port": "COM1"}, {"port": "COM2"}]
+    assert all(r["timestamp"] for r in result["iterations"])
+    assert result["metrics"]["note"] == "done"
+    assert result["metrics"]["iterations_run"] == 3
+    assert (plugin_root / "src" / "logs" / "job_1.txt").exists()
+
+
+def test_fail_fast_stops_at_the_first_failure(plugin_root):
+    result = run_test_in_cmd(_job(5, fail_at=2, fail_fast=True))
+    assert result["outcome"] == "Fail"
+    assert [r["outcome"] for r in result["iterations"]] == ["Pass", "Fail"]
+    assert result["metrics"]["aborted"] == "fail_fast"
+
+
+def test_watchdog_kills_a_test_past_its_timeout(plugin_root):
+    result = run_test_in_cmd(_job(1, hang=True))
+    assert result["outcome"] == "Fail"
+    assert result["metrics"]["error"] == "Timed out after 5s"
+
+
+def test_serial_run_record_keeps_counts_out_of_metrics():
+    record = run_record({
+        "COM3": {"outcome": "Pass", "seconds": 12.5, "responses": [], "error": None},
+        "COM4": {"outcome": "Fail", "seconds": 25.0, "responses": [], "error": "no response"},
+    })
+    assert record["outcome"] == "Fail"
+    assert record["metrics"] == {"boot_time": 25.0}
+    assert record["details"]["devices"] == 2
+    assert record["details"]["devices_failed"] == 1
+    assert set(record["details"]["ports"]) == {"COM3", "COM4"}
+
+
+@pytest.mark.parametrize("test_name", ["cold_boot", "warm_boot", "s4"])
+def test_serial_plugin_timeout_covers_boot_timeout(test_name):
+    plugin = find_plugin(test_name)
+    assert job_timeout(plugin, 2) == 2 * (10 + 25)
+    # A long boot_timeout must not let the runner kill the job before the step gives up
+    assert job_timeout(plugin, 1, {"boot_timeout": 120}) > 120 + 2
+
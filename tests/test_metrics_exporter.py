@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import json
+
+from database import init_db
+from metrics_exporter import Counter, Histogram, database_metrics, render_metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("stf_test_seconds", "Test latency.", (1, 5), ("test_name",))
+    for value in (0.5, 2, 7):
+        histogram.observe(value, test_name="cold_boot")
+    assert histogram.render() == [
+        "# HELP stf_test_seconds Test latency.",
+        "# TYPE stf_test_seconds histogram",
+        'stf_test_seconds_bucket{test_name="cold_boot",le="1"} 1',
+        'stf_test_seconds_bucket{test_name="cold_boot",le="5"} 2',
+        'stf_test_seconds_bucket{test_name="cold_boot",le="+Inf"} 3',
+        'stf_test_seconds_sum{test_name="cold_boot"} 9.5',
+        'stf_test_seconds_count{test_name="cold_boot"} 3',
+    ]
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("stf_test_total", "Test counter.", ("outcome",))
+    counter.inc(outcome='Fail "hard"\nnow')
+    counter.inc(2, outcome="Pass")
+    assert counter.render()[2:] == [
+        'stf_test_total{outcome="Fail \\"hard\\"\\nnow"} 1',
+        'stf_test_total{outcome="Pass"} 2',
+    ]
+
+
+def test_queue_depth_and_dut_state_gauges(db_path):
+    conn = init_db(db_path)
+    try:
+        conn.execute("UPDATE DUTStatus SET status = 'Busy', job_queue = ? WHERE dut = 1",
+                     (json.dumps([{"job_id": 1}, {"job_id": 2}]),))
+        conn.commit()
+        lines = database_metrics(conn)
+        assert 'stf_dut_queue_depth{dut="1",hardware_type="Dgx"} 2' in lines
+        assert 'stf_dut_state{dut="1",hardware_type="Dgx",state="Busy"} 1' in lines
+        assert 'stf_dut_state{dut="1",hardware_type="Dgx",state="Free"} 0' in lines
+        assert "stf_queued_jobs 2" in lines
+
+        text = render_metrics(conn)
+        assert text.endswith("\n")
+        assert "# TYPE stf_job_duration_seconds histogram" in text
+    finally:
+        conn.close()
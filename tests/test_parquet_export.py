@@ -0,0 +1,31 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+from parquet_export import REDACTED, flatten, redact
+
+
+def test_secret_parameters_are_redacted():
+    parameters = {
+        "ip": "10.0.0.5", "username": "lab", "password": "hunter2", "SSH_Password": "x",
+        "api_token": "abc", "iterations": 5, "options": {"client_secret": "s", "port": 22},
+        "hosts": [{"passwd": "p"}], "key_file": "/keys/id_rsa", "empty_password": None,
+    }
+    redacted = redact(parameters)
+    assert redacted["password"] == redacted["SSH_Password"] == redacted["api_token"] == REDACTED
+    assert redacted["options"] == {"client_secret": REDACTED, "port": 22}
+    assert redacted["hosts"] == [{"passwd": REDACTED}]
+    assert redacted["empty_password"] is None
+    assert {k: redacted[k] for k in ("ip", "username", "iterations", "key_file")} == {
+        "ip": "10.0.0.5", "username": "lab", "iterations": 5, "key_file": "/keys/id_rsa",
+    }
+    assert parameters["password"] == "hunter2"  # the input is not modified
+
+
+def test_flatten_fixes_column_types():
+    columns = {}
+    assert flatten("param_", {"iterations": 5, "ip": "10.0.0.5"}, columns) == {
+        "param_iterations": 5.0, "param_ip": "10.0.0.5",
+    }
+    # A later value of another type becomes null instead of changing the schema
+    assert flatten("param_", {"iterations": "many"}, columns) == {}
+    assert columns == {"param_iterations": "double", "param_ip": "string"}
@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import json
+
+import pytest
+
+import executor
+from database import init_db
+from executor import get_pool_load, select_pool_dut, submit_pool_job
+
+
+def _set(conn, dut, status, queue_length=0):
+    queue = [{"job_id": 1000 + dut * 10 + i, "test_name": "cold_boot", "iterations": 1} for i in range(queue_length)]
+    conn.execute("UPDATE DUTStatus SET status = ?, job_queue = ? WHERE dut = ?", (status, json.dumps(queue), dut))
+    conn.commit()
+
+
+def _queue(conn, dut):
+    return json.loads(conn.execute("SELECT job_queue FROM DUTStatus WHERE dut = ?", (dut,)).fetchone()[0])
+
+
+def test_get_pool_load_lists_one_hardware_type(db_path):
+    conn = init_db(db_path)
+    try:
+        _set(conn, 3, "Busy", 2)
+        pool = get_pool_load(conn, "Dgx")
+        assert [(h["DUT"], status, length) for h, status, length in pool] == [(1, "Free", 0), (3, "Busy", 2)]
+        assert get_pool_load(conn, "Nope") == []
+    finally:
+        conn.close()
+
+
+def test_select_pool_dut_picks_the_least_loaded(db_path):
+    conn = init_db(db_path)
+    try:
+        assert select_pool_dut(conn, "Dgx")["DUT"] == 1  # both Free: lowest id
+        _set(conn, 1, "Busy")
+        assert select_pool_dut(conn, "Dgx")["DUT"] == 3  # a Free DUT beats a Busy one
+        _set(conn, 3, "Busy", 1)
+        assert select_pool_dut(conn, "Dgx")["DUT"] == 1  # running job + 0 queued < running job + 1 queued
+        _set(conn, 1, "Busy", 1)
+        assert select_pool_dut(conn, "Dgx")["DUT"] == 1  # tie: lowest id
+        assert select_pool_dut(conn, "Nope") is None
+    finally:
+        conn.close()
+
+
+def test_submit_pool_job_runs_on_a_free_dut(db_path, monkeypatch):
+    ran = []
+
+    def run_test_in_cmd(job):
+        ran.append(job["dut"])
+        return {"outcome": "Pass", "metrics": {}}
+
+    monkeypatch.setattr(executor, "run_test_in_cmd", run_test_in_cmd)
+    conn = init_db(db_path)
+    try:
+        _set(conn, 1, "Busy")
+        result = submit_pool_job(conn, "Dgx", "cold_boot", 1, {})
+        assert result["dut"] == 3
+        assert result["queued"] is False
+        assert ran == [3]
+    finally:
+        conn.close()
+
+
+def test_submit_pool_job_queues_when_no_dut_is_free(db_path, monkeypatch):
+    monkeypatch.setattr(executor, "run_test_in_cmd", lambda job: pytest.fail("nothing should run"))
+    conn = init_db(db_path)
+    try:
+        _set(conn, 1, "Busy", 2)
+        _set(conn, 3, "Busy", 1)
+        result = submit_pool_job(conn, "Dgx", "cold_boot", 1, {})
+        assert result["dut"] == 3
+        assert result["queued"] is True
+        assert [job["job_id"] for job in _queue(conn, 3)][-1] == result["job_id"]
+
+        # Both queues now hold two jobs, so the next one goes to the lowest id
+        assert submit_pool_job(conn, "Dgx", "cold_boot", 1, {})["dut"] == 1
+    finally:
+        conn.close()
+
+
+def test_submit_pool_job_without_a_dut_of_that_type(db_path):
+    conn = init_db(db_path)
+    try:
+        result = submit_pool_job(conn, "Nope", "cold_boot", 1, {})
+        assert (result["outcome"], result["job_id"], result["queued"]) == ("Fail", None, False)
+    finally:
+        conn.close()
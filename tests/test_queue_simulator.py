@@ -0,0 +1,29 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+from queue_simulator import simulate
+
+
+def _job(i, arrival, dut=1, seconds=10):
+    return {"id": i, "dut": dut, "hardware_type": "Dgx", "test_name": "cold_boot", "iterations": 1,
+            "arrival": arrival, "seconds": seconds}
+
+
+def test_jobs_on_one_dut_wait_for_each_other():
+    report = simulate([_job(0, 0), _job(1, 1), _job(2, 2)], policy="fifo", routing="recorded")
+    assert report["jobs"] == 3
+    assert report["dropped"] == 0
+    assert report["wait_max_s"] == 18  # job 2 arrives at 2s and starts at 20s
+    assert report["utilization"][1] == 1.0
+    assert report["utilization"][3] == 0.0
+
+
+def test_pool_routing_spreads_a_hardware_type():
+    report = simulate([_job(0, 0), _job(1, 1)], policy="fifo", routing="pool")
+    assert report["jobs"] == 2
+    assert report["wait_max_s"] == 0
+
+
+def test_jobs_for_unknown_duts_are_dropped():
+    report = simulate([_job(0, 0), _job(1, 0, dut=99)])
+    assert (report["jobs"], report["dropped"]) == (1, 1)
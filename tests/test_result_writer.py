@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import sqlite3
+
+import pytest
+
+from executor import log_row
+from result_writer import DURABILITY_MODES, ResultWriter
+
+
+def _row(job_id, outcome="Pass"):
+    job = {"job_id": job_id, "dut": 1, "hardware_type": "Test", "test_name": "Dummy", "parameters": {}}
+    return log_row(job, {"outcome": outcome, "metrics": {"boot_time": job_id}})
+
+
+def _logged(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {job_id: outcome for job_id, outcome in conn.execute("SELECT job_id, outcome FROM Logs")}
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("durability", sorted(DURABILITY_MODES))
+def test_rows_are_committed_in_every_durability_mode(db_path, durability):
+    with ResultWriter(db_path, batch_size=3, flush_interval=0.05, durability=durability) as writer:
+        for job_id in range(1, 8):
+            row, blobs = _row(job_id)
+            writer.write(row, blobs)
+    assert _logged(db_path) == {job_id: "Pass" for job_id in range(1, 8)}
+    assert writer.stats()["rows_written"] == 7
+    assert writer.pending_results() == {}
+
+
+def test_pending_results_until_flush(db_path):
+    writer = ResultWriter(db_path, batch_size=100, flush_interval=60).start()
+    try:
+        row, blobs = _row(1)
+        writer.write(row, blobs)
+        assert 1 in writer.pending_results()
+        writer.flush()
+        assert writer.pending_results() == {}
+        assert _logged(db_path) == {1: "Pass"}
+    finally:
+        writer.close()
+
+
+def test_failed_batch_falls_back_to_single_rows(db_path, caplog):
+    writer = ResultWriter(db_path, batch_size=100, flush_interval=60).start()
+    try:
+        good, _ = _row(1)
+        writer.write(good)
+        writer.write((2, "not enough columns"))  # fails in the batch and on its own
+        other, _ = _row(3)
+        writer.write(other)
+        with pytest.raises(sqlite3.DatabaseError):
+            writer.flush()
+        assert _logged(db_path) == {1: "Pass", 3: "Pass"}
+        assert list(writer.failed_results()) == [2]
+        assert writer.stats()["failed"] == 1
+        assert writer.pending_results() == {}
+        assert [r.levelname for r in caplog.records if r.name == "result_writer"] == ["WARNING", "ERROR"]
+
+        # The writer thread survives the failure
+        later, _ = _row(4)
+        writer.write(later)
+        writer.flush()
+        assert 4 in _logged(db_path)
+    finally:
+        writer.close()
+
+
+def test_full_durability_waiter_gets_the_error(db_path):
+    writer = ResultWriter(db_path, durability="full").start()
+    try:
+        with pytest.raises(sqlite3.DatabaseError):
+            writer.write((5, "not enough columns"))
+        assert 5 in writer.failed_results()
+        row, blobs = _row(6)
+        writer.write(row, blobs)
+        assert 6 in _logged(db_path)
+    finally:
+        writer.close()
+
+
+def test_retry_failed_queues_rows_again(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TRIGGER refuse BEFORE INSERT ON LogFacts BEGIN SELECT RAISE(ABORT, 'refused'); END")
+    conn.commit()
+    writer = ResultWriter(db_path, flush_interval=60).start()
+    try:
+        row, blobs = _row(7)
+        writer.write(row, blobs)
+        with pytest.raises(sqlite3.DatabaseError):
+            writer.flush()
+        assert 7 in writer.failed_results()
+
+        conn.execute("DROP TRIGGER refuse")
+        conn.commit()
+        assert writer.retry_failed() == 1
+        writer.flush()
+        assert writer.failed_results() == {}
+        assert _logged(db_path) == {7: "Pass"}
+    finally:
+        writer.close()
+        conn.close()
+
+
+def test_write_after_close_raises(db_path):
+    writer = ResultWriter(db_path).start()
+    writer.close()
+    row, blobs = _row(8)
+    with pytest.raises(RuntimeError):
+        writer.write(row, blobs)
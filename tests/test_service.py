@@ -0,0 +1,132 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import json
+import textwrap
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from database import init_db
+from executor import log_job_result
+from scheduler import JobScheduler
+from service import get_job_status, make_handler
+
+QUICK_PLUGIN = '''
+import time
+
+PLUGIN_META = {"name": "Quick", "timeout": 10}
+
+
+def run_test(iterations, params=None):
+    for i in range(iterations):
+        time.sleep(0.05)
+        yield {"outcome": "Pass", "metrics": {"boot_time": i + 1}}
+'''
+
+
+@pytest.fixture
+def service(db_path, tmp_path, monkeypatch):
+    """Base URL of a job service on a free port, run from a directory holding the quick plugin."""
+    directory = tmp_path / "src" / "plugins" / "tests"
+    directory.mkdir(parents=True)
+    (directory / "quick.py").write_text(textwrap.dedent(QUICK_PLUGIN))
+    monkeypatch.chdir(tmp_path)
+
+    # full durability: a completed job's rows (and iterations) are committed
+    scheduler = JobScheduler(db_path=db_path, poll_interval=0.05, durability="full").start()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(scheduler))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        scheduler.stop()
+
+
+def _request(method, url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_submit_status_result_round_trip(service):
+    status, submitted = _request("POST", f"{service}/jobs", {"test": "quick", "dut": 1, "iterations": 3})
+    assert status == 202
+    assert submitted["queued"] is True
+    job_id = submitted["job_id"]
+
+    # Poll as fast as possible: the job must never vanish between queued, running and completed
+    seen = []
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        status, job = _request("GET", f"{service}/jobs/{job_id}")
+        assert status == 200, seen
+        if not seen or seen[-1] != job["status"]:
+            seen.append(job["status"])
+        if job["status"] == "completed":
+            break
+    assert seen[-1] == "completed"
+    assert set(seen) <= {"queued", "running", "completed"}
+    assert job["outcome"] == "Pass"
+    assert job["dut"] == 1
+
+    status, iterations = _request("GET", f"{service}/jobs/{job_id}/iterations")
+    assert status == 200
+    assert [r["metrics"]["boot_time"] for r in iterations] == [1, 2, 3]
+
+
+def test_bad_requests(service):
+    assert _request("POST", f"{service}/jobs", {"dut": 1})[0] == 400
+    assert _request("GET", f"{service}/jobs/999")[0] == 404
+    assert _request("GET", f"{service}/jobs/abc")[0] == 400
+    status, result = _request("POST", f"{service}/jobs", {"test": "quick", "dut": 99})
+    assert status == 202
+    assert result["outcome"] == "Fail"
+
+
+class FlushingWriter:
+    """Result writer whose buffered row is committed right after get_job_status looks at the buffer."""
+
+    def __init__(self, conn, job):
+        self.conn, self.job = conn, job
+
+    def pending_results(self):
+        log_job_result(self.conn, self.job, {"outcome": "Pass", "metrics": {}})
+        self.conn.commit()
+        return {}
+
+    def failed_results(self):
+        return {}
+
+
+class FakeScheduler:
+    def __init__(self, writer):
+        self.writer = writer
+
+    def running_jobs(self):
+        return {}
+
+    def pending_remote_jobs(self):
+        return {}
+
+
+def test_job_committed_during_the_lookup_is_found(db_path):
+    conn = init_db(db_path)
+    try:
+        job = {"job_id": 7, "dut": 1, "hardware_type": "Dgx", "test_name": "quick", "parameters": {}}
+        status = get_job_status(FakeScheduler(FlushingWriter(conn, job)), conn, 7)
+        assert status["status"] == "completed"
+    finally:
+        conn.close()
+
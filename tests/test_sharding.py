@@ -0,0 +1,104 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import pytest
+
+import executor
+from database import init_db, iteration_results
+from executor import merge_shard_results, split_iterations, submit_sharded_job
+
+
+@pytest.mark.parametrize("iterations, shards, parts", [
+    (10, 2, [5, 5]),
+    (10, 3, [4, 3, 3]),
+    (2, 5, [1, 1]),
+    (7, 1, [7]),
+    (7, 0, [7]),
+])
+def test_split_iterations(iterations, shards, parts):
+    assert split_iterations(iterations, shards) == parts
+
+
+def _shard_result(outcome, boot_times, runtime):
+    return {
+        "outcome": outcome,
+        "metrics": {"runtime": runtime},
+        "iterations": [
+            {"iteration": i + 1, "outcome": "Pass", "metrics": {"boot_time": t}, "timestamp": "2025-01-01 00:00:00"}
+            for i, t in enumerate(boot_times)
+        ],
+    }
+
+
+def test_merge_shard_results():
+    jobs = [{"job_id": 11, "dut": 1, "iterations": 2}, {"job_id": 12, "dut": 3, "iterations": 1}]
+    result = merge_shard_results(jobs, [_shard_result("Pass", [40, 41], 90), _shard_result("Fail", [42], 60)])
+
+    assert result["outcome"] == "Fail"
+    assert result["metrics"]["runtime"] == 90
+    assert result["metrics"]["passed_shards"] == 1
+    assert [s["job_id"] for s in result["metrics"]["shards"]] == [11, 12]
+    assert [(r["iteration"], r["shard"]) for r in result["iterations"]] == [(1, 1), (2, 1), (3, 2)]
+    # The shard number is a field of the record, not a metric
+    assert all(r["metrics"] == {"boot_time": t} for r, t in zip(result["iterations"], [40, 41, 42]))
+
+
+def test_sharded_job_logs_one_parent_row(db_path, monkeypatch):
+    ran = []
+
+    def run_jobs_parallel(jobs):
+        ran.extend(jobs)
+        return [_shard_result("Pass", [30 + n] * job["iterations"], 10) for n, job in enumerate(jobs)]
+
+    monkeypatch.setattr(executor, "run_jobs_parallel", run_jobs_parallel)
+    conn = init_db(db_path)
+    try:
+        # DUTs 1 and 3 are the two "Dgx" DUTs of the built-in inventory
+        result = submit_sharded_job(conn, 1, "Dgx", "123456", "COM3", "00:1A:2B:3C:4D:5E",
+                                    "Cold Boot", 5, {"delay": 1}, shards=2)
+        assert result["outcome"] == "Pass"
+        assert sorted(job["dut"] for job in ran) == [1, 3]
+        assert [job["iterations"] for job in ran] == [3, 2]
+
+        logs = conn.execute("SELECT job_id, outcome FROM Logs").fetchall()
+        assert logs == [(result["job_id"], "Pass")]
+        iterations = iteration_results(conn, result["job_id"])
+        assert [r["shard"] for r in iterations] == [1, 1, 1, 2, 2]
+        metrics = {m for (m,) in conn.execute("SELECT DISTINCT metric FROM IterationMetrics")}
+        assert metrics == {"boot_time"}
+        assert {s for (s,) in conn.execute("SELECT status FROM DUTStatus WHERE dut IN (1, 3)")} == {"Free"}
+    finally:
+        conn.close()
+
+
+def test_sharded_job_needs_two_free_duts(db_path, monkeypatch):
+    monkeypatch.setattr(executor, "run_jobs_parallel", lambda jobs: pytest.fail("nothing should run"))
+    conn = init_db(db_path)
+    try:
+        conn.execute("UPDATE DUTStatus SET status = 'Busy' WHERE dut = 3")
+        conn.commit()
+        assert submit_sharded_job(conn, 1, "Dgx", "123456", "COM3", "", "Cold Boot", 5, {}, shards=2) is None
+        assert not conn.in_transaction
+        assert conn.execute("SELECT status FROM DUTStatus WHERE dut = 1").fetchone() == ("Free",)
+    finally:
+        conn.close()
+
+
+def test_parent_row_uses_a_shard_dut(db_path, monkeypatch):
+    monkeypatch.setattr(executor, "run_jobs_parallel",
+                        lambda jobs: [_shard_result("Pass", [30] * job["iterations"], 10) for job in jobs])
+    conn = init_db(db_path)
+    try:
+        # The requested DUT is Busy, so the shards run elsewhere
+        conn.execute("UPDATE DUTStatus SET status = 'Busy' WHERE dut = 1")
+        conn.commit()
+        monkeypatch.setattr(executor, "get_pool_load", lambda conn, hardware_type: [
+            ({"DUT": 3, "hardware_type": "Dgx", "serial": "S3", "com_port": "COM5", "mac_address": "m3"}, "Free", 0),
+            ({"DUT": 5, "hardware_type": "Dgx", "serial": "S5", "com_port": "COM7", "mac_address": "m5"}, "Free", 0),
+        ])
+        result = submit_sharded_job(conn, 1, "Dgx", "123456", "COM3", "", "Cold Boot", 4, {}, shards=2)
+        row = conn.execute("SELECT dut, serial FROM Logs WHERE job_id = ?", (result["job_id"],)).fetchone()
+        assert row == (3, "S3")
+    finally:
+        conn.close()
+
@@ -0,0 +1,104 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import io
+import shutil
+import subprocess
+
+import pytest
+
+from _ssh_batch import (
+    build_script, consistent, marker_line, output_hash, pack, parse_marker_line, read_header, run_batched, unpack,
+)
+
+
+class FakeChannel:
+    def shutdown_write(self):
+        pass
+
+    def recv_exit_status(self):
+        return 0
+
+
+class FakeStream(io.BytesIO):
+    channel = FakeChannel()
+
+    def __iter__(self):
+        return iter(self.getvalue().decode().splitlines(True))
+
+
+class FakeStdin(io.StringIO):
+    channel = FakeChannel()
+
+
+class FakeClient:
+    """paramiko-like client: an sh host whose batch script prints `lines`."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def exec_command(self, command):
+        stdin = FakeStdin()
+        if command == "echo %OS%":
+            return stdin, FakeStream(b"%OS%\n"), FakeStream()
+        if command == "sh -s":
+            return stdin, FakeStream("".join(line + "\n" for line in self.lines).encode()), FakeStream()
+        return stdin, FakeStream(b"direct\n"), FakeStream()
+
+
+@pytest.mark.parametrize("text", ["", "one line", "multi\nline \u00e9 output"])
+def test_pack_round_trip(text):
+    assert unpack(pack(text)) == text
+    assert " " not in pack(text)
+
+
+def test_unpack_not_shipped():
+    assert unpack("-") is None
+    assert unpack(".") == ""
+
+
+def test_marker_line_parses_back():
+    digest = output_hash("out")
+    line = marker_line(3, 1, 12.6, digest, "out", None)
+    assert parse_marker_line(line + "\n") == (3, 1, 12, digest, "out", None)
+    assert parse_marker_line(marker_line(1, 0, 5, digest, None, "boom")) == (1, 0, 5, digest, None, "boom")
+
+
+@pytest.mark.parametrize("line", ["", "hello world", "===BATCH=== 1 0 5", "OTHER 1 0 5 h - -"])
+def test_parse_marker_line_ignores_other_lines(line):
+    assert parse_marker_line(line) is None
+
+
+@pytest.mark.parametrize("shell", ["sh", "powershell"])
+def test_build_script_header_round_trip(shell):
+    script = build_script(shell, "echo 'hi'", 4, 0.5, False)
+    assert read_header(script) == {"command": "echo 'hi'", "iterations": 4, "delay": 0.5, "ship": 0}
+    assert read_header("echo hi") is None
+
+
+@pytest.mark.skipif(not shutil.which("sh") or not shutil.which("base64"), reason="needs a POSIX shell")
+def test_sh_script_streams_one_line_per_iteration():
+    script = build_script("sh", "echo same", 3, 0, True)
+    out = subprocess.run(["sh", "-s"], input=script, capture_output=True, text=True, timeout=30).stdout
+    parsed = [p for p in map(parse_marker_line, out.splitlines()) if p is not None]
+    assert [p[0] for p in parsed] == [1, 2, 3]
+    assert [p[4] for p in parsed] == ["same", None, None]
+    assert len({p[3] for p in parsed}) == 1
+
+
+def test_run_batched_full_batch():
+    digest = output_hash("same")
+    lines = [marker_line(i, 0, 5, digest, "same" if i == 1 else None, None) for i in (1, 2, 3)]
+    batch = run_batched(FakeClient(lines), "cmd", 3)
+    assert batch["mode"] == "sh"
+    assert batch["error"] is None
+    assert consistent(batch)
+
+
+def test_run_batched_short_batch_is_an_error():
+    # The script died after two of three iterations without writing to stderr
+    digest = output_hash("same")
+    lines = [marker_line(i, 0, 5, digest, "same" if i == 1 else None, None) for i in (1, 2)]
+    batch = run_batched(FakeClient(lines), "cmd", 3, label="Probe")
+    assert len(batch["iterations"]) == 2
+    assert batch["error"] == "Probe stopped after 2 of 3 iterations"
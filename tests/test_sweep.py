@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import json
+
+import executor
+from database import init_db
+from executor import submit_sweep
+
+PAIRS = [(5, 3), (8, 4), (10, 5)]
+
+
+def _queues(conn):
+    return {dut: json.loads(q) for dut, q in conn.execute("SELECT dut, job_queue FROM DUTStatus WHERE dut IN (1, 3)")}
+
+
+def test_sweep_queues_children_when_every_dut_is_busy(db_path):
+    conn = init_db(db_path)
+    try:
+        conn.execute("UPDATE DUTStatus SET status = 'Busy' WHERE dut IN (1, 3)")
+        conn.commit()
+        result = submit_sweep(conn, "Dgx", "Cold Boot", {"password": "secret"}, pairs=PAIRS)
+        assert result["queued"] is True
+        assert not conn.in_transaction
+
+        queued = [job for jobs in _queues(conn).values() for job in jobs]
+        assert sorted(job["job_id"] for job in queued) == sorted(result["job_ids"])
+        assert {job["dut"] for job in queued} == {1, 3}
+        assert {(job["iterations"], job["parameters"]["delay"]) for job in queued} == set(PAIRS)
+        assert all(job["parameters"]["sweep_id"] == result["sweep_id"] for job in queued)
+        assert all(job["parameters"]["password"] is None for job in queued)
+    finally:
+        conn.close()
+
+
+def test_sweep_runs_children_on_the_free_duts(db_path, monkeypatch):
+    def run_test_in_cmd(job):
+        return {"outcome": "Pass", "metrics": {"runtime": 1}}
+
+    monkeypatch.setattr(executor, "run_test_in_cmd", run_test_in_cmd)
+    conn = init_db(db_path)
+    try:
+        result = submit_sweep(conn, "Dgx", "Cold Boot", pairs=PAIRS)
+        assert result["outcome"] == "Completed"
+        assert result["metrics"]["passed"] == 3
+        assert {r["dut"] for r in result["metrics"]["results"]} <= {1, 3}
+        assert conn.execute("SELECT COUNT(*) FROM Logs").fetchone()[0] == 3
+        assert {s for (s,) in conn.execute("SELECT status FROM DUTStatus WHERE dut IN (1, 3)")} == {"Free"}
+    finally:
+        conn.close()
+
+
+def test_sweep_on_an_unknown_pool_takes_no_job_ids(db_path):
+    conn = init_db(db_path)
+    try:
+        result = submit_sweep(conn, "Nope", "Cold Boot", pairs=PAIRS)
+        assert result["outcome"] == "Fail"
+        assert not conn.in_transaction
+        assert conn.execute("SELECT next_job_id FROM JobIDCounter").fetchone()[0] == 1
+    finally:
+        conn.close()
+
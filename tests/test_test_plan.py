@@ -0,0 +1,108 @@
+# Copyright (c) 2025 Varun Kumar BS.
+# This file contains proprietary code and/or utilities for development purposes.
+
+import pytest
+
+import test_plan
+from database import init_db
+from test_plan import run_plan, validate_plan
+
+
+def _plan(*steps, **extra):
+    return dict({"name": "p", "hardware_type": "Dgx", "steps": list(steps)}, **extra)
+
+
+@pytest.fixture
+def started(monkeypatch):
+    order = []
+
+    def run_test_in_cmd(job):
+        order.append(job["test_name"])
+        return {"outcome": "Fail" if job["parameters"].get("fail") else "Pass", "metrics": {}}
+
+    monkeypatch.setattr(test_plan, "run_test_in_cmd", run_test_in_cmd)
+    return order
+
+
+def test_validate_plan_accepts_a_dag_and_fills_ids():
+    plan = _plan({"test": "cold_boot"}, {"id": "warm", "test": "warm_boot", "depends_on": ["cold_boot"]})
+    validate_plan(plan)
+    assert [step["id"] for step in plan["steps"]] == ["cold_boot", "warm"]
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([], "no steps"),
+    ([{"id": "a", "test": "cold_boot"}, {"id": "a", "test": "warm_boot"}], "Duplicate"),
+    ([{"id": "a", "test": "cold_boot", "depends_on": ["b"]}], "unknown step"),
+    ([{"id": "a", "test": "cold_boot", "depends_on": ["a"]}], "cycle"),
+    ([
+        {"id": "a", "test": "cold_boot"},
+        {"id": "b", "test": "warm_boot", "depends_on": ["a", "c"]},
+        {"id": "c", "test": "s4", "depends_on": ["b"]},
+    ], "cycle"),
+])
+def test_validate_plan_rejects(steps, message):
+    with pytest.raises(ValueError, match=message):
+        validate_plan(_plan(*steps))
+
+
+def test_run_plan_follows_dependency_order(db_path, started):
+    # Pinned to one DUT, so steps run one at a time in topological order
+    plan = _plan(
+        {"id": "s4", "test": "s4", "depends_on": ["warm"], "dut": 1},
+        {"id": "warm", "test": "warm_boot", "depends_on": ["cold"], "dut": 1},
+        {"id": "cold", "test": "cold_boot", "dut": 1},
+    )
+    conn = init_db(db_path)
+    try:
+        result = run_plan(conn, plan, poll_interval=0.01)
+        assert result["outcome"] == "Pass"
+        assert started == ["cold_boot", "warm_boot", "s4"]
+        assert conn.execute("SELECT status FROM DUTStatus WHERE dut = 1").fetchone()[0] == "Free"
+    finally:
+        conn.close()
+
+
+def test_run_plan_skips_dependents_of_a_failed_step(db_path, started):
+    plan = _plan(
+        {"id": "cold", "test": "cold_boot", "parameters": {"fail": True}},
+        {"id": "warm", "test": "warm_boot", "depends_on": ["cold"]},
+    )
+    conn = init_db(db_path)
+    try:
+        result = run_plan(conn, plan, poll_interval=0.01)
+        assert result["outcome"] == "Fail"
+        assert {s: state["status"] for s, state in result["steps"].items()} == {"cold": "Fail", "warm": "Skipped"}
+        assert started == ["cold_boot"]
+    finally:
+        conn.close()
+
+
+def test_remote_step_without_ssh_host_fails_without_running(db_path, started):
+    conn = init_db(db_path)
+    try:
+        result = run_plan(conn, _plan({"id": "info", "test": "systeminformation"}), poll_interval=0.01)
+        assert result["steps"]["info"]["status"] == "Fail"
+        assert "SSH host" in result["steps"]["info"]["metrics"]["error"]
+        assert started == []
+    finally:
+        conn.close()
+
+
+def test_claimed_dut_is_not_taken_twice(db_path, started, monkeypatch):
+    # DUT 1 goes Busy behind the plan's back: the conditional claim must move on to DUT 3
+    conn = init_db(db_path)
+    original = test_plan.get_pool_load
+
+    def stale_pool_load(conn, hardware_type):
+        pool = original(conn, hardware_type)
+        conn.execute("UPDATE DUTStatus SET status = 'Busy' WHERE dut = 1")
+        conn.commit()
+        return pool
+
+    monkeypatch.setattr(test_plan, "get_pool_load", stale_pool_load)
+    try:
+        result = run_plan(conn, _plan({"id": "cold", "test": "cold_boot"}), poll_interval=0.01)
+        assert result["steps"]["cold"]["dut"] == 3
+    finally:
+        conn.close()